@@ -0,0 +1,155 @@
+# alembic/script.py.mako
+"""Partition athlete by training center
+
+Converts athlete into a table hash-partitioned on training_center_id, so
+per-center queries prune to one partition and vacuum works on small heaps.
+
+Postgres only allows unique constraints that include the partition key, so
+the global cpf, id and pk_id uniqueness moves to the athlete_key table, kept
+in sync by a trigger on athlete.
+
+The partition count defaults to ATHLETE_PARTITION_COUNT and can be overridden
+per run: alembic -x athlete_partitions=16 upgrade head
+
+Revision ID: 1a9c3e5f7b20
+Revises: f3b8d1a6c920
+Create Date: 2026-10-18 15:12:37.204511
+
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+from config.settings import settings
+
+
+# revision identifiers, used by Alembic.
+revision = '1a9c3e5f7b20'
+down_revision = 'f3b8d1a6c920'
+branch_labels = None
+depends_on = None
+
+COLUMNS = "id, name, cpf, age, weight, height, sex, training_center_id, category_id, pk_id, created_at, updated_at"
+
+
+def partition_count() -> int:
+    count = int(context.get_x_argument(as_dictionary=True).get(
+        "athlete_partitions", settings.ATHLETE_PARTITION_COUNT
+    ))
+    if count < 1:
+        raise ValueError("athlete_partitions must be at least 1")
+    return count
+
+
+def upgrade() -> None:
+    partitions = partition_count()
+
+    op.execute("ALTER TABLE athlete RENAME TO athlete_heap")
+    op.execute("ALTER INDEX ix_athlete_pk_id RENAME TO ix_athlete_heap_pk_id")
+    op.execute("ALTER TABLE athlete_heap RENAME CONSTRAINT athlete_pkey TO athlete_heap_pkey")
+    op.execute("ALTER TABLE athlete_heap RENAME CONSTRAINT athlete_cpf_key TO athlete_heap_cpf_key")
+    op.execute("ALTER TABLE athlete_heap RENAME CONSTRAINT athlete_id_key TO athlete_heap_id_key")
+    op.execute("ALTER SEQUENCE athlete_pk_id_seq OWNED BY NONE")
+
+    op.execute("""
+        CREATE TABLE athlete (
+            id UUID NOT NULL,
+            name VARCHAR(50) NOT NULL,
+            cpf VARCHAR(11) NOT NULL,
+            age INTEGER,
+            weight FLOAT(10),
+            height FLOAT(10),
+            sex VARCHAR(1),
+            training_center_id INTEGER REFERENCES training_center (pk_id),
+            category_id INTEGER REFERENCES category (pk_id),
+            pk_id INTEGER NOT NULL DEFAULT nextval('athlete_pk_id_seq'),
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+            updated_at TIMESTAMP WITH TIME ZONE
+        ) PARTITION BY HASH (training_center_id)
+    """)
+    for remainder in range(partitions):
+        op.execute(
+            f"CREATE TABLE athlete_p{remainder} PARTITION OF athlete "
+            f"FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder})"
+        )
+    op.execute("ALTER SEQUENCE athlete_pk_id_seq OWNED BY athlete.pk_id")
+
+    op.create_index(op.f('ix_athlete_pk_id'), 'athlete', ['pk_id'], unique=False)
+    op.create_index(op.f('ix_athlete_cpf'), 'athlete', ['cpf'], unique=False)
+    op.create_index(op.f('ix_athlete_training_center_id'), 'athlete', ['training_center_id'], unique=False)
+    op.create_index(op.f('ix_athlete_category_id'), 'athlete', ['category_id'], unique=False)
+
+    op.create_table('athlete_key',
+    sa.Column('pk_id', sa.Integer(), nullable=False),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('cpf', sa.String(length=11), nullable=False),
+    sa.PrimaryKeyConstraint('pk_id'),
+    sa.UniqueConstraint('cpf'),
+    sa.UniqueConstraint('id')
+    )
+    # A row moving between partitions may be seen as a delete plus an insert,
+    # in either order, so the insert upserts and the delete only removes keys
+    # whose row is really gone.
+    op.execute("""
+        CREATE FUNCTION athlete_key_sync() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                DELETE FROM athlete_key k
+                WHERE k.pk_id = OLD.pk_id
+                  AND NOT EXISTS (SELECT 1 FROM athlete a WHERE a.pk_id = OLD.pk_id);
+                RETURN OLD;
+            END IF;
+            IF TG_OP = 'UPDATE' AND NEW.pk_id <> OLD.pk_id THEN
+                DELETE FROM athlete_key WHERE pk_id = OLD.pk_id;
+            END IF;
+            INSERT INTO athlete_key (pk_id, id, cpf)
+            VALUES (NEW.pk_id, NEW.id, NEW.cpf)
+            ON CONFLICT (pk_id) DO UPDATE SET id = EXCLUDED.id, cpf = EXCLUDED.cpf;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER athlete_key_sync
+        AFTER INSERT OR UPDATE OF pk_id, id, cpf OR DELETE ON athlete
+        FOR EACH ROW EXECUTE FUNCTION athlete_key_sync()
+    """)
+
+    op.execute(f"INSERT INTO athlete ({COLUMNS}) SELECT {COLUMNS} FROM athlete_heap")
+    op.drop_table('athlete_heap')
+    op.execute("ANALYZE athlete")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE athlete RENAME TO athlete_partitioned")
+    op.execute("ALTER SEQUENCE athlete_pk_id_seq OWNED BY NONE")
+    op.drop_index(op.f('ix_athlete_category_id'), table_name='athlete_partitioned')
+    op.drop_index(op.f('ix_athlete_training_center_id'), table_name='athlete_partitioned')
+    op.drop_index(op.f('ix_athlete_cpf'), table_name='athlete_partitioned')
+    op.drop_index(op.f('ix_athlete_pk_id'), table_name='athlete_partitioned')
+
+    op.create_table('athlete',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('cpf', sa.String(length=11), nullable=False),
+    sa.Column('age', sa.Integer(), nullable=True),
+    sa.Column('weight', sa.Float(precision=10, asdecimal=2), nullable=True),
+    sa.Column('height', sa.Float(precision=10, asdecimal=2), nullable=True),
+    sa.Column('sex', sa.String(length=1), nullable=True),
+    sa.Column('training_center_id', sa.Integer(), nullable=True),
+    sa.Column('category_id', sa.Integer(), nullable=True),
+    sa.Column('pk_id', sa.Integer(), server_default=sa.text("nextval('athlete_pk_id_seq')"), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['category_id'], ['category.pk_id'], ),
+    sa.ForeignKeyConstraint(['training_center_id'], ['training_center.pk_id'], ),
+    sa.PrimaryKeyConstraint('pk_id'),
+    sa.UniqueConstraint('cpf'),
+    sa.UniqueConstraint('id')
+    )
+    op.create_index(op.f('ix_athlete_pk_id'), 'athlete', ['pk_id'], unique=False)
+    op.execute(f"INSERT INTO athlete ({COLUMNS}) SELECT {COLUMNS} FROM athlete_partitioned")
+    op.execute("ALTER SEQUENCE athlete_pk_id_seq OWNED BY athlete.pk_id")
+
+    op.execute("DROP TABLE athlete_partitioned")
+    op.execute("DROP FUNCTION athlete_key_sync()")
+    op.drop_table('athlete_key')
@@ -0,0 +1,50 @@
+# alembic/script.py.mako
+"""Notify resource changes
+
+Every repository write appends an outbox_event row in its transaction; a
+trigger on that table sends a compact NOTIFY on resource_changes, which the
+change feed relays to /changes/stream subscribers once the write commits.
+
+Revision ID: 2b7d4f1e8a63
+Revises: 1a9c3e5f7b20
+Create Date: 2026-10-18 16:40:12.583190
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '2b7d4f1e8a63'
+down_revision = '1a9c3e5f7b20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Only ids go in the payload (NOTIFY is capped at 8000 bytes); subscribers
+    # fetch the resource itself if they need it.
+    op.execute("""
+        CREATE FUNCTION outbox_event_notify() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('resource_changes', json_build_object(
+                'id', NEW.pk_id,
+                'resource', NEW.aggregate_type,
+                'event', NEW.event_type,
+                'pk_id', NEW.aggregate_id,
+                'uuid', NEW.payload->>'id',
+                'training_center_id', (NEW.payload->>'training_center_id')::int
+            )::text);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER outbox_event_notify
+        AFTER INSERT ON outbox_event
+        FOR EACH ROW EXECUTE FUNCTION outbox_event_notify()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER outbox_event_notify ON outbox_event")
+    op.execute("DROP FUNCTION outbox_event_notify()")
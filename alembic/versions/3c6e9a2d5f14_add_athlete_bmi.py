@@ -0,0 +1,36 @@
+# alembic/script.py.mako
+"""Add athlete bmi
+
+Stores weight / height² as a generated column with a B-tree index, so BMI
+filters and percentiles are index range scans instead of full downloads.
+The index is created on the partitioned parent and so on every partition.
+
+Revision ID: 3c6e9a2d5f14
+Revises: 2b7d4f1e8a63
+Create Date: 2026-10-18 18:05:41.660218
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c6e9a2d5f14'
+down_revision = '2b7d4f1e8a63'
+branch_labels = None
+depends_on = None
+
+# Keep in sync with Athlete.bmi. Heights of zero give NULL, not an error.
+BMI_EXPRESSION = "CASE WHEN height > 0 THEN weight / (height * height) END"
+
+
+def upgrade() -> None:
+    # Rewrites every partition once to compute the stored values.
+    op.add_column('athlete', sa.Column('bmi', sa.Float(), sa.Computed(BMI_EXPRESSION, persisted=True), nullable=True))
+    op.create_index(op.f('ix_athlete_bmi'), 'athlete', ['bmi'], unique=False)
+    op.execute("ANALYZE athlete")
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_athlete_bmi'), table_name='athlete')
+    op.drop_column('athlete', 'bmi')
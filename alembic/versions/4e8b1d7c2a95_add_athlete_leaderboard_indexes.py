@@ -0,0 +1,36 @@
+# alembic/script.py.mako
+"""Add athlete leaderboard indexes
+
+One (group, column, pk_id) index per leaderboard, so the ROW_NUMBER() window
+of /athletes/leaderboard reads each group already in rank order, forwards
+for ascending boards and backwards for descending ones.
+
+Revision ID: 4e8b1d7c2a95
+Revises: 3c6e9a2d5f14
+Create Date: 2026-10-18 18:52:09.114387
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '4e8b1d7c2a95'
+down_revision = '3c6e9a2d5f14'
+branch_labels = None
+depends_on = None
+
+# Keep in sync with LEADERBOARD_GROUPS and LEADERBOARD_COLUMNS on Athlete.
+GROUPS = ("category_id", "training_center_id")
+COLUMNS = ("weight", "age", "bmi")
+
+
+def upgrade() -> None:
+    for group in GROUPS:
+        for column in COLUMNS:
+            op.create_index(f"ix_athlete_{group}_{column}", "athlete", [group, column, "pk_id"], unique=False)
+
+
+def downgrade() -> None:
+    for group in GROUPS:
+        for column in COLUMNS:
+            op.drop_index(f"ix_athlete_{group}_{column}", table_name="athlete")
@@ -0,0 +1,40 @@
+# alembic/script.py.mako
+"""Create idempotency_key table
+
+Revision ID: b41c0e7d9a12
+Revises: 7776edb3262e
+Create Date: 2026-10-18 09:12:40.118203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b41c0e7d9a12'
+down_revision = '7776edb3262e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('idempotency_key',
+    sa.Column('key', sa.String(length=255), nullable=False),
+    sa.Column('request_hash', sa.String(length=64), nullable=False),
+    sa.Column('status_code', sa.Integer(), nullable=False),
+    sa.Column('response_body', sa.LargeBinary(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('pk_id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('pk_id'),
+    sa.UniqueConstraint('key')
+    )
+    op.create_index(op.f('ix_idempotency_key_pk_id'), 'idempotency_key', ['pk_id'], unique=False)
+    op.create_index(op.f('ix_idempotency_key_expires_at'), 'idempotency_key', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_idempotency_key_expires_at'), table_name='idempotency_key')
+    op.drop_index(op.f('ix_idempotency_key_pk_id'), table_name='idempotency_key')
+    op.drop_table('idempotency_key')
@@ -0,0 +1,45 @@
+# alembic/script.py.mako
+"""Create outbox_event table
+
+Revision ID: c83f5a1e2d47
+Revises: b41c0e7d9a12
+Create Date: 2026-10-18 10:04:51.902377
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'c83f5a1e2d47'
+down_revision = 'b41c0e7d9a12'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('outbox_event',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('aggregate_type', sa.String(length=40), nullable=False),
+    sa.Column('aggregate_id', sa.Integer(), nullable=False),
+    sa.Column('event_type', sa.String(length=40), nullable=False),
+    sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('next_attempt_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('published_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('pk_id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('pk_id'),
+    sa.UniqueConstraint('id')
+    )
+    op.create_index(op.f('ix_outbox_event_pk_id'), 'outbox_event', ['pk_id'], unique=False)
+    op.create_index('ix_outbox_event_pending', 'outbox_event', ['pk_id'], unique=False, postgresql_where=sa.text('published_at IS NULL'))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_outbox_event_pending', table_name='outbox_event', postgresql_where=sa.text('published_at IS NULL'))
+    op.drop_index(op.f('ix_outbox_event_pk_id'), table_name='outbox_event')
+    op.drop_table('outbox_event')
@@ -0,0 +1,47 @@
+# alembic/script.py.mako
+"""Create job table
+
+Revision ID: d5e2b9c4f810
+Revises: c83f5a1e2d47
+Create Date: 2026-10-18 11:27:06.541890
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5e2b9c4f810'
+down_revision = 'c83f5a1e2d47'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('job',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('job_type', sa.String(length=50), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('params', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('progress', sa.Float(), nullable=False),
+    sa.Column('message', sa.Text(), nullable=True),
+    sa.Column('result', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('pk_id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('pk_id'),
+    sa.UniqueConstraint('id')
+    )
+    op.create_index(op.f('ix_job_pk_id'), 'job', ['pk_id'], unique=False)
+    op.create_index(op.f('ix_job_status'), 'job', ['status'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_job_status'), table_name='job')
+    op.drop_index(op.f('ix_job_pk_id'), table_name='job')
+    op.drop_table('job')
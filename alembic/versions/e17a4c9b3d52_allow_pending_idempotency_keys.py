@@ -0,0 +1,36 @@
+# alembic/script.py.mako
+"""Allow pending idempotency keys
+
+Revision ID: e17a4c9b3d52
+Revises: d5e2b9c4f810
+Create Date: 2026-10-18 14:02:41.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e17a4c9b3d52'
+down_revision = 'd5e2b9c4f810'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.alter_column('idempotency_key', 'status_code',
+               existing_type=sa.Integer(),
+               nullable=True)
+    op.alter_column('idempotency_key', 'response_body',
+               existing_type=sa.LargeBinary(),
+               nullable=True)
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM idempotency_key WHERE status_code IS NULL")
+    op.alter_column('idempotency_key', 'response_body',
+               existing_type=sa.LargeBinary(),
+               nullable=False)
+    op.alter_column('idempotency_key', 'status_code',
+               existing_type=sa.Integer(),
+               nullable=False)
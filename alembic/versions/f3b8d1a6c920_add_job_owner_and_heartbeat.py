@@ -0,0 +1,27 @@
+# alembic/script.py.mako
+"""Add job owner and heartbeat
+
+Revision ID: f3b8d1a6c920
+Revises: e17a4c9b3d52
+Create Date: 2026-10-18 14:40:12.907316
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3b8d1a6c920'
+down_revision = 'e17a4c9b3d52'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('job', sa.Column('owner', sa.String(length=128), nullable=True))
+    op.add_column('job', sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('job', 'heartbeat_at')
+    op.drop_column('job', 'owner')
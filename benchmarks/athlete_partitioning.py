@@ -0,0 +1,135 @@
+#athlete_partitioning.py
+"""Heap vs hash-partitioned athlete table: per-center reads and vacuum.
+
+Builds both layouts in scratch schemas with the same synthetic roster, then
+compares per-center query latency, how many partitions the planner touches,
+and the time VACUUM needs after churn in a single center.
+
+    python -m benchmarks.athlete_partitioning --rows 2000000 --centers 500 --partitions 16
+"""
+import asyncio
+import random
+
+from sqlalchemy import text
+
+from benchmarks.common import base_parser, bench_engine, percentile, print_table, timer
+
+COLUMNS = """
+    pk_id INTEGER NOT NULL,
+    id UUID NOT NULL,
+    name VARCHAR(50) NOT NULL,
+    cpf VARCHAR(11) NOT NULL,
+    age INTEGER,
+    weight FLOAT(10),
+    height FLOAT(10),
+    sex VARCHAR(1),
+    training_center_id INTEGER,
+    category_id INTEGER
+"""
+
+ROWS_SQL = """
+    SELECT g, gen_random_uuid(), 'Athlete ' || g, lpad(g::text, 11, '0'),
+           16 + g % 25, 50 + (g % 60), 1.5 + (g % 50) / 100.0,
+           CASE WHEN g % 2 = 0 THEN 'M' ELSE 'F' END,
+           1 + g % :centers, 1 + g % 12
+    FROM generate_series(1, :rows) AS g
+"""
+
+
+async def build(conn, schema: str, partitions: int, rows: int, centers: int) -> None:
+    await conn.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+    await conn.execute(text(f"CREATE SCHEMA {schema}"))
+    if partitions:
+        await conn.execute(text(f"CREATE TABLE {schema}.athlete ({COLUMNS}) PARTITION BY HASH (training_center_id)"))
+        for remainder in range(partitions):
+            await conn.execute(text(
+                f"CREATE TABLE {schema}.athlete_p{remainder} PARTITION OF {schema}.athlete "
+                f"FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder})"
+            ))
+    else:
+        await conn.execute(text(f"CREATE TABLE {schema}.athlete ({COLUMNS}, PRIMARY KEY (pk_id))"))
+    await conn.execute(text(f"INSERT INTO {schema}.athlete {ROWS_SQL}"), {"rows": rows, "centers": centers})
+    await conn.execute(text(f"CREATE INDEX ON {schema}.athlete (training_center_id)"))
+    await conn.execute(text(f"CREATE INDEX ON {schema}.athlete (pk_id)"))
+    await conn.execute(text(f"ANALYZE {schema}.athlete"))
+
+
+async def per_center_reads(conn, schema: str, center_ids: list) -> tuple[list, int]:
+    samples = []
+    for center_id in center_ids:
+        with timer(samples):
+            await conn.execute(
+                text(f"SELECT * FROM {schema}.athlete WHERE training_center_id = :center_id"),
+                {"center_id": center_id}
+            )
+
+    plan = await conn.execute(
+        text(f"EXPLAIN (FORMAT JSON) SELECT * FROM {schema}.athlete WHERE training_center_id = :center_id"),
+        {"center_id": center_ids[0]}
+    )
+    relations = set()
+
+    def walk(node):
+        if "Relation Name" in node:
+            relations.add(node["Relation Name"])
+        for child in node.get("Plans", []):
+            walk(child)
+
+    walk(plan.scalar()[0]["Plan"])
+    return samples, len(relations)
+
+
+async def churn_and_vacuum(conn, schema: str, center_id: int) -> float:
+    await conn.execute(
+        text(f"UPDATE {schema}.athlete SET age = age + 1 WHERE training_center_id = :center_id"),
+        {"center_id": center_id}
+    )
+    # Vacuum what a per-center maintenance job would have to: the whole heap,
+    # or only the partition holding that center.
+    target = await conn.execute(
+        text(f"SELECT tableoid::regclass::text FROM {schema}.athlete WHERE training_center_id = :center_id LIMIT 1"),
+        {"center_id": center_id}
+    )
+    samples = []
+    with timer(samples):
+        await conn.execute(text(f"VACUUM {target.scalar()}"))
+    return samples[0]
+
+
+async def main() -> None:
+    parser = base_parser(__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--centers", type=int, default=200)
+    parser.add_argument("--partitions", type=int, default=8)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    engine = bench_engine(args.url)
+    center_ids = [random.randint(1, args.centers) for _ in range(args.queries)]
+    results = []
+    try:
+        async with engine.connect() as conn:
+            for label, schema, partitions in (
+                ("heap", "bench_athlete_heap", 0),
+                (f"hash x{args.partitions}", "bench_athlete_hash", args.partitions),
+            ):
+                await build(conn, schema, partitions, args.rows, args.centers)
+                samples, scanned = await per_center_reads(conn, schema, center_ids)
+                vacuum = await churn_and_vacuum(conn, schema, center_ids[0])
+                results.append((
+                    label,
+                    scanned,
+                    percentile(samples, 0.5) * 1000,
+                    percentile(samples, 0.95) * 1000,
+                    vacuum * 1000,
+                ))
+                await conn.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+    finally:
+        await engine.dispose()
+
+    print(f"{args.rows} athletes, {args.centers} training centers, {args.queries} per-center queries")
+    print_table(("layout", "relations scanned", "p50 ms", "p95 ms", "vacuum ms"), results)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,87 @@
+#uuid_inserts.py
+"""Insert throughput into a unique UUID index: uuid4 vs uuid7 keys.
+
+Each variant gets a fresh table shaped like athlete's id column (UUID with a
+unique B-tree index). Rows are inserted in batches from concurrent writers;
+the report shows rows per second, the final index size and how full its leaf
+pages are (random keys split pages and leave them half empty).
+
+    python -m benchmarks.uuid_inserts --rows 1000000 --writers 8
+"""
+import asyncio
+import time
+import uuid
+
+from sqlalchemy import text
+
+from benchmarks.common import base_parser, bench_engine, print_table
+from shared.identifiers import uuid7
+
+SCHEMA = "bench_uuid"
+GENERATORS = {"uuid4": uuid.uuid4, "uuid7": uuid7}
+
+
+async def insert_rows(engine, table: str, generate, rows: int, batch_size: int) -> None:
+    async with engine.connect() as conn:
+        for start in range(0, rows, batch_size):
+            batch = [{"id": generate(), "n": n} for n in range(start, min(start + batch_size, rows))]
+            await conn.execute(text(f"INSERT INTO {SCHEMA}.{table} (id, n) VALUES (:id, :n)"), batch)
+
+
+async def run_variant(engine, name: str, rows: int, writers: int, batch_size: int) -> tuple:
+    table = f"athlete_{name}"
+    async with engine.connect() as conn:
+        await conn.execute(text(f"CREATE TABLE {SCHEMA}.{table} (pk_id BIGSERIAL PRIMARY KEY, id UUID NOT NULL UNIQUE, n INTEGER)"))
+
+    per_writer = rows // writers
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        insert_rows(engine, table, GENERATORS[name], per_writer, batch_size) for _ in range(writers)
+    ))
+    elapsed = time.perf_counter() - started
+
+    async with engine.connect() as conn:
+        index_size = (await conn.execute(
+            text(f"SELECT pg_relation_size('{SCHEMA}.{table}_id_key')")
+        )).scalar()
+        # pgstattuple is optional; without it the leaf density column stays empty.
+        try:
+            density = (await conn.execute(
+                text(f"SELECT avg_leaf_density FROM pgstatindex('{SCHEMA}.{table}_id_key')")
+            )).scalar()
+        except Exception:
+            density = None
+
+    return name, per_writer * writers / elapsed, index_size / 1024 / 1024, density if density is not None else "-"
+
+
+async def main() -> None:
+    parser = base_parser(__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    engine = bench_engine(args.url)
+    results = []
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+            await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+            try:
+                await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pgstattuple"))
+            except Exception:
+                pass
+        for name in GENERATORS:
+            results.append(await run_variant(engine, name, args.rows, args.writers, args.batch_size))
+    finally:
+        async with engine.connect() as conn:
+            await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await engine.dispose()
+
+    print(f"{args.rows} rows, {args.writers} writers, batches of {args.batch_size}")
+    print_table(("keys", "rows/s", "index MB", "avg leaf density %"), results)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
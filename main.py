@@ -2,16 +2,51 @@ from fastapi import FastAPI
 from contextlib import asynccontextmanager
 import uvicorn
 from shared.init_db import init_db, close_db
+from shared.database import background_engine
+from shared.outbox import build_outbox_publisher
+from shared.changes import build_change_feed
+from shared.response_cache import table_versions
+from shared.jobs import build_job_runner
+from shared.admission import AdmissionControlMiddleware
+from shared.compression import CompressionMiddleware
+from shared.tracing import TracingMiddleware, tracer
+from shared.profiling import ProfilingMiddleware
+from shared.metrics import metrics
 from src.controllers.training_center import (router as training_center_router)
 from src.controllers.category import (router as category_router)
 from src.controllers.athlete import (router as athlete_router)
+from src.controllers.job import (router as job_router)
+from src.controllers.stats import (router as stats_router)
+from src.controllers.changes import (router as changes_router)
+from src.controllers.profiling import (router as profiling_router)
+from src.services.job import JOB_HANDLERS
+from src.services.athlete import athlete_group_commit
 from config.settings import settings
 
 @asynccontextmanager
 async def lifespan(_app: FastAPI):
-    await init_db()
+    engine = await init_db()
+    outbox_publisher = build_outbox_publisher() if settings.OUTBOX_PUBLISHER_ENABLED else None
+    if outbox_publisher:
+        await outbox_publisher.start()
+    job_runner = build_job_runner(JOB_HANDLERS)
+    await job_runner.start()
+    _app.state.job_runner = job_runner
+    change_feed = build_change_feed() if settings.CHANGE_FEED_ENABLED else None
+    if change_feed:
+        # Writes from other workers invalidate this worker's cached responses.
+        change_feed.on_event(lambda event: table_versions.bump(event.resource))
+        await change_feed.start()
+        _app.state.change_feed = change_feed
     yield
-    await close_db()
+    await athlete_group_commit.close()
+    if change_feed:
+        await change_feed.stop()
+    await job_runner.stop()
+    await background_engine.dispose()
+    if outbox_publisher:
+        await outbox_publisher.stop()
+    await close_db(engine)
 
 app = FastAPI(
     title="User Management API",
@@ -20,9 +55,24 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+if settings.ADMISSION_CONTROL_ENABLED:
+    app.add_middleware(AdmissionControlMiddleware)
+if tracer.enabled:
+    app.add_middleware(TracingMiddleware)
+
 app.include_router(training_center_router)
 app.include_router(category_router)
 app.include_router(athlete_router)
+app.include_router(job_router)
+app.include_router(stats_router)
+if settings.CHANGE_FEED_ENABLED:
+    app.include_router(changes_router)
+if settings.PROFILING_ENABLED:
+    app.include_router(profiling_router)
 
 @app.get("/")
 async def root():
@@ -32,6 +82,10 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/metrics")
+async def get_metrics():
+    return metrics.snapshot()
+
 if __name__ == "__main__":
     uvicorn.run(
         "main:app",
@@ -0,0 +1,43 @@
+#export_roster.py
+"""Write the athlete roster to a columnar file for analytics.
+
+Same file as GET /athletes/export, produced straight from the database
+without going through the API:
+
+    python -m scripts.export_roster --format parquet --output roster.parquet
+"""
+import argparse
+import asyncio
+import time
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from config.settings import settings
+from shared.columnar import EXTENSIONS, available_formats, default_format
+from src.services.roster_export import export_roster
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default=settings.DATABASE_URL, help="database to export from")
+    parser.add_argument("--format", choices=available_formats(), default=default_format())
+    parser.add_argument("--output", help="file to write (default: roster.<format>)")
+    parser.add_argument("--chunk-rows", type=int, default=settings.ROSTER_EXPORT_CHUNK_ROWS)
+    args = parser.parse_args()
+    if args.format is None:
+        parser.error("no export format available: install pyarrow or numpy")
+    output = args.output or f"roster{EXTENSIONS[args.format]}"
+
+    engine = create_async_engine(args.url, poolclass=NullPool)
+    started = time.perf_counter()
+    try:
+        async with AsyncSession(engine) as session:
+            rows = await export_roster(session, output, args.format, args.chunk_rows)
+    finally:
+        await engine.dispose()
+    print(f"{rows} athletes written to {output} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
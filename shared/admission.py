@@ -0,0 +1,138 @@
+#admission.py
+import asyncio
+import json
+import math
+from typing import Iterable, Optional
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from config.settings import settings
+from shared.database import connection_budget
+from shared.metrics import metrics
+
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+# /changes/stream holds no database connection, only a place in the change feed.
+EXEMPT_PATHS = frozenset({"/", "/health", "/metrics", "/docs", "/redoc", "/openapi.json", "/changes/stream"})
+# POST routes that only read (their payload is too large for a query string).
+READ_ONLY_POST_SUFFIXES = ("/batch/uuid",)
+
+
+class ConcurrencyLimiter:
+    """At most ``limit`` requests in flight and ``max_queue`` waiting behind them.
+
+    Anything beyond that, or anything that waited longer than ``queue_timeout``,
+    is turned away instead of piling up on the connection pool.
+    """
+
+    def __init__(self, name: str, limit: int, max_queue: int, queue_timeout: float):
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.waiting = 0
+        self._semaphore = asyncio.Semaphore(limit)
+
+        metrics.register_gauge(f"admission_{name}_active", lambda: self.active)
+        metrics.register_gauge(f"admission_{name}_queue_depth", lambda: self.waiting)
+        metrics.register_gauge(f"admission_{name}_rejection_rate", self.rejection_rate)
+
+    def rejection_rate(self) -> float:
+        admitted = metrics.counter(f"admission_{self.name}_admitted")
+        rejected = metrics.counter(f"admission_{self.name}_rejected")
+        total = admitted + rejected
+        return rejected / total if total else 0.0
+
+    async def acquire(self) -> bool:
+        if self._semaphore.locked() and self.waiting >= self.max_queue:
+            metrics.increment(f"admission_{self.name}_rejected")
+            return False
+
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            metrics.increment(f"admission_{self.name}_rejected")
+            return False
+        finally:
+            self.waiting -= 1
+
+        self.active += 1
+        metrics.increment(f"admission_{self.name}_admitted")
+        return True
+
+    def release(self) -> None:
+        self.active -= 1
+        self._semaphore.release()
+
+
+def pool_limits(capacity: int, write_share: float, queue_factor: float) -> dict:
+    """Split the pool's connection budget between reads and writes."""
+    capacity = max(capacity, 2)
+    writes = min(max(1, math.floor(capacity * write_share)), capacity - 1)
+    reads = capacity - writes
+    return {
+        "read": (reads, math.ceil(reads * queue_factor)),
+        "write": (writes, math.ceil(writes * queue_factor)),
+    }
+
+
+class AdmissionControlMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        capacity: Optional[int] = None,
+        write_share: float = settings.ADMISSION_WRITE_SHARE,
+        queue_factor: float = settings.ADMISSION_QUEUE_FACTOR,
+        queue_timeout: float = settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+        retry_after: int = settings.ADMISSION_RETRY_AFTER_SECONDS,
+        exempt_paths: Iterable[str] = EXEMPT_PATHS,
+        read_only_post_suffixes: Iterable[str] = READ_ONLY_POST_SUFFIXES
+    ):
+        self.app = app
+        self.retry_after = retry_after
+        self.exempt_paths = frozenset(exempt_paths)
+        self.read_only_post_suffixes = tuple(read_only_post_suffixes)
+        if capacity is None:
+            capacity = connection_budget()
+        self.limiters = {
+            route_class: ConcurrencyLimiter(route_class, limit, max_queue, queue_timeout)
+            for route_class, (limit, max_queue) in pool_limits(
+                capacity, write_share, queue_factor
+            ).items()
+        }
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self.limiters[self.route_class(scope)]
+        if not await limiter.acquire():
+            await self._reject(send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
+
+    def route_class(self, scope: Scope) -> str:
+        if scope["method"] in READ_METHODS:
+            return "read"
+        if scope["method"] == "POST" and scope["path"].rstrip("/").endswith(self.read_only_post_suffixes):
+            return "read"
+        return "write"
+
+    async def _reject(self, send: Send) -> None:
+        body = json.dumps({"detail": "Server is at capacity, retry later"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(self.retry_after).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
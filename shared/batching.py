@@ -0,0 +1,39 @@
+#batching.py
+import asyncio
+from collections import deque
+from typing import AsyncIterable, AsyncIterator, Awaitable, Callable, Deque, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+async def map_batches(
+    batches: AsyncIterable[T],
+    fn: Callable[[T], Awaitable[R]],
+    concurrency: int = 4
+) -> AsyncIterator[R]:
+    """Yield ``fn(batch)`` for every batch, in order, with at most ``concurrency`` calls in flight.
+
+    Reading the next batch overlaps with processing earlier ones, but no more
+    than ``concurrency`` batches are held at once. ``fn`` needs a session of
+    its own: the one ``batches`` reads from cannot run two statements at once.
+
+        async for result in map_batches(repository.iter_batches(batch_size=1000), recalculate):
+            ...
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    pending: Deque[asyncio.Task] = deque()
+    try:
+        async for batch in batches:
+            pending.append(asyncio.create_task(fn(batch)))
+            if len(pending) >= concurrency:
+                yield await pending.popleft()
+        while pending:
+            yield await pending.popleft()
+    finally:
+        # The caller stopped early or a batch failed: don't leave work running.
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
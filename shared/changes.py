@@ -0,0 +1,355 @@
+#changes.py
+import asyncio
+import json
+import logging
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import AsyncIterator, Awaitable, Callable, Deque, FrozenSet, List, Optional, Set
+
+import asyncpg
+from sqlalchemy.engine import make_url
+
+from config.settings import settings
+from shared.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Channel the outbox_event insert trigger notifies on (see the
+# notify_resource_changes migration). NOTIFY is transactional, so an event
+# is only delivered once the write that produced it has committed.
+CHANGES_CHANNEL = "resource_changes"
+
+BACKFILL_SQL = """
+    SELECT pk_id AS id,
+           aggregate_type AS resource,
+           event_type AS event,
+           aggregate_id AS pk_id,
+           payload->>'id' AS uuid,
+           (payload->>'training_center_id')::int AS training_center_id
+    FROM outbox_event
+    WHERE pk_id > $1
+    ORDER BY pk_id
+    LIMIT $2
+"""
+
+OLDEST_EVENT_SQL = "SELECT min(pk_id) FROM outbox_event"
+
+# Sent instead of a replay the client cannot get: the events it missed were
+# purged from outbox_event, or are more than one replay holds. The client
+# re-reads the resources it follows and keeps consuming the stream.
+RESET = b"event: reset\ndata: {}\n\n"
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    # The outbox event's pk_id: one sequence for every worker, so a client can
+    # resume on any of them.
+    id: int
+    resource: str
+    event: str
+    pk_id: int
+    uuid: Optional[str] = None
+    training_center_id: Optional[int] = None
+
+    @classmethod
+    def from_notification(cls, payload: str) -> "ChangeEvent":
+        return cls(**json.loads(payload))
+
+    def sse(self) -> bytes:
+        data = json.dumps(asdict(self), separators=(",", ":"))
+        return f"id: {self.id}\nevent: {self.resource}.{self.event}\ndata: {data}\n\n".encode()
+
+
+@dataclass(frozen=True)
+class ChangeFilter:
+    resources: FrozenSet[str] = frozenset()
+    training_center_id: Optional[int] = None
+
+    def matches(self, event: ChangeEvent) -> bool:
+        if self.resources and event.resource not in self.resources:
+            return False
+        if self.training_center_id is None:
+            return True
+        if event.resource == "training_center":
+            return event.pk_id == self.training_center_id
+        return event.training_center_id == self.training_center_id
+
+
+class Subscription:
+    """Events waiting for one SSE client.
+
+    A client that falls ``max_pending`` events behind is closed instead of
+    buffering without bound; it reconnects with Last-Event-ID and catches up
+    from the feed's history.
+    """
+
+    def __init__(self, filter: ChangeFilter, max_pending: int):
+        self.filter = filter
+        self.max_pending = max_pending
+        self.pending: Deque[ChangeEvent] = deque()
+        self.closed = False
+        self._ready = asyncio.Event()
+
+    def push(self, event: ChangeEvent) -> bool:
+        if self.closed:
+            return False
+        if len(self.pending) >= self.max_pending:
+            self.close()
+            return False
+        self.pending.append(event)
+        self._ready.set()
+        return True
+
+    def close(self) -> None:
+        self.closed = True
+        self._ready.set()
+
+    async def next(self, timeout: float) -> Optional[ChangeEvent]:
+        """The next event, or None after ``timeout`` idle seconds or once closed and drained."""
+        if not self.pending and not self.closed:
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        return self.pending.popleft() if self.pending else None
+
+
+Connect = Callable[[str], Awaitable[asyncpg.Connection]]
+
+
+class ChangeFeed:
+    """Fans out NOTIFY events from one LISTEN connection to every SSE subscriber.
+
+    Live subscribers never touch the database. The last ``history_size``
+    events are kept for Last-Event-ID resumption; a client further behind has
+    its missed events read back from outbox_event, which keeps them for
+    OUTBOX_RETENTION_HOURS. After the connection is lost the events committed
+    in the meantime are read back from outbox_event too.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        history_size: int = 1000,
+        max_pending: int = 1000,
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 30.0,
+        connect: Connect = asyncpg.connect
+    ):
+        self.dsn = dsn
+        self.max_pending = max_pending
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self._connect = connect
+        self._history: Deque[ChangeEvent] = deque(maxlen=history_size)
+        self._history_ids: Set[int] = set()
+        self._subscribers: Set[Subscription] = set()
+        self._callbacks: List[Callable[[ChangeEvent], None]] = []
+        self._task: Optional[asyncio.Task] = None
+        # One read-back at a time, so a wave of reconnecting clients opens
+        # one extra connection rather than one each.
+        self._read_back_lock = asyncio.Lock()
+        self.connected = asyncio.Event()
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscribers)
+
+    @property
+    def last_event_id(self) -> Optional[int]:
+        return max(self._history_ids) if self._history_ids else None
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for subscription in list(self._subscribers):
+            subscription.close()
+        self._subscribers.clear()
+
+    def on_event(self, callback: Callable[[ChangeEvent], None]) -> None:
+        """Call ``callback`` for every new event, whoever wrote it."""
+        self._callbacks.append(callback)
+
+    def subscribe(self, filter: ChangeFilter, last_event_id: Optional[int] = None) -> tuple[Subscription, List[ChangeEvent]]:
+        """Register a subscriber and return the events it missed since ``last_event_id``."""
+        # No await between computing the replay and registering, so no event
+        # can fall in between or be delivered twice.
+        subscription = Subscription(filter, self.max_pending)
+        self._subscribers.add(subscription)
+        return subscription, self._replay(filter, last_event_id)
+
+    async def resume(
+        self,
+        filter: ChangeFilter,
+        last_event_id: Optional[int]
+    ) -> tuple[Subscription, List[ChangeEvent], bool]:
+        """subscribe(), reading back from outbox_event what is older than the history.
+
+        The flag is False when the missed events can no longer be replayed
+        and the client has to be sent RESET.
+        """
+        subscription, replay = self.subscribe(filter, last_event_id)
+        if last_event_id is None or not self._before_history(last_event_id):
+            return subscription, replay, True
+        try:
+            async with self._read_back_lock:
+                complete, events = await self._read_back(last_event_id)
+        except BaseException:
+            self.unsubscribe(subscription)
+            raise
+        if not complete:
+            return subscription, replay, False
+        # Events published while reading are already queued for the subscriber.
+        seen = self._history_ids | {event.id for event in replay}
+        missed = [event for event in events if event.id not in seen and filter.matches(event)]
+        return subscription, missed + replay, True
+
+    def _before_history(self, last_event_id: int) -> bool:
+        if last_event_id in self._history_ids:
+            return False
+        return not self._history_ids or last_event_id < min(self._history_ids)
+
+    async def _read_back(self, last_event_id: int) -> tuple[bool, List[ChangeEvent]]:
+        limit = self._history.maxlen + self.max_pending
+        connection = await self._connect(self.dsn)
+        try:
+            oldest = await connection.fetchval(OLDEST_EVENT_SQL)
+            rows = await connection.fetch(BACKFILL_SQL, last_event_id, limit)
+        finally:
+            await connection.close()
+        # The purge only removes a run of events from the start of
+        # outbox_event, so none after last_event_id is gone while the oldest
+        # one left follows it directly.
+        complete = oldest is not None and oldest <= last_event_id + 1 and len(rows) < limit
+        return complete, [ChangeEvent(**dict(row)) for row in rows]
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+
+    def _replay(self, filter: ChangeFilter, last_event_id: Optional[int]) -> List[ChangeEvent]:
+        if last_event_id is None:
+            return []
+        history = list(self._history)
+        if last_event_id in self._history_ids:
+            # Transactions commit out of pk_id order, so resume after the
+            # position the client reached rather than after its id.
+            position = next(i for i, event in enumerate(history) if event.id == last_event_id)
+            missed = history[position + 1:]
+        else:
+            missed = [event for event in history if event.id > last_event_id]
+        return [event for event in missed if filter.matches(event)]
+
+    def publish(self, event: ChangeEvent) -> None:
+        if event.id in self._history_ids:
+            return
+        if len(self._history) == self._history.maxlen:
+            self._history_ids.discard(self._history[0].id)
+        self._history.append(event)
+        self._history_ids.add(event.id)
+        metrics.increment("changes_events")
+        for callback in self._callbacks:
+            callback(event)
+
+        for subscription in list(self._subscribers):
+            if subscription.filter.matches(event) and not subscription.push(event):
+                self._subscribers.discard(subscription)
+                metrics.increment("changes_subscribers_dropped")
+
+    def _on_notification(self, connection, pid: int, channel: str, payload: str) -> None:
+        try:
+            event = ChangeEvent.from_notification(payload)
+        except (ValueError, TypeError):
+            logger.warning("Ignoring malformed change notification: %s", payload)
+            return
+        self.publish(event)
+
+    async def _run(self) -> None:
+        delay = self.reconnect_delay
+        while True:
+            try:
+                connection = await self._connect(self.dsn)
+            except Exception:
+                logger.exception("Change feed could not connect, retrying in %.1fs", delay)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+                continue
+
+            lost = asyncio.Event()
+            try:
+                connection.add_termination_listener(lambda _connection: lost.set())
+                await connection.add_listener(CHANGES_CHANNEL, self._on_notification)
+                await self._backfill(connection)
+                self.connected.set()
+                delay = self.reconnect_delay
+                await lost.wait()
+                logger.warning("Change feed connection lost, reconnecting")
+                metrics.increment("changes_listener_reconnects")
+            except Exception:
+                logger.exception("Change feed listener failed")
+                await asyncio.sleep(delay)
+            finally:
+                self.connected.clear()
+                if not connection.is_closed():
+                    connection.terminate()
+
+    async def _backfill(self, connection) -> None:
+        last_event_id = self.last_event_id
+        if last_event_id is None:
+            return
+        rows = await connection.fetch(BACKFILL_SQL, last_event_id, self._history.maxlen)
+        for row in rows:
+            self.publish(ChangeEvent(**dict(row)))
+
+
+async def sse_stream(
+    feed: ChangeFeed,
+    subscription: Subscription,
+    replay: List[ChangeEvent],
+    heartbeat: float,
+    reset: bool = False
+) -> AsyncIterator[bytes]:
+    try:
+        if reset:
+            yield RESET
+        for event in replay:
+            yield event.sse()
+        while True:
+            event = await subscription.next(heartbeat)
+            if event is not None:
+                yield event.sse()
+            elif subscription.closed:
+                return
+            else:
+                # Keeps proxies from timing out an idle stream.
+                yield b": keep-alive\n\n"
+    finally:
+        feed.unsubscribe(subscription)
+
+
+def listen_dsn() -> str:
+    """Plain libpq DSN for the LISTEN connection.
+
+    LISTEN needs a session of its own, so behind a transaction-mode PgBouncer
+    CHANGES_DATABASE_URL must point straight at Postgres.
+    """
+    url = make_url(settings.CHANGES_DATABASE_URL or settings.DATABASE_URL)
+    return url.set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+def build_change_feed() -> ChangeFeed:
+    feed = ChangeFeed(
+        listen_dsn(),
+        history_size=settings.CHANGE_FEED_HISTORY_SIZE,
+        max_pending=settings.CHANGE_FEED_MAX_PENDING
+    )
+    metrics.register_gauge("changes_subscribers", lambda: feed.subscribers)
+    return feed
@@ -0,0 +1,151 @@
+#columnar.py
+import shutil
+import tempfile
+import zipfile
+from dataclasses import dataclass
+from datetime import timezone
+from typing import Dict, List, Literal, Optional, Sequence
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # optional dependency
+    pyarrow = None
+
+try:
+    import numpy
+    from numpy.lib import format as npy_format
+except ImportError:  # optional dependency
+    numpy = None
+
+ColumnarFormat = Literal["parquet", "arrow", "npz"]
+ColumnKind = Literal["int", "float", "str", "datetime"]
+
+MEDIA_TYPES = {
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.file",
+    "npz": "application/octet-stream",
+}
+EXTENSIONS = {"parquet": ".parquet", "arrow": ".arrow", "npz": ".npz"}
+
+
+@dataclass(frozen=True)
+class Column:
+    name: str
+    kind: ColumnKind
+    nullable: bool = True
+    # Longest value of a str column; NumPy arrays are fixed-width.
+    width: int = 0
+
+
+def available_formats() -> List[str]:
+    formats = []
+    if pyarrow is not None:
+        formats += ["parquet", "arrow"]
+    if numpy is not None:
+        formats.append("npz")
+    return formats
+
+
+def default_format() -> Optional[str]:
+    formats = available_formats()
+    return formats[0] if formats else None
+
+
+class ArrowWriter:
+    """Parquet (one row group per chunk) or Arrow IPC file (one record batch per chunk)."""
+
+    TYPES = {
+        "int": lambda: pyarrow.int64(),
+        "float": lambda: pyarrow.float64(),
+        "str": lambda: pyarrow.string(),
+        "datetime": lambda: pyarrow.timestamp("us", tz="UTC"),
+    }
+
+    def __init__(self, path: str, columns: Sequence[Column], format: ColumnarFormat):
+        self.schema = pyarrow.schema([
+            pyarrow.field(column.name, self.TYPES[column.kind](), nullable=column.nullable)
+            for column in columns
+        ])
+        if format == "parquet":
+            self._writer = pyarrow.parquet.ParquetWriter(path, self.schema, compression="zstd")
+        else:
+            self._writer = pyarrow.ipc.new_file(path, self.schema)
+
+    def write(self, chunk: Dict[str, list]) -> None:
+        self._writer.write_batch(pyarrow.RecordBatch.from_pydict(chunk, schema=self.schema))
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+class NpzWriter:
+    """Fallback without pyarrow: one .npy array per column in an .npz archive.
+
+    Each chunk is appended to a temporary file per column and copied behind
+    its .npy header once the row count is known, so memory stays at one chunk.
+    Nullable ints become float64 with NaN, datetimes UTC datetime64[us] with
+    NaT, and strings fixed-width unicode with "" for NULL.
+    """
+
+    def __init__(self, path: str, columns: Sequence[Column]):
+        self.path = path
+        self.columns = list(columns)
+        self.rows = 0
+        self._dtypes = {column.name: self._dtype(column) for column in self.columns}
+        self._parts = {column.name: tempfile.TemporaryFile() for column in self.columns}
+
+    @staticmethod
+    def _dtype(column: Column):
+        if column.kind == "int":
+            return numpy.dtype("int64" if not column.nullable else "float64")
+        if column.kind == "float":
+            return numpy.dtype("float64")
+        if column.kind == "datetime":
+            return numpy.dtype("datetime64[us]")
+        return numpy.dtype(f"<U{max(column.width, 1)}")
+
+    @staticmethod
+    def _prepare(column: Column, values: list) -> list:
+        if column.kind in ("int", "float"):
+            return [numpy.nan if value is None else value for value in values]
+        if column.kind == "datetime":
+            return [
+                numpy.datetime64("NaT") if value is None
+                else numpy.datetime64(value.astimezone(timezone.utc).replace(tzinfo=None), "us")
+                for value in values
+            ]
+        return ["" if value is None else value for value in values]
+
+    def write(self, chunk: Dict[str, list]) -> None:
+        for column in self.columns:
+            values = chunk[column.name]
+            array = numpy.asarray(self._prepare(column, values), dtype=self._dtypes[column.name])
+            self._parts[column.name].write(array.tobytes())
+        self.rows += len(values)
+
+    def close(self) -> None:
+        try:
+            with zipfile.ZipFile(self.path, "w", allowZip64=True) as archive:
+                for column in self.columns:
+                    part = self._parts[column.name]
+                    part.seek(0)
+                    with archive.open(f"{column.name}.npy", "w", force_zip64=True) as member:
+                        npy_format.write_array_header_1_0(member, {
+                            "descr": npy_format.dtype_to_descr(self._dtypes[column.name]),
+                            "fortran_order": False,
+                            "shape": (self.rows,),
+                        })
+                        shutil.copyfileobj(part, member)
+        finally:
+            for part in self._parts.values():
+                part.close()
+
+
+def open_writer(format: ColumnarFormat, path: str, columns: Sequence[Column]):
+    if format not in available_formats():
+        raise ValueError(f"{format} export needs {'numpy' if format == 'npz' else 'pyarrow'} installed")
+    if format == "npz":
+        return NpzWriter(path, columns)
+    return ArrowWriter(path, columns, format)
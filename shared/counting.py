@@ -0,0 +1,105 @@
+#counting.py
+import json
+import time
+from collections import OrderedDict
+from typing import Hashable, Literal, Optional, Tuple
+
+from sqlalchemy import Select, func, select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.settings import settings
+from shared.metrics import metrics
+
+CountMode = Literal["exact", "estimated", "none"]
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+# Rows the planner believes the table holds: the table itself, or the sum of its
+# leaf partitions when it is partitioned (the parent has no rows of its own).
+# reltuples is -1 until the relation has been vacuumed or analyzed.
+RELTUPLES_SQL = text("""
+    SELECT CASE WHEN bool_and(c.reltuples < 0) THEN NULL
+                ELSE sum(greatest(c.reltuples, 0))::bigint END
+    FROM pg_class c
+    WHERE c.relkind = 'r'
+      AND (c.oid = to_regclass(:table)
+           OR c.oid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = to_regclass(:table)))
+""")
+
+
+class CountCache:
+    """Exact counts by filter, each kept for ``ttl`` seconds."""
+
+    def __init__(self, ttl: float = 30.0, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, Tuple[float, int]] = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[int]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, total = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        return total
+
+    def set(self, key: Hashable, total: int) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, total)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+count_cache = CountCache(settings.COUNT_CACHE_TTL_SECONDS, settings.COUNT_CACHE_MAX_ENTRIES)
+
+
+def _literal_sql(query: Select) -> str:
+    return str(query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+async def exact_count(db: AsyncSession, query: Select, cache: Optional[CountCache] = None) -> int:
+    if cache is None:
+        cache = count_cache
+    key = _literal_sql(query)
+    total = cache.get(key)
+    if total is not None:
+        metrics.increment("count_exact_cache_hit")
+        return total
+
+    metrics.increment("count_exact_cache_miss")
+    total = await db.scalar(select(func.count()).select_from(query.subquery()))
+    cache.set(key, total)
+    return total
+
+
+async def planner_estimate(db: AsyncSession, query: Select) -> int:
+    """Rows the planner expects ``query`` to return, from EXPLAIN without running it."""
+    # EXPLAIN cannot take bind parameters, so the filter values are inlined.
+    # They come from validated path and query parameters (ints, UUIDs).
+    result = await db.execute(text(f"EXPLAIN (FORMAT JSON) {_literal_sql(query)}"))
+    plan = result.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def estimated_count(db: AsyncSession, query: Select, table: str) -> int:
+    if query.whereclause is None:
+        total = await db.scalar(RELTUPLES_SQL, {"table": table})
+        if total is not None:
+            return total
+    return await planner_estimate(db, query)
+
+
+async def total_count(db: AsyncSession, query: Select, table: str, mode: CountMode) -> Optional[int]:
+    """Total rows matching ``query`` (without skip/limit), or None when not requested."""
+    if mode == "exact":
+        return await exact_count(db, query)
+    if mode == "estimated":
+        return await estimated_count(db, query, table)
+    return None
@@ -1,21 +1,113 @@
 #database.py
+from uuid import uuid4
+
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
 from sqlalchemy import MetaData
 from config.settings import settings
+from shared.deadlines import enforce_statement_timeouts
+from shared.tracing import instrument_engine
 
 DATABASE_URL = settings.DATABASE_URL
 
+
+def transaction_pooling_connect_args() -> dict:
+    # PgBouncer in transaction mode hands every transaction to a possibly
+    # different server connection, so nothing may outlive a transaction:
+    # no cached prepared statements and no predictable statement names.
+    return {
+        "statement_cache_size": 0,
+        "prepared_statement_cache_size": 0,
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+    }
+
+
+def engine_options(
+    transaction_pooling: bool | None = None,
+    pool_size: int | None = None,
+    max_overflow: int | None = None,
+    pool_timeout: float | None = None
+) -> dict:
+    if transaction_pooling is None:
+        transaction_pooling = settings.PGBOUNCER_TRANSACTION_MODE
+
+    options = {
+        "echo": settings.is_development,
+        "future": True,
+        "pool_pre_ping": True,
+        "pool_recycle": 300,
+    }
+    if pool_size is not None:
+        options["pool_size"] = pool_size
+    if max_overflow is not None:
+        options["max_overflow"] = max_overflow
+    if pool_timeout is not None:
+        options["pool_timeout"] = pool_timeout
+    if transaction_pooling:
+        options.pop("pool_size", None)
+        options.pop("max_overflow", None)
+        options.pop("pool_timeout", None)
+        # PgBouncer owns the server-side pool; keeping client connections
+        # around would only pin prepared statements on server connections.
+        options.pop("pool_recycle")
+        options["poolclass"] = NullPool
+        options["connect_args"] = transaction_pooling_connect_args()
+    return options
+
+
+def connection_budget(transaction_pooling: bool | None = None) -> int:
+    """Connections request traffic can actually hold at once."""
+    if transaction_pooling is None:
+        transaction_pooling = settings.PGBOUNCER_TRANSACTION_MODE
+    if transaction_pooling:
+        # NullPool has no limit of its own; PgBouncer's server pool is the cap.
+        return settings.PGBOUNCER_POOL_SIZE
+    return settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+
+
 engine = create_async_engine(
     DATABASE_URL,
-    echo=settings.is_development,
-    future=True,
-    pool_pre_ping=True,
-    pool_recycle=300
+    **engine_options(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT
+    )
 )
 
+instrument_engine(engine.sync_engine)
+
+class RequestSession(Session):
+    """Session class behind request sessions, whose statements time out with the request deadline."""
+
+
+enforce_statement_timeouts(RequestSession)
+
 AsyncSessionLocal = async_sessionmaker(
     bind=engine,
     class_=AsyncSession,
+    sync_session_class=RequestSession,
+    expire_on_commit=False,
+    autoflush=False,
+    autocommit=False
+)
+
+# Background jobs and the outbox publisher get their own engine so long-running
+# work is capped at BACKGROUND_DB_POOL_SIZE connections and never competes with
+# request traffic.
+background_engine = create_async_engine(
+    DATABASE_URL,
+    **engine_options(
+        pool_size=settings.BACKGROUND_DB_POOL_SIZE,
+        max_overflow=settings.BACKGROUND_DB_MAX_OVERFLOW
+    )
+)
+
+instrument_engine(background_engine.sync_engine)
+
+BackgroundSessionLocal = async_sessionmaker(
+    bind=background_engine,
+    class_=AsyncSession,
     expire_on_commit=False,
     autoflush=False,
     autocommit=False
@@ -24,6 +116,9 @@ AsyncSessionLocal = async_sessionmaker(
 metadata = MetaData()
 
 async def get_db() -> AsyncSession:
+    # AsyncSession only checks out a connection on its first statement. Declare
+    # with Depends(get_db, scope="function") so it goes back to the pool when
+    # the handler returns, not after the response has been sent.
     async with AsyncSessionLocal() as session:
         try:
             yield session
@@ -31,4 +126,5 @@ async def get_db() -> AsyncSession:
             await session.rollback()
             raise
         finally:
-            await session.close()
\ No newline at end of file
+            await session.close()
+
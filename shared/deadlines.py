@@ -0,0 +1,114 @@
+#deadlines.py
+import asyncio
+import functools
+from contextvars import ContextVar
+from typing import AsyncIterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+
+from config.settings import settings
+from shared.metrics import metrics
+from shared.tracing import TracedRoute
+from src.exceptions.custom_exceptions import GatewayTimeoutException
+
+# Postgres cancelled the statement: statement_timeout (or a cancel request
+# sent when the awaiting task was cancelled).
+QUERY_CANCELED = "57014"
+
+# Absolute event loop time by which the current request must be done.
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left in the current request's budget, or None without one."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - asyncio.get_running_loop().time()
+
+
+def route_deadline(method: str, path: str) -> float:
+    return settings.ROUTE_DEADLINES.get(f"{method} {path}", settings.REQUEST_DEADLINE_SECONDS)
+
+
+def enforce_statement_timeouts(session_class: type[Session]) -> None:
+    """Cap each statement of a transaction begun by ``session_class`` at the
+    budget the request had left when the transaction began.
+
+    statement_timeout applies to every statement on its own, so a transaction
+    of several statements can still run past the budget on the server. The
+    asyncio timeout is what bounds the request as a whole: it cancels the
+    awaiting task, and asyncpg then asks the server to cancel the query.
+    statement_timeout is the server-side backstop for when that cancel
+    request is lost or the client is gone.
+    """
+
+    @event.listens_for(session_class, "after_begin")
+    def set_statement_timeout(session, transaction, connection):
+        if _deadline.get() is None:
+            return
+        milliseconds = max(1, int(remaining() * 1000))
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {milliseconds}")
+
+
+class DeadlineRoute(TracedRoute):
+    """TracedRoute that gives up on a request once its time budget is spent.
+
+    Budgets come from ROUTE_DEADLINES (keyed by "METHOD /path/template") or
+    REQUEST_DEADLINE_SECONDS, and cover the endpoint and its dependencies.
+    Running out, client-side or in Postgres, is a 504.
+    """
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        name = self.endpoint.__name__
+
+        @functools.wraps(handler)
+        async def deadline_handler(request: Request) -> Response:
+            if not settings.REQUEST_DEADLINES_ENABLED:
+                return await handler(request)
+
+            budget = route_deadline(request.method, self.path)
+            deadline = asyncio.get_running_loop().time() + budget
+            token = _deadline.set(deadline)
+            timeout = asyncio.timeout_at(deadline)
+            try:
+                async with timeout:
+                    response = await handler(request)
+            except TimeoutError:
+                if not timeout.expired():
+                    # Some other timeout inside the handler (an HTTP client,
+                    # a broker): not this request's budget running out.
+                    raise
+                raise _exceeded(name, budget)
+            except DBAPIError as exc:
+                if getattr(exc.orig, "sqlstate", None) != QUERY_CANCELED:
+                    raise
+                raise _exceeded(name, budget) from exc
+            finally:
+                _deadline.reset(token)
+
+            if isinstance(response, StreamingResponse):
+                # Streamed rows are read after the handler returns; keep their
+                # transaction on the same budget.
+                response.body_iterator = _within_deadline(response.body_iterator, deadline)
+            return response
+
+        return deadline_handler
+
+
+def _exceeded(name: str, budget: float) -> GatewayTimeoutException:
+    metrics.increment("deadline_exceeded")
+    metrics.increment(f"deadline_{name}_exceeded")
+    return GatewayTimeoutException(f"Request did not complete within {budget:g}s")
+
+
+async def _within_deadline(chunks: AsyncIterator[bytes], deadline: float) -> AsyncIterator[bytes]:
+    # Runs in the task sending the body, which has a context of its own.
+    _deadline.set(deadline)
+    async for chunk in chunks:
+        yield chunk
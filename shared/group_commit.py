@@ -0,0 +1,83 @@
+#group_commit.py
+import asyncio
+import contextvars
+from typing import Any, Awaitable, Callable, Generic, List, Optional, Set, Tuple, TypeVar
+
+from shared.metrics import metrics
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# One outcome per item, in order: the item's result, or an exception raised
+# to that item's caller alone.
+Write = Callable[[List[T]], Awaitable[List[Any]]]
+
+
+class GroupCommit(Generic[T, R]):
+    """Gathers concurrent submissions into batches written by one ``write`` call.
+
+    A batch goes out once ``max_batch_size`` items are waiting or ``max_linger``
+    seconds after its first item arrived, whichever comes first, so a caller
+    waits at most ``max_linger`` longer than its own write takes. If ``write``
+    raises, every caller in that batch gets the error.
+    """
+
+    def __init__(self, write: Write, max_batch_size: int = 100, max_linger: float = 0.005, name: str = "default"):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.write = write
+        self.max_batch_size = max_batch_size
+        self.max_linger = max_linger
+        self.name = name
+        self._pending: List[Tuple[T, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._batches: Set[asyncio.Task] = set()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    async def submit(self, item: T) -> R:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_linger, self._flush)
+        return await future
+
+    async def close(self) -> None:
+        """Write whatever is waiting and wait for every batch in flight."""
+        self._flush()
+        await asyncio.gather(*self._batches, return_exceptions=True)
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        # A fresh context: the batch belongs to no single request, so it must
+        # not inherit the first caller's span or deadline.
+        task = asyncio.create_task(self._write_batch(batch), context=contextvars.Context())
+        self._batches.add(task)
+        task.add_done_callback(self._batches.discard)
+
+    async def _write_batch(self, batch: List[Tuple[T, asyncio.Future]]) -> None:
+        metrics.increment(f"group_commit_{self.name}_batches")
+        metrics.increment(f"group_commit_{self.name}_items", len(batch))
+        try:
+            outcomes = await self.write([item for item, _ in batch])
+        except Exception as exc:
+            outcomes = [exc] * len(batch)
+
+        for (_, future), outcome in zip(batch, outcomes):
+            if future.done():
+                # The caller gave up (cancelled); its row may still be written.
+                continue
+            if isinstance(outcome, BaseException):
+                future.set_exception(outcome)
+            else:
+                future.set_result(outcome)
@@ -0,0 +1,321 @@
+#idempotency.py
+import asyncio
+import hashlib
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Optional, Type
+
+from fastapi import Response
+from pydantic import BaseModel
+from sqlalchemy import select, delete, or_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from config.settings import settings
+from shared.database import AsyncSessionLocal
+from src.models.idempotency_key import IdempotencyKey
+from src.exceptions.custom_exceptions import ValidationException
+
+REPLAYED_HEADER = "Idempotent-Replayed"
+MISMATCH_DETAIL = "Idempotency-Key was already used with a different request payload"
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    request_hash: str
+    status_code: Optional[int] = None
+    body: Optional[bytes] = None
+
+    @property
+    def pending(self) -> bool:
+        """Claimed by a request whose handler has not finished yet."""
+        return self.status_code is None
+
+
+class IdempotencyStore(ABC):
+    @abstractmethod
+    async def get(self, key: str) -> Optional[StoredResponse]:
+        ...
+
+    @abstractmethod
+    async def claim(self, key: str, request_hash: str, lease: float) -> bool:
+        """Atomically reserve ``key`` for one request; False if someone holds it."""
+
+    @abstractmethod
+    async def set(self, key: str, response: StoredResponse, ttl: int) -> None:
+        ...
+
+    @abstractmethod
+    async def release(self, key: str) -> None:
+        """Drop an unfinished claim so the next request may run the handler."""
+
+
+class InMemoryIdempotencyStore(IdempotencyStore):
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, StoredResponse]] = OrderedDict()
+
+    async def get(self, key: str) -> Optional[StoredResponse]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, response = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return response
+
+    async def claim(self, key: str, request_hash: str, lease: float) -> bool:
+        if await self.get(key) is not None:
+            return False
+        self._store(key, StoredResponse(request_hash), lease)
+        return True
+
+    async def set(self, key: str, response: StoredResponse, ttl: int) -> None:
+        self._store(key, response, ttl)
+
+    async def release(self, key: str) -> None:
+        entry = self._entries.get(key)
+        if entry is not None and entry[1].pending:
+            del self._entries[key]
+
+    def _store(self, key: str, response: StoredResponse, ttl: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class PostgresIdempotencyStore(IdempotencyStore):
+    """Shares claims and stored responses between workers through the idempotency_key table.
+
+    Uses its own short-lived sessions so a replay never touches the request session.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker = AsyncSessionLocal):
+        self.session_factory = session_factory
+
+    async def get(self, key: str) -> Optional[StoredResponse]:
+        async with self.session_factory() as session:
+            result = await session.execute(
+                select(IdempotencyKey).where(
+                    IdempotencyKey.key == key,
+                    IdempotencyKey.expires_at > datetime.now(timezone.utc)
+                )
+            )
+            record = result.scalar_one_or_none()
+
+        if record is None:
+            return None
+        return StoredResponse(record.request_hash, record.status_code, record.response_body)
+
+    async def claim(self, key: str, request_hash: str, lease: float) -> bool:
+        now = datetime.now(timezone.utc)
+        values = {
+            "key": key,
+            "request_hash": request_hash,
+            "status_code": None,
+            "response_body": None,
+            "expires_at": now + timedelta(seconds=lease),
+        }
+        statement = insert(IdempotencyKey).values(**values)
+        # A pending row is only a lease: once it expires (its worker died) the
+        # key can be claimed again, just like an expired response.
+        statement = statement.on_conflict_do_update(
+            index_elements=[IdempotencyKey.key],
+            set_={name: statement.excluded[name] for name in values if name != "key"},
+            where=IdempotencyKey.expires_at <= now
+        ).returning(IdempotencyKey.pk_id)
+        async with self.session_factory() as session:
+            result = await session.execute(statement)
+            claimed = result.scalar_one_or_none() is not None
+            await session.commit()
+        return claimed
+
+    async def set(self, key: str, response: StoredResponse, ttl: int) -> None:
+        values = {
+            "key": key,
+            "request_hash": response.request_hash,
+            "status_code": response.status_code,
+            "response_body": response.body,
+            "expires_at": datetime.now(timezone.utc) + timedelta(seconds=ttl),
+        }
+        statement = insert(IdempotencyKey).values(**values)
+        # Fills our own pending claim; a live stored response always wins.
+        statement = statement.on_conflict_do_update(
+            index_elements=[IdempotencyKey.key],
+            set_={name: statement.excluded[name] for name in values if name != "key"},
+            where=or_(
+                IdempotencyKey.status_code.is_(None),
+                IdempotencyKey.expires_at <= datetime.now(timezone.utc)
+            )
+        )
+        async with self.session_factory() as session:
+            await session.execute(statement)
+            await session.commit()
+
+    async def release(self, key: str) -> None:
+        async with self.session_factory() as session:
+            await session.execute(
+                delete(IdempotencyKey).where(
+                    IdempotencyKey.key == key,
+                    IdempotencyKey.status_code.is_(None)
+                )
+            )
+            await session.commit()
+
+    async def purge_expired(self) -> int:
+        async with self.session_factory() as session:
+            result = await session.execute(
+                delete(IdempotencyKey).where(IdempotencyKey.expires_at <= datetime.now(timezone.utc))
+            )
+            await session.commit()
+        return result.rowcount
+
+
+class IdempotencyManager:
+    """Runs a create handler at most once per Idempotency-Key.
+
+    The first request claims the key in the store before running the handler;
+    its response is stored together with a hash of the request body and
+    replayed verbatim on retries. Concurrent duplicates wait for the in-flight
+    result instead of running the handler again: in the same worker through a
+    shared future, across workers by polling the claimed key.
+    """
+
+    def __init__(self, store: IdempotencyStore, ttl: int, lease: float = 30.0, poll_interval: float = 0.05):
+        self.store = store
+        self.ttl = ttl
+        self.lease = lease
+        self.poll_interval = poll_interval
+        self._in_flight: dict[str, asyncio.Future] = {}
+
+    @staticmethod
+    def request_hash(scope: str, payload: BaseModel) -> str:
+        digest = hashlib.sha256(scope.encode())
+        digest.update(payload.model_dump_json().encode())
+        return digest.hexdigest()
+
+    async def run(
+        self,
+        key: Optional[str],
+        scope: str,
+        payload: BaseModel,
+        response_model: Type[BaseModel],
+        handler: Callable[[], Awaitable[object]],
+        status_code: int = 200
+    ):
+        if not key:
+            return await handler()
+
+        store_key = f"{scope}:{key}"
+        request_hash = self.request_hash(scope, payload)
+
+        while True:
+            in_flight = self._in_flight.get(store_key)
+            if in_flight is None:
+                break
+            try:
+                stored = await asyncio.shield(in_flight)
+            except asyncio.CancelledError:
+                # The leader was cancelled (e.g. its client went away); only
+                # give up if we were cancelled ourselves, otherwise take over.
+                if not in_flight.cancelled() or asyncio.current_task().cancelling():
+                    raise
+                continue
+            return self._replay(stored, request_hash)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[store_key] = future
+        try:
+            stored, replayed = await self._execute(store_key, request_hash, response_model, handler, status_code)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Waiters re-raise it; nobody else needs to retrieve it.
+            future.exception()
+            raise
+        else:
+            future.set_result(stored)
+        finally:
+            self._in_flight.pop(store_key, None)
+
+        if replayed:
+            return self._replay(stored, request_hash)
+        return self._response(stored)
+
+    async def _execute(
+        self,
+        store_key: str,
+        request_hash: str,
+        response_model: Type[BaseModel],
+        handler: Callable[[], Awaitable[object]],
+        status_code: int
+    ) -> tuple[StoredResponse, bool]:
+        while True:
+            stored = await self.store.get(store_key)
+            if stored is not None and stored.pending:
+                if stored.request_hash != request_hash:
+                    raise ValidationException(MISMATCH_DETAIL)
+                # Another worker holds the key: wait for its result, or for
+                # the claim to be released or to expire.
+                stored = await self._wait_for(store_key)
+            if stored is not None:
+                return stored, True
+            if await self.store.claim(store_key, request_hash, self.lease):
+                break
+
+        try:
+            result = await handler()
+            body = response_model.model_validate(result).model_dump_json().encode()
+        except BaseException:
+            # Shielded so a cancelled request still frees the key for a retry.
+            await asyncio.shield(self.store.release(store_key))
+            raise
+        stored = StoredResponse(request_hash, status_code, body)
+        await self.store.set(store_key, stored, self.ttl)
+        return stored, False
+
+    async def _wait_for(self, store_key: str) -> Optional[StoredResponse]:
+        delay = self.poll_interval
+        while True:
+            await asyncio.sleep(delay)
+            stored = await self.store.get(store_key)
+            if stored is None or not stored.pending:
+                return stored
+            delay = min(delay * 2, 0.5)
+
+    def _replay(self, stored: StoredResponse, request_hash: str) -> Response:
+        if stored.request_hash != request_hash:
+            raise ValidationException(MISMATCH_DETAIL)
+        return self._response(stored, {REPLAYED_HEADER: "true"})
+
+    @staticmethod
+    def _response(stored: StoredResponse, headers: Optional[dict] = None) -> Response:
+        return Response(
+            content=stored.body,
+            status_code=stored.status_code,
+            media_type="application/json",
+            headers=headers
+        )
+
+
+def build_idempotency_store() -> IdempotencyStore:
+    if settings.IDEMPOTENCY_STORE == "postgres":
+        return PostgresIdempotencyStore()
+    return InMemoryIdempotencyStore(settings.IDEMPOTENCY_MAX_ENTRIES)
+
+
+idempotency = IdempotencyManager(
+    build_idempotency_store(),
+    settings.IDEMPOTENCY_TTL_SECONDS,
+    lease=settings.IDEMPOTENCY_LEASE_SECONDS
+)
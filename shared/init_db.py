@@ -1,6 +1,7 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine
 from sqlalchemy import text
 from config.settings import settings
+from shared.database import engine_options
 import backoff
 import logging
 
@@ -14,12 +15,7 @@ async def init_db() -> AsyncEngine:
 
     try:
         logger.info(f"Trying to connect with {settings.DATABASE_URL}")
-        engine = create_async_engine(
-            settings.DATABASE_URL,
-            echo=settings.is_development,
-            pool_pre_ping=True,
-            pool_recycle=3600
-        )
+        engine = create_async_engine(settings.DATABASE_URL, **engine_options())
 
         async with engine.begin() as conn:
             await conn.execute(text("SELECT 1"))
@@ -36,11 +32,7 @@ async def init_db() -> AsyncEngine:
             logger.info(f"Trying fallback: {fallback_url}")
 
             try:
-                engine = create_async_engine(
-                    fallback_url,
-                    echo=settings.is_development,
-                    pool_pre_ping=True
-                )
+                engine = create_async_engine(fallback_url, **engine_options())
                 async with engine.begin() as conn:
                     await conn.execute(text("SELECT 1"))
 
@@ -0,0 +1,222 @@
+#jobs.py
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from config.settings import settings
+from shared.database import BackgroundSessionLocal
+from src.repositories.job import JobRepository
+
+logger = logging.getLogger(__name__)
+
+
+class JobContext:
+    """What a job handler gets: its parameters, a session factory on the
+    background connection budget, and a way to report progress."""
+
+    def __init__(self, job_id: uuid.UUID, params: dict, session_factory: async_sessionmaker,
+                 repository: JobRepository, pk_id: int):
+        self.job_id = job_id
+        self.params = params
+        self.session_factory = session_factory
+        self._repository = repository
+        self._pk_id = pk_id
+
+    async def report(self, progress: float, message: Optional[str] = None) -> None:
+        await self._repository.update(
+            self._pk_id,
+            progress=max(0.0, min(progress, 1.0)),
+            message=message
+        )
+
+
+JobHandler = Callable[[JobContext], Awaitable[Optional[dict]]]
+
+
+class JobRunner:
+    """Bounded asyncio worker pool for jobs persisted in the job table.
+
+    Every process polls the table for claimable jobs: pending ones, and running
+    ones whose owner has stopped sending heartbeats (it crashed or was stopped).
+    A job is only run after it has been claimed atomically, so with several
+    workers or pods each attempt runs exactly once, up to JOB_MAX_ATTEMPTS tries.
+    """
+
+    def __init__(
+        self,
+        handlers: Dict[str, JobHandler],
+        session_factory: async_sessionmaker = BackgroundSessionLocal,
+        workers: int = 2,
+        queue_size: int = 100,
+        max_attempts: int = 3,
+        poll_interval: float = 5.0,
+        heartbeat_interval: float = 10.0,
+        stale_after: float = 60.0,
+        owner: Optional[str] = None
+    ):
+        self.handlers = handlers
+        self.session_factory = session_factory
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.stale_after = stale_after
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._queued: set[uuid.UUID] = set()
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def is_full(self) -> bool:
+        return self._queue.full()
+
+    async def start(self) -> None:
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._poll()))
+
+    async def stop(self) -> None:
+        # Interrupted jobs stay "running" until their heartbeat goes stale, then
+        # any runner picks them up again.
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit(self, job_id: uuid.UUID) -> bool:
+        if job_id in self._queued:
+            return True
+        try:
+            self._queue.put_nowait(job_id)
+        except asyncio.QueueFull:
+            return False
+        self._queued.add(job_id)
+        return True
+
+    async def enqueue_claimable(self) -> int:
+        free = self._queue.maxsize - self._queue.qsize()
+        if free <= 0:
+            return 0
+
+        async with self.session_factory() as session:
+            job_ids = await JobRepository(session).get_claimable(self._stale_before(), free + len(self._queued))
+
+        submitted = 0
+        for job_id in job_ids:
+            if job_id in self._queued:
+                continue
+            if not self.submit(job_id):
+                break
+            submitted += 1
+        return submitted
+
+    async def _poll(self) -> None:
+        while True:
+            try:
+                submitted = await self.enqueue_claimable()
+                if submitted:
+                    logger.info(f"Queued {submitted} claimable job(s)")
+            except Exception:
+                logger.exception("Polling for claimable jobs failed")
+            await asyncio.sleep(self.poll_interval)
+
+    async def _work(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self.run_job(job_id)
+            except Exception:
+                logger.exception(f"Job {job_id} crashed the worker")
+            finally:
+                self._queued.discard(job_id)
+                self._queue.task_done()
+
+    def _stale_before(self) -> datetime:
+        return datetime.now(timezone.utc) - timedelta(seconds=self.stale_after)
+
+    async def _heartbeat(self, pk_id: int) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                async with self.session_factory() as session:
+                    if not await JobRepository(session).heartbeat(pk_id, self.owner):
+                        logger.warning(f"Job {pk_id} was taken over by another runner")
+                        return
+            except Exception:
+                logger.exception(f"Heartbeat for job {pk_id} failed")
+
+    async def run_job(self, job_id: uuid.UUID) -> None:
+        async with self.session_factory() as session:
+            repository = JobRepository(session)
+            job = await repository.claim(job_id, self.owner, self._stale_before())
+            if job is None:
+                # Finished, unknown, or already claimed by a live runner.
+                return
+
+            pk_id = job.pk_id
+            if job.attempts > self.max_attempts:
+                await repository.finish(
+                    pk_id,
+                    self.owner,
+                    status="failed",
+                    error=f"Gave up after {job.attempts - 1} interrupted attempts",
+                    finished_at=datetime.now(timezone.utc)
+                )
+                return
+
+            handler = self.handlers.get(job.job_type)
+            if handler is None:
+                await repository.finish(
+                    pk_id,
+                    self.owner,
+                    status="failed",
+                    error=f"Unknown job type '{job.job_type}'",
+                    finished_at=datetime.now(timezone.utc)
+                )
+                return
+
+            params = dict(job.params or {})
+            context = JobContext(job_id, params, self.session_factory, repository, pk_id)
+            heartbeat = asyncio.create_task(self._heartbeat(pk_id))
+            try:
+                result = await handler(context)
+            except Exception as exc:
+                logger.exception(f"Job {job_id} failed")
+                await session.rollback()
+                await repository.finish(
+                    pk_id,
+                    self.owner,
+                    status="failed",
+                    error=str(exc) or type(exc).__name__,
+                    finished_at=datetime.now(timezone.utc)
+                )
+                return
+            finally:
+                heartbeat.cancel()
+                await asyncio.gather(heartbeat, return_exceptions=True)
+
+            await repository.finish(
+                pk_id,
+                self.owner,
+                status="succeeded",
+                progress=1.0,
+                result=result,
+                finished_at=datetime.now(timezone.utc)
+            )
+
+
+def build_job_runner(handlers: Dict[str, JobHandler]) -> JobRunner:
+    return JobRunner(
+        handlers,
+        workers=settings.JOB_WORKERS,
+        queue_size=settings.JOB_QUEUE_SIZE,
+        max_attempts=settings.JOB_MAX_ATTEMPTS,
+        poll_interval=settings.JOB_POLL_INTERVAL_SECONDS,
+        heartbeat_interval=settings.JOB_HEARTBEAT_SECONDS,
+        stale_after=settings.JOB_STALE_AFTER_SECONDS
+    )
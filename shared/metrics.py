@@ -0,0 +1,29 @@
+#metrics.py
+from collections import defaultdict
+from typing import Callable, Dict
+
+
+class Metrics:
+    """Process-local counters and gauges, exposed as JSON on GET /metrics."""
+
+    def __init__(self):
+        self._counters: Dict[str, float] = defaultdict(float)
+        self._gauges: Dict[str, Callable[[], float]] = {}
+
+    def increment(self, name: str, value: float = 1) -> None:
+        self._counters[name] += value
+
+    def counter(self, name: str) -> float:
+        return self._counters.get(name, 0)
+
+    def register_gauge(self, name: str, read: Callable[[], float]) -> None:
+        self._gauges[name] = read
+
+    def snapshot(self) -> dict:
+        snapshot = dict(self._counters)
+        for name, read in self._gauges.items():
+            snapshot[name] = read()
+        return dict(sorted(snapshot.items()))
+
+
+metrics = Metrics()
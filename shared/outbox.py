@@ -0,0 +1,228 @@
+#outbox.py
+import asyncio
+import json
+import logging
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Sequence
+
+import aio_pika
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from config.settings import settings
+from shared.database import BackgroundSessionLocal
+from src.repositories.outbox import OutboxRepository
+
+logger = logging.getLogger(__name__)
+
+
+class EventBroker(ABC):
+    async def connect(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    @abstractmethod
+    async def publish(self, routing_key: str, body: bytes, message_id: str, headers: dict) -> None:
+        """Publish one message, returning only once the broker has confirmed it."""
+
+
+class AioPikaBroker(EventBroker):
+    def __init__(self, url: str, exchange_name: str):
+        self.url = url
+        self.exchange_name = exchange_name
+        self._connection = None
+        self._exchange = None
+
+    async def connect(self) -> None:
+        self._connection = await aio_pika.connect_robust(self.url)
+        channel = await self._connection.channel(publisher_confirms=True)
+        self._exchange = await channel.declare_exchange(
+            self.exchange_name, aio_pika.ExchangeType.TOPIC, durable=True
+        )
+
+    async def close(self) -> None:
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
+
+    async def publish(self, routing_key: str, body: bytes, message_id: str, headers: dict) -> None:
+        # With publisher confirms enabled this waits for the broker ack and
+        # raises on a nack, so a returned call means the event is durable.
+        await self._exchange.publish(
+            aio_pika.Message(
+                body=body,
+                message_id=message_id,
+                headers=headers,
+                content_type="application/json",
+                delivery_mode=aio_pika.DeliveryMode.PERSISTENT
+            ),
+            routing_key=routing_key,
+            mandatory=False
+        )
+
+
+class InMemoryBroker(EventBroker):
+    """Broker stand-in for tests: records messages and can be told to fail."""
+
+    def __init__(self):
+        self.messages: List[dict] = []
+        self.fail_routing_keys: set[str] = set()
+
+    async def publish(self, routing_key: str, body: bytes, message_id: str, headers: dict) -> None:
+        if routing_key in self.fail_routing_keys:
+            raise ConnectionError(f"publish to {routing_key} was not confirmed")
+        self.messages.append({
+            "routing_key": routing_key,
+            "body": json.loads(body),
+            "message_id": message_id,
+            "headers": headers,
+        })
+
+
+class OutboxPublisher:
+    """Drains the outbox table to the broker in batches.
+
+    Events of one aggregate are published strictly in insertion order: once one
+    fails, the rest of that aggregate waits for its retry. Different aggregates
+    are published concurrently. It runs on the background connection budget:
+    its session is held across broker confirms, which request admission
+    control does not account for.
+
+    Every ``purge_interval`` seconds it also deletes events published more
+    than ``retention`` seconds ago, so the table (and the change feed's
+    read-back of it) stays bounded.
+    """
+
+    def __init__(
+        self,
+        broker: EventBroker,
+        session_factory: async_sessionmaker = BackgroundSessionLocal,
+        batch_size: int = 100,
+        poll_interval: float = 1.0,
+        max_backoff: float = 300.0,
+        retention: float = 24 * 3600.0,
+        purge_interval: float = 300.0,
+        purge_batch_size: int = 5000
+    ):
+        self.broker = broker
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_backoff = max_backoff
+        self.retention = retention
+        self.purge_interval = purge_interval
+        self.purge_batch_size = purge_batch_size
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        await self.broker.connect()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.broker.close()
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        next_purge = loop.time()
+        while True:
+            try:
+                published = await self.run_once()
+            except Exception:
+                logger.exception("Outbox publisher iteration failed")
+                published = 0
+            if loop.time() >= next_purge:
+                next_purge = loop.time() + self.purge_interval
+                try:
+                    await self.purge()
+                except Exception:
+                    logger.exception("Outbox purge failed")
+            # A full batch means there is probably more waiting.
+            if published < self.batch_size:
+                await asyncio.sleep(self.poll_interval)
+
+    async def run_once(self) -> int:
+        async with self.session_factory() as session:
+            repository = OutboxRepository(session)
+            if not await repository.acquire_publisher_lock():
+                return 0
+
+            events = await repository.get_pending(self.batch_size)
+            published, failures = await self.publish_batch(events)
+
+            await repository.mark_published(published)
+            for event, error in failures:
+                attempts = event.attempts + 1
+                await repository.mark_failed(event.pk_id, attempts, error, self.backoff(attempts))
+            await session.commit()
+
+        if failures:
+            logger.warning(f"Outbox: {len(failures)} event(s) failed to publish and will be retried")
+        return len(published)
+
+    async def purge(self) -> int:
+        """Delete events published over ``retention`` seconds ago, a batch per transaction."""
+        published_before = datetime.now(timezone.utc) - timedelta(seconds=self.retention)
+        purged = 0
+        while True:
+            async with self.session_factory() as session:
+                repository = OutboxRepository(session)
+                if not await repository.acquire_publisher_lock():
+                    return purged
+                deleted = await repository.purge_published(published_before, self.purge_batch_size)
+                await session.commit()
+            purged += deleted
+            if deleted < self.purge_batch_size:
+                return purged
+
+    def backoff(self, attempts: int) -> float:
+        return min(2 ** attempts, self.max_backoff)
+
+    async def publish_batch(self, events: Sequence) -> tuple[List[int], List[tuple]]:
+        now = datetime.now(timezone.utc)
+        streams: OrderedDict[tuple, list] = OrderedDict()
+        for event in events:
+            streams.setdefault((event.aggregate_type, event.aggregate_id), []).append(event)
+
+        published: List[int] = []
+        failures: List[tuple] = []
+
+        async def publish_stream(stream: list) -> None:
+            head = stream[0]
+            if head.next_attempt_at is not None and head.next_attempt_at > now:
+                return
+            for event in stream:
+                try:
+                    await self.broker.publish(
+                        f"{event.aggregate_type}.{event.event_type}",
+                        json.dumps(event.payload).encode(),
+                        str(event.id),
+                        {"aggregate_id": event.aggregate_id, "sequence": event.pk_id}
+                    )
+                except Exception as exc:
+                    failures.append((event, str(exc) or type(exc).__name__))
+                    return
+                published.append(event.pk_id)
+
+        await asyncio.gather(*(publish_stream(stream) for stream in streams.values()))
+        return published, failures
+
+
+def build_outbox_publisher() -> OutboxPublisher:
+    return OutboxPublisher(
+        AioPikaBroker(settings.RABBITMQ_URL, settings.OUTBOX_EXCHANGE),
+        batch_size=settings.OUTBOX_BATCH_SIZE,
+        poll_interval=settings.OUTBOX_POLL_INTERVAL_SECONDS,
+        retention=settings.OUTBOX_RETENTION_HOURS * 3600,
+        purge_interval=settings.OUTBOX_PURGE_INTERVAL_SECONDS,
+        purge_batch_size=settings.OUTBOX_PURGE_BATCH_SIZE
+    )
@@ -0,0 +1,204 @@
+#profiling.py
+import asyncio
+import random
+import secrets
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config.settings import settings
+from shared.identifiers import uuid7
+
+PROFILE_HEADER = "x-profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+REQUEST_ID_HEADER = "x-request-id"
+PROFILES_PATH = "/debug/profiles"
+MAX_STACK_DEPTH = 128
+
+
+@dataclass
+class Profile:
+    id: str
+    method: str
+    path: str
+    trigger: str
+    started_at: datetime
+    interval_ms: float
+    # The client's X-Request-ID, for finding a profile; never its key.
+    request_id: Optional[str] = None
+    duration_ms: float = 0.0
+    status_code: Optional[int] = None
+    stacks: Counter = field(default_factory=Counter)
+
+    @property
+    def samples(self) -> int:
+        return sum(self.stacks.values())
+
+    def collapsed(self) -> str:
+        """Brendan Gregg's collapsed stack format, ready for flamegraph.pl or speedscope."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "trigger": self.trigger,
+            "request_id": self.request_id,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": round(self.duration_ms, 3),
+            "status_code": self.status_code,
+            "interval_ms": self.interval_ms,
+            "samples": self.samples,
+        }
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{code.co_name}:{frame.f_lineno}"
+
+
+class SamplingProfiler:
+    """Samples the event loop thread's stack while a profiled request's task runs.
+
+    One daemon thread wakes every ``interval`` seconds, and only while at least
+    one request is being profiled. A sample counts for a request only when its
+    task is the one currently executing on the loop, so concurrent requests do
+    not show up in each other's profiles. Unprofiled requests pay nothing.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self._active: Dict[asyncio.Task, Profile] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+
+    def start(self, profile: Profile) -> None:
+        task = asyncio.current_task()
+        with self._lock:
+            self._loop = asyncio.get_running_loop()
+            self._loop_thread_id = threading.get_ident()
+            self._active[task] = profile
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+                self._thread.start()
+
+    def stop(self) -> None:
+        with self._lock:
+            self._active.pop(asyncio.current_task(), None)
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._active:
+                    self._thread = None
+                    return
+                running = asyncio.tasks._current_tasks.get(self._loop)
+                profile = self._active.get(running)
+                frame = sys._current_frames().get(self._loop_thread_id) if profile is not None else None
+            if frame is not None:
+                profile.stacks[self._collapse(frame)] += 1
+
+    @staticmethod
+    def _collapse(frame) -> str:
+        labels: List[str] = []
+        while frame is not None and len(labels) < MAX_STACK_DEPTH:
+            labels.append(_frame_label(frame))
+            frame = frame.f_back
+        return ";".join(reversed(labels))
+
+
+class ProfileStore:
+    """The most recent profiles, oldest evicted first."""
+
+    def __init__(self, max_profiles: int = 50):
+        self.max_profiles = max_profiles
+        self._profiles: OrderedDict[str, Profile] = OrderedDict()
+
+    def add(self, profile: Profile) -> None:
+        self._profiles[profile.id] = profile
+        while len(self._profiles) > self.max_profiles:
+            self._profiles.popitem(last=False)
+
+    def get(self, id: str) -> Optional[Profile]:
+        return self._profiles.get(id)
+
+    def list(self) -> List[Profile]:
+        return list(reversed(self._profiles.values()))
+
+
+profile_store = ProfileStore(settings.PROFILING_MAX_STORED)
+
+
+def is_authorised(token: Optional[str]) -> bool:
+    expected = settings.PROFILING_TOKEN
+    return bool(expected and token) and secrets.compare_digest(token, expected)
+
+
+class ProfilingMiddleware:
+    """Profiles a request when it carries an authorised X-Profile header, or at
+    PROFILING_SAMPLE_RATE. The profile is stored under a fresh id, echoed back
+    in X-Profile-Id; the client-chosen request id is only recorded alongside,
+    so no request can overwrite another's profile by reusing it."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        profiler: Optional[SamplingProfiler] = None,
+        store: ProfileStore = profile_store,
+        sample_rate: float = settings.PROFILING_SAMPLE_RATE
+    ):
+        self.app = app
+        self.profiler = profiler or SamplingProfiler(settings.PROFILING_INTERVAL_MS / 1000)
+        self.store = store
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(PROFILES_PATH):
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        if is_authorised(headers.get(PROFILE_HEADER)):
+            trigger = "header"
+        elif self.sample_rate > 0 and random.random() < self.sample_rate:
+            trigger = "sampled"
+        else:
+            await self.app(scope, receive, send)
+            return
+
+        profile = Profile(
+            id=uuid7().hex,
+            method=scope["method"],
+            path=scope["path"],
+            trigger=trigger,
+            started_at=datetime.now(timezone.utc),
+            interval_ms=self.profiler.interval * 1000,
+            request_id=headers.get(REQUEST_ID_HEADER, "")[:64] or None
+        )
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                profile.status_code = message["status"]
+                MutableHeaders(scope=message)[PROFILE_ID_HEADER] = profile.id
+            await send(message)
+
+        started = time.perf_counter()
+        self.profiler.start(profile)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.profiler.stop()
+            profile.duration_ms = (time.perf_counter() - started) * 1000
+            self.store.add(profile)
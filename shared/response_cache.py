@@ -0,0 +1,209 @@
+#response_cache.py
+import functools
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+
+from config.settings import settings
+from shared.metrics import metrics
+from shared.deadlines import DeadlineRoute
+
+CACHE_STATUS_HEADER = "X-Cache"
+# Recomputed for every response built from the cache.
+SKIPPED_HEADERS = frozenset({b"content-length"})
+
+
+class TableVersions:
+    """Per-table counters that only go up; any write to a table bumps it."""
+
+    def __init__(self):
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def bump(self, *tables: str) -> None:
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+
+    def get(self, tables: Iterable[str]) -> Tuple[int, ...]:
+        return tuple(self._versions.get(table, 0) for table in tables)
+
+
+table_versions = TableVersions()
+
+
+@dataclass
+class CachedResponse:
+    versions: Tuple[int, ...]
+    body: bytes
+    headers: List[Tuple[bytes, bytes]]
+    stored_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(key) + len(value) for key, value in self.headers)
+
+
+class ResponseCache:
+    """Serialised 200 responses, LRU-evicted once they exceed ``max_bytes``.
+
+    An entry is only served while the versions of the tables it was built
+    from are unchanged, so a write invalidates every page of its table at once.
+    Writes made by other workers arrive through the change feed; ``ttl`` bounds
+    staleness when that feed is disabled or behind.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, max_entry_bytes: int = 1024 * 1024, ttl: float = 60.0):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.ttl = ttl
+        self.size = 0
+        self._entries: OrderedDict[Hashable, CachedResponse] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_ratio(self) -> float:
+        hits = metrics.counter("response_cache_hit")
+        lookups = hits + metrics.counter("response_cache_miss")
+        return hits / lookups if lookups else 0.0
+
+    def get(self, key: Hashable, versions: Tuple[int, ...]) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is not None and (
+            entry.versions != versions or time.monotonic() - entry.stored_at > self.ttl
+        ):
+            self._remove(key)
+            entry = None
+        if entry is None:
+            metrics.increment("response_cache_miss")
+            return None
+        self._entries.move_to_end(key)
+        metrics.increment("response_cache_hit")
+        return entry
+
+    def set(self, key: Hashable, entry: CachedResponse) -> None:
+        if entry.size > self.max_entry_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = entry
+        self.size += entry.size
+        while self.size > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            metrics.increment("response_cache_evicted")
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.size = 0
+
+    def _remove(self, key: Hashable) -> None:
+        self.size -= self._entries.pop(key).size
+
+
+response_cache = ResponseCache(
+    settings.RESPONSE_CACHE_MAX_BYTES,
+    settings.RESPONSE_CACHE_MAX_ENTRY_BYTES,
+    settings.RESPONSE_CACHE_TTL_SECONDS
+)
+metrics.register_gauge("response_cache_bytes", lambda: response_cache.size)
+metrics.register_gauge("response_cache_entries", lambda: len(response_cache))
+metrics.register_gauge("response_cache_hit_ratio", lambda: response_cache.hit_ratio)
+
+
+def cache_response(*tables: str):
+    """Mark a GET endpoint as cacheable until one of ``tables`` is written to.
+
+    Only takes effect on routers using CachedRoute.
+    """
+
+    def decorator(endpoint):
+        endpoint.__cache_tables__ = tables
+        return endpoint
+
+    return decorator
+
+
+class CachedRoute(DeadlineRoute):
+    """DeadlineRoute that answers GET requests for @cache_response endpoints from
+    the response cache, before any dependency (or database session) runs."""
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        tables = getattr(self.endpoint, "__cache_tables__", None)
+        if not tables:
+            return handler
+
+        query_params = _query_params(self.dependant)
+
+        @functools.wraps(handler)
+        async def cached_handler(request: Request) -> Response:
+            if request.method != "GET" or not settings.RESPONSE_CACHE_ENABLED:
+                return await handler(request)
+
+            # Missing parameters take their defaults and unknown ones are
+            # dropped, so equivalent URLs share one entry.
+            key = (request.url.path, tuple(
+                (alias, tuple(request.query_params.getlist(alias)) or default)
+                for alias, default in query_params
+            ))
+            versions = table_versions.get(tables)
+            entry = response_cache.get(key, versions)
+            if entry is not None:
+                response = Response(entry.body)
+                response.raw_headers = [*entry.headers, (b"content-length", str(len(entry.body)).encode())]
+                response.headers[CACHE_STATUS_HEADER] = "HIT"
+                return response
+
+            response = await handler(request)
+            if response.status_code != 200:
+                return response
+            headers = [(name, value) for name, value in response.raw_headers if name not in SKIPPED_HEADERS]
+            response.headers[CACHE_STATUS_HEADER] = "MISS"
+            if isinstance(response, StreamingResponse):
+                response.body_iterator = _store_when_complete(response.body_iterator, key, versions, headers)
+            else:
+                response_cache.set(key, CachedResponse(versions, response.body, headers))
+            return response
+
+        return cached_handler
+
+
+def _query_params(dependant) -> List[Tuple[str, Tuple[str, ...]]]:
+    """(name, default as query string values) of every query parameter the
+    route or its dependencies read."""
+    params: List[Tuple[str, Tuple[str, ...]]] = []
+    pending = [dependant]
+    while pending:
+        current = pending.pop()
+        params.extend(
+            (param.alias, () if param.field_info.default is None else (str(param.field_info.default),))
+            for param in current.query_params
+        )
+        pending.extend(current.dependencies)
+    return sorted(params, key=lambda param: param[0])
+
+
+async def _store_when_complete(
+    chunks: AsyncIterator[bytes],
+    key: Hashable,
+    versions: Tuple[int, ...],
+    headers: List[Tuple[bytes, bytes]]
+) -> AsyncIterator[bytes]:
+    body = bytearray()
+    cacheable = True
+    async for chunk in chunks:
+        if cacheable:
+            body += chunk
+            if len(body) > response_cache.max_entry_bytes:
+                cacheable = False
+                body = bytearray()
+        yield chunk
+    if cacheable:
+        response_cache.set(key, CachedResponse(versions, bytes(body), headers))
@@ -0,0 +1,84 @@
+#singleflight.py
+import asyncio
+import functools
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from config.settings import settings
+from shared.metrics import metrics
+
+
+class SingleFlight:
+    """Collapses concurrent calls with the same key into one execution.
+
+    The first caller runs the call; everyone arriving while it is in flight
+    awaits the same result (or exception). Nothing is cached afterwards.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]], name: str = "default") -> Any:
+        while True:
+            future = self._calls.get(key)
+            if future is None:
+                break
+
+            metrics.increment(f"singleflight_{name}_coalesced")
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # The leader was cancelled (e.g. its client went away); only
+                # give up if we were cancelled ourselves, otherwise take over.
+                if not future.cancelled() or asyncio.current_task().cancelling():
+                    raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        metrics.increment(f"singleflight_{name}_executed")
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Followers re-raise it; nobody else needs to retrieve it.
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._calls.pop(key, None)
+
+
+singleflight = SingleFlight()
+metrics.register_gauge("singleflight_in_flight", lambda: singleflight.in_flight)
+
+
+def coalesce(name: str, key: Optional[Callable[..., Hashable]] = None):
+    """Share one in-flight execution of a read-only async service method.
+
+    By default calls are keyed by ``name`` and the call arguments; pass ``key``
+    (called with the same arguments as the method) to widen or narrow the scope.
+    """
+
+    def decorator(method):
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            if not settings.SINGLEFLIGHT_ENABLED:
+                return await method(self, *args, **kwargs)
+
+            if key is not None:
+                call_key = (name, key(self, *args, **kwargs))
+            else:
+                call_key = (name, args, tuple(sorted(kwargs.items())))
+            return await singleflight.do(call_key, lambda: method(self, *args, **kwargs), name)
+
+        return wrapper
+
+    return decorator
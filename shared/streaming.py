@@ -0,0 +1,35 @@
+#streaming.py
+from typing import AsyncIterator, Dict, Optional, Type
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+async def stream_json_array(
+    rows: AsyncIterator,
+    schema: Type[BaseModel],
+    chunk_size: int = STREAM_CHUNK_SIZE
+) -> AsyncIterator[bytes]:
+    """Encode rows as a JSON array, yielding roughly ``chunk_size`` bytes at a time."""
+    buffer = bytearray(b"[")
+    first = True
+    async for row in rows:
+        if not first:
+            buffer += b","
+        buffer += schema.model_validate(row).model_dump_json().encode()
+        first = False
+        if len(buffer) >= chunk_size:
+            yield bytes(buffer)
+            buffer.clear()
+    buffer += b"]"
+    yield bytes(buffer)
+
+
+def json_array_response(
+    rows: AsyncIterator,
+    schema: Type[BaseModel],
+    headers: Optional[Dict[str, str]] = None
+) -> StreamingResponse:
+    return StreamingResponse(stream_json_array(rows, schema), media_type="application/json", headers=headers)
@@ -0,0 +1,375 @@
+#tracing.py
+import functools
+import inspect
+import json
+import random
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config.settings import settings
+
+TRACEPARENT_RE = re.compile(r"^([0-9a-f]{2})-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+INVALID_TRACE_ID = "0" * 32
+INVALID_SPAN_ID = "0" * 16
+MAX_STATEMENT_LENGTH = 2000
+
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+
+
+def _new_trace_id() -> str:
+    return f"{random.getrandbits(128):032x}"
+
+
+def _new_span_id() -> str:
+    return f"{random.getrandbits(64):016x}"
+
+
+@dataclass
+class Span:
+    trace_id: str
+    span_id: str
+    parent_span_id: Optional[str]
+    name: str
+    kind: int = SPAN_KIND_INTERNAL
+    start_ns: int = 0
+    end_ns: int = 0
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+    # Spans finished so far in this process for the same trace; shared by all
+    # of them and exported when the local root ends.
+    finished: List["Span"] = field(default_factory=list, repr=False)
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def current_traceparent() -> Optional[str]:
+    """Header value to propagate the active trace to an outgoing call."""
+    span = _current_span.get()
+    return span.traceparent if span is not None else None
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[tuple[str, str, bool]]:
+    """(trace_id, parent_span_id, sampled) from a W3C traceparent header."""
+    if not value:
+        return None
+    match = TRACEPARENT_RE.match(value.strip().lower())
+    if match is None:
+        return None
+    version, trace_id, span_id, flags = match.groups()
+    if version == "ff" or trace_id == INVALID_TRACE_ID or span_id == INVALID_SPAN_ID:
+        return None
+    return trace_id, span_id, bool(int(flags, 16) & 0x01)
+
+
+class SpanExporter(ABC):
+    @abstractmethod
+    def export(self, spans: Sequence[Span]) -> None:
+        """Ship the finished spans of one trace."""
+
+    def shutdown(self) -> None:
+        pass
+
+
+class InMemorySpanExporter(SpanExporter):
+    def __init__(self):
+        self.spans: List[Span] = []
+
+    def export(self, spans: Sequence[Span]) -> None:
+        self.spans.extend(spans)
+
+
+def otlp_json(spans: Sequence[Span], service_name: str) -> dict:
+    """Spans as an OTLP/JSON ExportTraceServiceRequest."""
+
+    def attribute(key, value):
+        if isinstance(value, bool):
+            typed = {"boolValue": value}
+        elif isinstance(value, int):
+            typed = {"intValue": str(value)}
+        elif isinstance(value, float):
+            typed = {"doubleValue": value}
+        else:
+            typed = {"stringValue": str(value)}
+        return {"key": key, "value": typed}
+
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [attribute("service.name", service_name)]},
+            "scopeSpans": [{
+                "scope": {"name": "workout-api"},
+                "spans": [
+                    {
+                        "traceId": span.trace_id,
+                        "spanId": span.span_id,
+                        **({"parentSpanId": span.parent_span_id} if span.parent_span_id else {}),
+                        "name": span.name,
+                        "kind": span.kind,
+                        "startTimeUnixNano": str(span.start_ns),
+                        "endTimeUnixNano": str(span.end_ns),
+                        "attributes": [attribute(key, value) for key, value in span.attributes.items()],
+                        "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+                    }
+                    for span in spans
+                ],
+            }],
+        }]
+    }
+
+
+class FileSpanExporter(SpanExporter):
+    """Appends one OTLP/JSON request per trace to a local file.
+
+    The lines can be replayed to any OTLP/HTTP collector, so traces are kept
+    without needing a network path to one.
+    """
+
+    def __init__(self, path: str, service_name: str = "workout-api"):
+        self.path = path
+        self.service_name = service_name
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[Span]) -> None:
+        line = json.dumps(otlp_json(spans, self.service_name), separators=(",", ":"))
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as file:
+                file.write(line + "\n")
+
+
+class Tracer:
+    """Creates spans under the active one and hands finished traces to the exporter.
+
+    A trace is only recorded when its root was sampled; everywhere else a span
+    call is a context variable lookup that finds nothing and returns.
+    """
+
+    def __init__(self, exporter: Optional[SpanExporter] = None, sample_rate: float = 0.0):
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    def should_sample(self, parent: Optional[tuple[str, str, bool]]) -> bool:
+        if not self.enabled:
+            return False
+        if parent is not None:
+            # Parent-based: follow the caller's decision.
+            return parent[2]
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    @contextmanager
+    def start_root_span(
+        self,
+        name: str,
+        traceparent: Optional[str] = None,
+        kind: int = SPAN_KIND_SERVER,
+        attributes: Optional[dict] = None
+    ) -> Iterator[Optional[Span]]:
+        parent = parse_traceparent(traceparent)
+        if not self.should_sample(parent):
+            token = _current_span.set(None)
+            try:
+                yield None
+            finally:
+                _current_span.reset(token)
+            return
+
+        trace_id, parent_span_id = (parent[0], parent[1]) if parent else (_new_trace_id(), None)
+        span = Span(trace_id, _new_span_id(), parent_span_id, name, kind, attributes=dict(attributes or {}))
+        try:
+            with self._activate(span):
+                yield span
+        finally:
+            self._export(span.finished)
+
+    @contextmanager
+    def start_span(self, name: str, kind: int = SPAN_KIND_INTERNAL, attributes: Optional[dict] = None) -> Iterator[Optional[Span]]:
+        parent = _current_span.get()
+        if parent is None:
+            yield None
+            return
+
+        span = Span(
+            parent.trace_id, _new_span_id(), parent.span_id, name, kind,
+            attributes=dict(attributes or {}), finished=parent.finished
+        )
+        with self._activate(span):
+            yield span
+
+    def begin(self, name: str, kind: int = SPAN_KIND_INTERNAL, attributes: Optional[dict] = None) -> Optional[Span]:
+        """Start a child span without activating it (for callback-style hooks)."""
+        parent = _current_span.get()
+        if parent is None:
+            return None
+        return Span(
+            parent.trace_id, _new_span_id(), parent.span_id, name, kind,
+            start_ns=time.time_ns(), attributes=dict(attributes or {}), finished=parent.finished
+        )
+
+    @staticmethod
+    def end(span: Span, error: Optional[BaseException] = None) -> None:
+        span.end_ns = time.time_ns()
+        if error is not None:
+            span.error = f"{type(error).__name__}: {error}"
+        span.finished.append(span)
+
+    @contextmanager
+    def _activate(self, span: Span) -> Iterator[None]:
+        span.start_ns = time.time_ns()
+        token = _current_span.set(span)
+        try:
+            yield
+        except BaseException as exc:
+            self.end(span, exc)
+            raise
+        else:
+            self.end(span)
+        finally:
+            _current_span.reset(token)
+
+    def _export(self, spans: List[Span]) -> None:
+        try:
+            self.exporter.export(list(spans))
+        except Exception:
+            # Tracing must never fail a request.
+            pass
+
+
+def build_tracer() -> Tracer:
+    exporter = None
+    if settings.TRACING_EXPORTER == "file":
+        exporter = FileSpanExporter(settings.TRACING_FILE, settings.TRACING_SERVICE_NAME)
+    return Tracer(exporter, settings.TRACING_SAMPLE_RATE)
+
+
+tracer = build_tracer()
+
+
+class TracingMiddleware:
+    """Opens the server span for each HTTP request from its traceparent header."""
+
+    def __init__(self, app: ASGIApp, tracer: Tracer = tracer):
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        traceparent = Headers(scope=scope).get("traceparent")
+        name = f"{scope['method']} {scope['path']}"
+        with self.tracer.start_root_span(name, traceparent, attributes={
+            "http.request.method": scope["method"],
+            "url.path": scope["path"],
+        }) as span:
+            if span is None:
+                await self.app(scope, receive, send)
+                return
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.response.status_code", message["status"])
+                    route = scope.get("route")
+                    if route is not None and getattr(route, "path", None):
+                        span.name = f"{scope['method']} {route.path}"
+                        span.set_attribute("http.route", route.path)
+                    headers = MutableHeaders(scope=message)
+                    headers["traceresponse"] = span.traceparent
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
+
+
+class TracedRoute(APIRoute):
+    """APIRoute that wraps the endpoint (and its dependencies) in a controller span."""
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        name = f"controller {self.endpoint.__module__.rsplit('.', 1)[-1]}.{self.endpoint.__name__}"
+
+        @functools.wraps(handler)
+        async def traced_handler(request):
+            with tracer.start_span(name, attributes={"code.function": self.endpoint.__name__}):
+                return await handler(request)
+
+        return traced_handler
+
+
+def trace_service(cls):
+    """Class decorator: one span per call of every public coroutine method."""
+    prefix = getattr(cls, "__trace_name__", cls.__name__)
+    for attr, method in list(vars(cls).items()):
+        if attr.startswith("_") or not inspect.iscoroutinefunction(method):
+            continue
+        setattr(cls, attr, _traced_method(f"service {prefix}.{attr}", method))
+    return cls
+
+
+def _traced_method(name: str, method):
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        if _current_span.get() is None:
+            return await method(*args, **kwargs)
+        with tracer.start_span(name):
+            return await method(*args, **kwargs)
+
+    return wrapper
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Record a client span per executed statement on ``engine`` (a sync Engine)."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        span = tracer.begin("db.query", SPAN_KIND_CLIENT, {
+            "db.system": "postgresql",
+            "db.statement": statement[:MAX_STATEMENT_LENGTH],
+            "db.operation": statement.lstrip().split(" ", 1)[0].upper(),
+        })
+        if span is not None and context is not None:
+            context._trace_span = span
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        span = getattr(context, "_trace_span", None)
+        if span is not None:
+            if cursor is not None and cursor.rowcount is not None and cursor.rowcount >= 0:
+                span.set_attribute("db.rows_affected", cursor.rowcount)
+            tracer.end(span)
+            context._trace_span = None
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        context = exception_context.execution_context
+        span = getattr(context, "_trace_span", None)
+        if span is not None:
+            tracer.end(span, exception_context.original_exception)
+            context._trace_span = None
@@ -0,0 +1,88 @@
+#unit_of_work.py
+from contextvars import ContextVar
+from typing import Optional, Set
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shared.metrics import metrics
+from shared.response_cache import table_versions
+
+
+class UnitOfWork:
+    """Turns every repository write on ``session`` inside the block into one transaction.
+
+    Repositories flush instead of committing while a unit of work is open on
+    their session; the block commits once when it exits and rolls everything
+    back when it raises. A unit of work opened inside another one on the same
+    session is a SAVEPOINT, so a failed step can be caught without losing the
+    outer work. Outside any unit of work each repository write still commits
+    on its own.
+
+        async with UnitOfWork(db):
+            await categories.update(1, name="Senior")
+            await athletes.update_many(ids, category_id=1)
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        # Tables written to, bumped in the response cache only once committed.
+        self.tables: Set[str] = set()
+        self._outer: Optional["UnitOfWork"] = None
+        self._parent: Optional["UnitOfWork"] = None
+        self._savepoint = None
+        self._token = None
+
+    @property
+    def nested(self) -> bool:
+        return self._parent is not None
+
+    async def __aenter__(self) -> "UnitOfWork":
+        self._outer = _current_unit_of_work.get()
+        self._parent = current_unit_of_work(self.session)
+        if self._parent is not None:
+            self._savepoint = await self.session.begin_nested()
+        self._token = _current_unit_of_work.set(self)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        _current_unit_of_work.reset(self._token)
+        if self.nested:
+            await self._exit_savepoint(exc_type is None)
+        else:
+            await self._exit_transaction(exc_type is None)
+        return False
+
+    async def _exit_savepoint(self, success: bool) -> None:
+        if not self._savepoint.is_active:
+            # Someone rolled back the whole transaction inside the block.
+            return
+        if success:
+            await self._savepoint.commit()
+            self._parent.tables |= self.tables
+        else:
+            await self._savepoint.rollback()
+
+    async def _exit_transaction(self, success: bool) -> None:
+        if not success:
+            await self.session.rollback()
+            metrics.increment("unit_of_work_rolled_back")
+            return
+        try:
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            metrics.increment("unit_of_work_rolled_back")
+            raise
+        metrics.increment("unit_of_work_committed")
+        table_versions.bump(*self.tables)
+
+
+_current_unit_of_work: ContextVar[Optional[UnitOfWork]] = ContextVar("current_unit_of_work", default=None)
+
+
+def current_unit_of_work(session: AsyncSession) -> Optional[UnitOfWork]:
+    """The innermost unit of work open on ``session`` in this task, if any."""
+    unit_of_work = _current_unit_of_work.get()
+    while unit_of_work is not None and unit_of_work.session is not session:
+        unit_of_work = unit_of_work._outer
+    return unit_of_work
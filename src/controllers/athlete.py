@@ -1,46 +1,148 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import uuid
+import os
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import FileResponse
+from starlette.background import BackgroundTask
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Literal, Optional
 
 from shared.database import get_db
+from shared.response_cache import CachedRoute, cache_response
+from shared.idempotency import idempotency
+from shared.streaming import json_array_response
+from shared.counting import CountMode
+from shared.columnar import EXTENSIONS, MEDIA_TYPES, ColumnarFormat, available_formats, default_format
+from src.controllers.dependencies import batch_pk_ids, count_mode, total_count_headers
 from src.schemas.athlete import (
     AthleteCreate,
     AthleteUpdate,
-    AthleteResponse
+    AthleteResponse,
+    AthleteBatchResponse,
+    AthleteBulkUpdate,
+    AthleteBulkUpdateResponse,
+    AthleteLeaderboardEntry,
+    LeaderboardOrder,
+    LeaderboardPartition,
+    MAX_LEADERBOARD_SIZE
 )
+from src.schemas.base import UUIDBatchRequest
 from src.services.athlete import AthleteService
+from src.services.roster_export import export_roster_file
+from src.exceptions.custom_exceptions import ValidationException
 
-router = APIRouter(prefix="/athletes", tags=["athletes"])
+router = APIRouter(prefix="/athletes", tags=["athletes"], route_class=CachedRoute)
 
 @router.post("/", response_model=AthleteResponse, status_code=status.HTTP_201_CREATED)
 async def create_athlete(
     athlete: AthleteCreate,
-    db: AsyncSession = Depends(get_db)
+    idempotency_key: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     service = AthleteService(db)
-    return await service.create_athlete(athlete)
+    return await idempotency.run(
+        idempotency_key,
+        "POST /athletes/",
+        athlete,
+        AthleteResponse,
+        lambda: service.create_athlete(athlete),
+        status_code=status.HTTP_201_CREATED
+    )
 
+# Collection routes stream their rows, so their session must stay open until
+# the response has been sent (request scope, not function scope).
 @router.get("/", response_model=List[AthleteResponse])
+@cache_response("athlete")
 async def get_athletes(
     skip: int = 0,
     limit: int = 100,
+    bmi_min: Optional[float] = None,
+    bmi_max: Optional[float] = None,
+    count: CountMode = Depends(count_mode),
     db: AsyncSession = Depends(get_db)
+):
+    if bmi_min is not None and bmi_max is not None and bmi_min > bmi_max:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="bmi_min must be less than or equal to bmi_max"
+        )
+    service = AthleteService(db)
+    total = await service.count_athletes(count, bmi_min, bmi_max)
+    return json_array_response(
+        service.stream_all_athletes(skip, limit, bmi_min, bmi_max), AthleteResponse, total_count_headers(total)
+    )
+
+@router.get("/batch", response_model=AthleteBatchResponse)
+async def get_athletes_batch(
+    ids: List[int] = Depends(batch_pk_ids),
+    db: AsyncSession = Depends(get_db, scope="function")
+):
+    service = AthleteService(db)
+    return await service.get_athletes_by_ids(ids)
+
+@router.post("/batch/uuid", response_model=AthleteBatchResponse)
+async def get_athletes_batch_by_uuid(
+    batch: UUIDBatchRequest,
+    db: AsyncSession = Depends(get_db, scope="function")
+):
+    service = AthleteService(db)
+    return await service.get_athletes_by_uuids(batch.ids)
+
+@router.patch("/bulk", response_model=AthleteBulkUpdateResponse)
+async def bulk_update_athletes(
+    bulk: AthleteBulkUpdate,
+    db: AsyncSession = Depends(get_db, scope="function")
+):
+    service = AthleteService(db)
+    return await service.bulk_update_athletes(bulk)
+
+# Declared before /{pk_id}, which would otherwise reject "export" as an id.
+@router.get("/export", response_class=FileResponse)
+async def export_athletes(
+    format: Optional[ColumnarFormat] = None,
+    db: AsyncSession = Depends(get_db, scope="function")
+):
+    """The whole roster, with category and training center names, as one
+    Parquet, Arrow IPC or (without pyarrow) NumPy .npz file."""
+    format = format or default_format()
+    if format is None:
+        raise ValidationException("Roster export needs pyarrow or numpy installed")
+    if format not in available_formats():
+        raise ValidationException(
+            f"Export format '{format}' is not available; available: {', '.join(available_formats())}"
+        )
+    path = await export_roster_file(db, format)
+    return FileResponse(
+        path,
+        media_type=MEDIA_TYPES[format],
+        filename=f"roster{EXTENSIONS[format]}",
+        background=BackgroundTask(os.unlink, path)
+    )
+
+# Declared before /{pk_id}, which would otherwise reject "leaderboard" as an id.
+@router.get("/leaderboard", response_model=List[AthleteLeaderboardEntry])
+@cache_response("athlete")
+async def get_leaderboard(
+    partition_by: LeaderboardPartition,
+    order_by: LeaderboardOrder,
+    order: Literal["asc", "desc"] = "desc",
+    k: int = Query(10, ge=1, le=MAX_LEADERBOARD_SIZE),
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     service = AthleteService(db)
-    return await service.get_all_athletes(skip, limit)
+    return await service.get_leaderboard(partition_by, order_by, order == "desc", k)
 
 @router.get("/{pk_id}", response_model=AthleteResponse)
 async def get_athlete(
     pk_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     service = AthleteService(db)
     return await service.get_athlete(pk_id)
 
 @router.get("/uuid/{id}", response_model=AthleteResponse)
 async def get_athlete_by_uuid(
-    id: str,
-    db: AsyncSession = Depends(get_db)
+    id: uuid.UUID,
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     service = AthleteService(db)
     return await service.get_athlete_by_uuid(id)
@@ -49,7 +151,7 @@ async def get_athlete_by_uuid(
 async def update_athlete(
     pk_id: int,
     athlete: AthleteUpdate,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     service = AthleteService(db)
     return await service.update_athlete(pk_id, athlete)
@@ -57,33 +159,46 @@ async def update_athlete(
 @router.delete("/{pk_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_athlete(
     pk_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     service = AthleteService(db)
     await service.delete_athlete(pk_id)
     return None
 
 @router.get("/training-center/{training_center_id}", response_model=List[AthleteResponse])
+@cache_response("athlete")
 async def get_athletes_by_training_center(
     training_center_id: int,
+    count: CountMode = Depends(count_mode),
     db: AsyncSession = Depends(get_db)
 ):
     service = AthleteService(db)
-    return await service.get_athletes_by_training_center(training_center_id)
+    total = await service.count_athletes_by_training_center(training_center_id, count)
+    return json_array_response(
+        service.stream_athletes_by_training_center(training_center_id), AthleteResponse, total_count_headers(total)
+    )
 
 @router.get("/category/{category_id}", response_model=List[AthleteResponse])
+@cache_response("athlete")
 async def get_athletes_by_category(
     category_id: int,
+    count: CountMode = Depends(count_mode),
     db: AsyncSession = Depends(get_db)
 ):
     service = AthleteService(db)
-    return await service.get_athletes_by_category(category_id)
+    total = await service.count_athletes_by_category(category_id, count)
+    return json_array_response(
+        service.stream_athletes_by_category(category_id), AthleteResponse, total_count_headers(total)
+    )
 
 @router.get("/age-range/{min_age}/{max_age}", response_model=List[AthleteResponse])
+@cache_response("athlete")
 async def get_athletes_by_age_range(
     min_age: int,
     max_age: int,
-    db: AsyncSession = Depends(get_db)
+    response: Response,
+    count: CountMode = Depends(count_mode),
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     service = AthleteService(db)
     if min_age > max_age:
@@ -91,4 +206,5 @@ async def get_athletes_by_age_range(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="min_age must be less than or equal to max_age"
         )
+    response.headers.update(total_count_headers(await service.count_athletes_by_age_range(min_age, max_age, count)))
     return await service.get_athletes_by_age_range(min_age, max_age)
\ No newline at end of file
@@ -1,35 +1,69 @@
-from typing import List
-from fastapi import APIRouter, Depends, status, Query
+import uuid
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Header, Response, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from shared.database import get_db
+from shared.response_cache import CachedRoute, cache_response
+from shared.idempotency import idempotency
+from shared.counting import CountMode
+from src.controllers.dependencies import batch_pk_ids, count_mode, total_count_headers
 from src.services.category import CategoryService
-from src.schemas.category import CategoryCreate, CategoryUpdate, CategoryResponse
+from src.schemas.base import UUIDBatchRequest
+from src.schemas.category import CategoryCreate, CategoryUpdate, CategoryResponse, CategoryBatchResponse
 
-router = APIRouter(prefix="/categories", tags=["categories"])
+router = APIRouter(prefix="/categories", tags=["categories"], route_class=CachedRoute)
 
 
 @router.post("/", response_model=CategoryResponse, status_code=status.HTTP_201_CREATED)
 async def create_category(
     category: CategoryCreate,
-    db: AsyncSession = Depends(get_db)
+    idempotency_key: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
         service = CategoryService(db)
-        return await service.create_category(category)
+        return await idempotency.run(
+            idempotency_key,
+            "POST /categories/",
+            category,
+            CategoryResponse,
+            lambda: service.create_category(category),
+            status_code=status.HTTP_201_CREATED
+        )
 
 
 @router.get("/", response_model=List[CategoryResponse])
+@cache_response("category")
 async def get_all_categories(
+    response: Response,
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=100, description="Maximum number of records to return"),
-    db: AsyncSession = Depends(get_db)
+    count: CountMode = Depends(count_mode),
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
         service = CategoryService(db)
+        response.headers.update(total_count_headers(await service.count_categories(count)))
         return await service.get_all_categories(skip, limit)
 
+@router.get("/batch", response_model=CategoryBatchResponse)
+async def get_categories_batch(
+    ids: List[int] = Depends(batch_pk_ids),
+    db: AsyncSession = Depends(get_db, scope="function")
+):
+        service = CategoryService(db)
+        return await service.get_categories_by_ids(ids)
+
+@router.post("/batch/uuid", response_model=CategoryBatchResponse)
+async def get_categories_batch_by_uuid(
+    batch: UUIDBatchRequest,
+    db: AsyncSession = Depends(get_db, scope="function")
+):
+        service = CategoryService(db)
+        return await service.get_categories_by_uuids(batch.ids)
+
 @router.get("/{category_id}", response_model=CategoryResponse)
 async def get_category_by_id(
     category_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
         service = CategoryService(db)
         return await service.get_category(category_id)
@@ -37,8 +71,8 @@ async def get_category_by_id(
 
 @router.get("/uuid/{category_uuid}", response_model=CategoryResponse)
 async def get_category_by_uuid(
-    category_uuid: str,
-    db: AsyncSession = Depends(get_db)
+    category_uuid: uuid.UUID,
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
         service = CategoryService(db)
         return await service.get_category_by_uuid(category_uuid)
@@ -47,7 +81,7 @@ async def get_category_by_uuid(
 async def update_category(
     category_id: int,
     category: CategoryUpdate,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
         service = CategoryService(db)
         return await service.update_category(category_id, category)
@@ -55,7 +89,7 @@ async def update_category(
 @router.delete("/{category_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_category(
     category_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
         service = CategoryService(db)
         await service.delete_category(category_id)
@@ -0,0 +1,32 @@
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, Header, Query, Request
+from fastapi.responses import StreamingResponse
+
+from config.settings import settings
+from shared.changes import ChangeFeed, ChangeFilter, sse_stream
+from shared.tracing import TracedRoute
+
+router = APIRouter(prefix="/changes", tags=["changes"], route_class=TracedRoute)
+
+ChangeResource = Literal["athlete", "category", "training_center"]
+
+
+def get_change_feed(request: Request) -> ChangeFeed:
+    return request.app.state.change_feed
+
+@router.get("/stream")
+async def stream_changes(
+    resource: Optional[List[ChangeResource]] = Query(None, description="Only these resource types (repeatable)"),
+    training_center_id: Optional[int] = Query(None, description="Only changes in this training center"),
+    last_event_id: Optional[int] = Header(None, description="Resume after this event id"),
+    feed: ChangeFeed = Depends(get_change_feed)
+):
+    subscription, replay, resumed = await feed.resume(
+        ChangeFilter(frozenset(resource or ()), training_center_id),
+        last_event_id
+    )
+    return StreamingResponse(
+        sse_stream(feed, subscription, replay, settings.CHANGE_FEED_HEARTBEAT_SECONDS, reset=not resumed),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,33 @@
+from typing import Dict, List, Optional
+from fastapi import Query
+from shared.counting import CountMode, TOTAL_COUNT_HEADER
+from src.schemas.base import MAX_BATCH_SIZE
+from src.exceptions.custom_exceptions import ValidationException
+
+
+def batch_pk_ids(
+    ids: str = Query(..., description="Comma-separated primary keys, e.g. 1,2,3")
+) -> List[int]:
+    try:
+        pk_ids = [int(value) for value in ids.split(",") if value.strip()]
+    except ValueError:
+        raise ValidationException("ids must be a comma-separated list of integers")
+
+    if not pk_ids:
+        raise ValidationException("ids must contain at least one id")
+    if len(pk_ids) > MAX_BATCH_SIZE:
+        raise ValidationException(f"ids must contain at most {MAX_BATCH_SIZE} ids")
+    return pk_ids
+
+
+def count_mode(
+    count: CountMode = Query(
+        "none",
+        description="Total for the X-Total-Count header: exact (cached briefly), estimated (planner statistics) or none"
+    )
+) -> CountMode:
+    return count
+
+
+def total_count_headers(total: Optional[int]) -> Dict[str, str]:
+    return {TOTAL_COUNT_HEADER: str(total)} if total is not None else {}
@@ -0,0 +1,42 @@
+import uuid
+from fastapi import APIRouter, Depends, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shared.database import get_db
+from shared.deadlines import DeadlineRoute
+from shared.jobs import JobRunner
+from src.schemas.job import JobCreate, JobResponse
+from src.services.job import JobService
+from src.exceptions.custom_exceptions import ServiceUnavailableException
+
+router = APIRouter(prefix="/jobs", tags=["jobs"], route_class=DeadlineRoute)
+
+
+def get_job_runner(request: Request) -> JobRunner:
+    return request.app.state.job_runner
+
+@router.post("/", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_job(
+    job: JobCreate,
+    runner: JobRunner = Depends(get_job_runner),
+    db: AsyncSession = Depends(get_db, scope="function")
+):
+    if runner.is_full:
+        raise ServiceUnavailableException("Job queue is full, try again later", retry_after=30)
+
+    service = JobService(db)
+    created = await service.create_job(job)
+    if not runner.submit(created.id):
+        # The queue filled up while the job was being stored.
+        if await service.reject_job(created, "Job queue was full"):
+            raise ServiceUnavailableException("Job queue is full, try again later", retry_after=30)
+        return await service.get_job(created.id)
+    return created
+
+@router.get("/{id}", response_model=JobResponse)
+async def get_job(
+    id: uuid.UUID,
+    db: AsyncSession = Depends(get_db, scope="function")
+):
+    service = JobService(db)
+    return await service.get_job(id)
@@ -0,0 +1,28 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Header
+from fastapi.responses import PlainTextResponse
+
+from shared.profiling import PROFILES_PATH, is_authorised, profile_store
+from shared.tracing import TracedRoute
+from src.exceptions.custom_exceptions import ForbiddenException, NotFoundException
+
+router = APIRouter(prefix=PROFILES_PATH, tags=["debug"], route_class=TracedRoute)
+
+
+def require_profile_token(x_profile: Optional[str] = Header(None)) -> None:
+    if not is_authorised(x_profile):
+        raise ForbiddenException("A valid X-Profile token is required")
+
+@router.get("/", response_model=List[dict], dependencies=[Depends(require_profile_token)])
+async def list_profiles():
+    return [profile.summary() for profile in profile_store.list()]
+
+@router.get("/{id}", response_class=PlainTextResponse, dependencies=[Depends(require_profile_token)])
+async def download_profile(id: str):
+    profile = profile_store.get(id)
+    if profile is None:
+        raise NotFoundException(f"Profile {id} not found")
+    return PlainTextResponse(
+        profile.collapsed(),
+        headers={"Content-Disposition": f'attachment; filename="profile-{id}.collapsed.txt"'}
+    )
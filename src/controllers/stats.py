@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+
+from shared.database import get_db
+from shared.response_cache import CachedRoute, cache_response
+from src.schemas.athlete import AthleteBmiStats
+from src.services.athlete import AthleteService
+
+router = APIRouter(prefix="/stats", tags=["stats"], route_class=CachedRoute)
+
+@router.get("/bmi", response_model=List[AthleteBmiStats])
+@cache_response("athlete")
+async def get_bmi_stats(
+    training_center_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_db, scope="function")
+):
+    service = AthleteService(db)
+    return await service.get_bmi_stats(training_center_id)
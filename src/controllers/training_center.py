@@ -1,46 +1,81 @@
-from fastapi import APIRouter, Depends, status
+import uuid
+from fastapi import APIRouter, Depends, Header, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Optional
 from shared.database import get_db
+from shared.response_cache import CachedRoute, cache_response
+from shared.idempotency import idempotency
+from shared.counting import CountMode
+from src.controllers.dependencies import batch_pk_ids, count_mode, total_count_headers
 
+from src.schemas.base import UUIDBatchRequest
 from src.schemas.training_center import (
     TrainingCenterCreate,
     TrainingCenterUpdate,
-    TrainingCenterResponse
+    TrainingCenterResponse,
+    TrainingCenterBatchResponse
 )
 from src.services.training_center import TrainingCenterService
 
-router = APIRouter(prefix="/training-centers", tags=["training-centers"])
+router = APIRouter(prefix="/training-centers", tags=["training-centers"], route_class=CachedRoute)
 
 @router.post("/", response_model=TrainingCenterResponse, status_code=status.HTTP_201_CREATED)
 async def create_training_center(
     training_center: TrainingCenterCreate,
-    db: AsyncSession = Depends(get_db)
+    idempotency_key: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     service = TrainingCenterService(db)
-    return await service.create_training_center(training_center)
+    return await idempotency.run(
+        idempotency_key,
+        "POST /training-centers/",
+        training_center,
+        TrainingCenterResponse,
+        lambda: service.create_training_center(training_center),
+        status_code=status.HTTP_201_CREATED
+    )
 
 @router.get("/", response_model=List[TrainingCenterResponse])
+@cache_response("training_center")
 async def get_training_centers(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db)
+    count: CountMode = Depends(count_mode),
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     service = TrainingCenterService(db)
+    response.headers.update(total_count_headers(await service.count_training_centers(count)))
     return await service.get_all_training_centers(skip, limit)
 
+@router.get("/batch", response_model=TrainingCenterBatchResponse)
+async def get_training_centers_batch(
+    ids: List[int] = Depends(batch_pk_ids),
+    db: AsyncSession = Depends(get_db, scope="function")
+):
+    service = TrainingCenterService(db)
+    return await service.get_training_centers_by_ids(ids)
+
+@router.post("/batch/uuid", response_model=TrainingCenterBatchResponse)
+async def get_training_centers_batch_by_uuid(
+    batch: UUIDBatchRequest,
+    db: AsyncSession = Depends(get_db, scope="function")
+):
+    service = TrainingCenterService(db)
+    return await service.get_training_centers_by_uuids(batch.ids)
+
 @router.get("/{pk_id}", response_model=TrainingCenterResponse)
 async def get_training_center(
     pk_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     service = TrainingCenterService(db)
     return await service.get_training_center(pk_id)
 
 @router.get("/uuid/{id}", response_model=TrainingCenterResponse)
 async def get_training_center_by_uuid(
-    id: str,
-    db: AsyncSession = Depends(get_db)
+    id: uuid.UUID,
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     service = TrainingCenterService(db)
     return await service.get_training_center_by_uuid(id)
@@ -49,7 +84,7 @@ async def get_training_center_by_uuid(
 async def update_training_center(
     pk_id: int,
     training_center: TrainingCenterUpdate,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     service = TrainingCenterService(db)
     return await service.update_training_center(pk_id, training_center)
@@ -57,7 +92,7 @@ async def update_training_center(
 @router.delete("/{pk_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_training_center(
     pk_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     service = TrainingCenterService(db)
     await service.delete_training_center(pk_id)
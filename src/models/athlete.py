@@ -1,22 +1,50 @@
-from sqlalchemy import Column, String, Integer, Float, ForeignKey
+from sqlalchemy import Column, Computed, String, Integer, Float, ForeignKey, Index, func
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import relationship
-import uuid
-from src.models.base import BaseModel
+from shared.identifiers import uuid7
+from src.models.base import Base, BaseModel
+
+LEADERBOARD_GROUPS = ("category_id", "training_center_id")
+LEADERBOARD_COLUMNS = ("weight", "age", "bmi")
+
 
 class Athlete(BaseModel):
+    # Hash-partitioned on training_center_id by migration 1a9c3e5f7b20.
+    # Postgres cannot enforce a unique index on a partitioned table unless it
+    # includes the partition key, so id and cpf are only indexed here and
+    # their uniqueness is declared on AthleteKey below.
     __tablename__ = "athlete"
+    # Each leaderboard reads one of these in order (forwards or backwards),
+    # so ROW_NUMBER() needs no sort (migration 4e8b1d7c2a95).
+    __table_args__ = tuple(
+        Index(f"ix_athlete_{group}_{column}", group, column, "pk_id")
+        for group in LEADERBOARD_GROUPS
+        for column in LEADERBOARD_COLUMNS
+    )
 
-    id = Column(PG_UUID(as_uuid=True), default=uuid.uuid4, unique=True, nullable=False)
+    id = Column(PG_UUID(as_uuid=True), default=uuid7, nullable=False)
     name = Column(String(50), nullable=False)
-    cpf = Column(String(11), unique=True, nullable=False)
+    cpf = Column(String(11), nullable=False, index=True)
     age = Column(Integer)
     weight = Column(Float(10, 2))
     height = Column(Float(10, 2))
     sex = Column(String(1))
+    # weight (kg) / height (m)², computed by Postgres (migration 3c6e9a2d5f14).
+    bmi = Column(Float, Computed("CASE WHEN height > 0 THEN weight / (height * height) END", persisted=True), index=True)
 
-    training_center_id = Column(Integer, ForeignKey("training_center.pk_id"))
-    category_id = Column(Integer, ForeignKey("category.pk_id"))
+    training_center_id = Column(Integer, ForeignKey("training_center.pk_id"), index=True)
+    category_id = Column(Integer, ForeignKey("category.pk_id"), index=True)
 
     training_center = relationship("TrainingCenter", backref="athletes")
-    category = relationship("Category", backref="athletes")
\ No newline at end of file
+    category = relationship("Category", backref="athletes")
+
+
+class AthleteKey(Base):
+    # One row per athlete, kept in sync by the athlete_key_sync trigger on
+    # athlete (migration 1a9c3e5f7b20). Inserting here before the athlete
+    # claims its CPF: the unique index settles concurrent claims.
+    __tablename__ = "athlete_key"
+
+    pk_id = Column(Integer, primary_key=True, autoincrement=False, default=func.nextval("athlete_pk_id_seq"))
+    id = Column(PG_UUID(as_uuid=True), default=uuid7, unique=True, nullable=False)
+    cpf = Column(String(11), unique=True, nullable=False)
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, String, Integer, LargeBinary, DateTime
+from src.models.base import BaseModel
+
+
+class IdempotencyKey(BaseModel):
+    __tablename__ = "idempotency_key"
+
+    key = Column(String(255), unique=True, nullable=False)
+    request_hash = Column(String(64), nullable=False)
+    status_code = Column(Integer, nullable=True)
+    response_body = Column(LargeBinary, nullable=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, String, Integer, Float, Text, DateTime
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, JSONB
+from shared.identifiers import uuid7
+from src.models.base import BaseModel
+
+
+class Job(BaseModel):
+    __tablename__ = "job"
+
+    id = Column(PG_UUID(as_uuid=True), default=uuid7, unique=True, nullable=False)
+    job_type = Column(String(50), nullable=False)
+    status = Column(String(20), nullable=False, default="pending", index=True)
+    params = Column(JSONB, nullable=False, default=dict)
+    progress = Column(Float, nullable=False, default=0.0)
+    message = Column(Text)
+    result = Column(JSONB)
+    error = Column(Text)
+    attempts = Column(Integer, nullable=False, default=0)
+    owner = Column(String(128))
+    heartbeat_at = Column(DateTime(timezone=True))
+    started_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
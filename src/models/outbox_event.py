@@ -0,0 +1,25 @@
+from sqlalchemy import Column, String, Integer, DateTime, Text, Index, text
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, JSONB
+from shared.identifiers import uuid7
+from src.models.base import BaseModel
+
+
+class OutboxEvent(BaseModel):
+    __tablename__ = "outbox_event"
+    __table_args__ = (
+        Index(
+            "ix_outbox_event_pending",
+            "pk_id",
+            postgresql_where=text("published_at IS NULL")
+        ),
+    )
+
+    id = Column(PG_UUID(as_uuid=True), default=uuid7, unique=True, nullable=False)
+    aggregate_type = Column(String(40), nullable=False)
+    aggregate_id = Column(Integer, nullable=False)
+    event_type = Column(String(40), nullable=False)
+    payload = Column(JSONB, nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime(timezone=True))
+    last_error = Column(Text)
+    published_at = Column(DateTime(timezone=True))
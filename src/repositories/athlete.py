@@ -1,13 +1,65 @@
-from typing import Optional, List
+from typing import Optional, List, AsyncIterator, Dict, Iterable, Sequence
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
-from src.models.athlete import Athlete
+from sqlalchemy import select, and_, func, bindparam, type_coerce, cast, Float, String
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.orm import aliased
+from src.models.athlete import Athlete, AthleteKey
+from src.models.category import Category
+from src.models.training_center import TrainingCenter
 from src.repositories.base import BaseRepository
+from src.repositories.outbox import serialize_state
+from shared.counting import CountMode
+from shared.identifiers import uuid7
 
 
 class AthleteRepository(BaseRepository):
     def __init__(self, db: AsyncSession):
-        super().__init__(Athlete, db)
+        super().__init__(Athlete, db, aggregate_type="athlete")
+
+    async def create_many(self, rows: List[dict]) -> List[Athlete]:
+        """Insert many athletes in one batch, skipping CPFs that already exist."""
+        return [athlete for athlete in await self.create_each(rows) if athlete is not None]
+
+    async def create_each(self, rows: List[dict]) -> List[Optional[Athlete]]:
+        """Insert ``rows`` in one batch and return the outcome of each, in order.
+
+        A row whose CPF already exists, or is used by an earlier row, is not
+        inserted and gets None.
+        """
+        first_rows = {}
+        for row in rows:
+            first_rows.setdefault(row["cpf"], row)
+        if not first_rows:
+            return []
+
+        # The partitioned athlete table has no unique index on cpf to use as an
+        # ON CONFLICT arbiter, so the CPFs are claimed in athlete_key first.
+        # DO NOTHING settles each conflict on its own row in this one
+        # statement: a CPF already taken, or claimed by a concurrent
+        # transaction that then commits, comes back unclaimed rather than
+        # failing the batch.
+        claimed = await self.db.execute(
+            insert(AthleteKey)
+            .on_conflict_do_nothing()
+            .returning(AthleteKey.cpf, AthleteKey.pk_id, AthleteKey.id),
+            [{"cpf": cpf, "id": row.get("id") or uuid7()} for cpf, row in first_rows.items()]
+        )
+        keys = {cpf: (pk_id, id) for cpf, pk_id, id in claimed.all()}
+        if not keys:
+            return [None] * len(rows)
+
+        result = await self.db.scalars(
+            insert(Athlete).returning(Athlete),
+            [
+                {**row, "pk_id": keys[cpf][0], "id": keys[cpf][1]}
+                for cpf, row in first_rows.items() if cpf in keys
+            ]
+        )
+        created = {athlete.cpf: athlete for athlete in result.all()}
+        for athlete in created.values():
+            self._record_event("created", athlete.pk_id, serialize_state(athlete))
+        await self._commit()
+        return [created.get(row["cpf"]) if first_rows[row["cpf"]] is row else None for row in rows]
 
     async def get_by_cpf(self, cpf: str) -> Optional[Athlete]:
         result = await self.db.execute(
@@ -15,22 +67,191 @@ class AthleteRepository(BaseRepository):
         )
         return result.scalar_one_or_none()
 
+    async def get_cpf_owners(self, cpfs: Iterable[str]) -> Dict[str, int]:
+        """pk_id of the athlete holding each of ``cpfs``, for those that are taken."""
+        cpfs = list(cpfs)
+        if not cpfs:
+            return {}
+        result = await self.db.execute(
+            select(Athlete.cpf, Athlete.pk_id).where(Athlete.cpf.in_(cpfs))
+        )
+        return {cpf: pk_id for cpf, pk_id in result.all()}
+
+    async def update_filtered(
+        self,
+        changes: dict,
+        training_center_id: Optional[int] = None,
+        category_id: Optional[int] = None
+    ) -> List[Athlete]:
+        criteria = []
+        if training_center_id is not None:
+            criteria.append(Athlete.training_center_id == training_center_id)
+        if category_id is not None:
+            criteria.append(Athlete.category_id == category_id)
+        return await self.update_matching(*criteria, **changes)
+
     async def get_by_training_center(self, training_center_id: int) -> List[Athlete]:
         result = await self.db.execute(
             select(Athlete).where(Athlete.training_center_id == training_center_id)
         )
         return result.scalars().all()
 
+    def stream_by_training_center(self, training_center_id: int) -> AsyncIterator[Athlete]:
+        return self.stream(Athlete.training_center_id == training_center_id)
+
+    async def count_by_training_center(self, training_center_id: int, mode: CountMode = "exact") -> Optional[int]:
+        return await self.count(Athlete.training_center_id == training_center_id, mode=mode)
+
     async def get_by_category(self, category_id: int) -> List[Athlete]:
         result = await self.db.execute(
             select(Athlete).where(Athlete.category_id == category_id)
         )
         return result.scalars().all()
 
+    def stream_by_category(self, category_id: int) -> AsyncIterator[Athlete]:
+        return self.stream(Athlete.category_id == category_id)
+
+    async def count_by_category(self, category_id: int, mode: CountMode = "exact") -> Optional[int]:
+        return await self.count(Athlete.category_id == category_id, mode=mode)
+
     async def get_by_age_range(self, min_age: int, max_age: int) -> List[Athlete]:
         result = await self.db.execute(
             select(Athlete).where(
                 and_(Athlete.age >= min_age, Athlete.age <= max_age)
             )
         )
-        return result.scalars().all()
\ No newline at end of file
+        return result.scalars().all()
+
+    async def count_by_age_range(self, min_age: int, max_age: int, mode: CountMode = "exact") -> Optional[int]:
+        return await self.count(and_(Athlete.age >= min_age, Athlete.age <= max_age), mode=mode)
+
+    def _bmi_between(self, bmi_min: Optional[float], bmi_max: Optional[float]) -> list:
+        criteria = []
+        if bmi_min is not None:
+            criteria.append(Athlete.bmi >= bmi_min)
+        if bmi_max is not None:
+            criteria.append(Athlete.bmi <= bmi_max)
+        return criteria
+
+    def stream_by_bmi(
+        self,
+        bmi_min: Optional[float] = None,
+        bmi_max: Optional[float] = None,
+        skip: int = 0,
+        limit: Optional[int] = None
+    ) -> AsyncIterator[Athlete]:
+        return self.stream(*self._bmi_between(bmi_min, bmi_max), skip=skip, limit=limit)
+
+    async def count_by_bmi(
+        self,
+        bmi_min: Optional[float] = None,
+        bmi_max: Optional[float] = None,
+        mode: CountMode = "exact"
+    ) -> Optional[int]:
+        return await self.count(*self._bmi_between(bmi_min, bmi_max), mode=mode)
+
+    async def get_bmi_percentiles(
+        self,
+        fractions: Sequence[float],
+        training_center_id: Optional[int] = None
+    ) -> List[dict]:
+        """BMI spread per category: count, min, max and percentile_cont at each of ``fractions``."""
+        query = (
+            select(
+                Athlete.category_id,
+                func.count(Athlete.bmi).label("athletes"),
+                func.min(Athlete.bmi).label("min"),
+                func.max(Athlete.bmi).label("max"),
+                type_coerce(
+                    func.percentile_cont(bindparam("fractions", list(fractions), type_=ARRAY(Float)))
+                    .within_group(Athlete.bmi),
+                    ARRAY(Float)
+                ).label("values")
+            )
+            .where(Athlete.bmi.is_not(None))
+            .group_by(Athlete.category_id)
+            .order_by(Athlete.category_id)
+        )
+        if training_center_id is not None:
+            query = query.where(Athlete.training_center_id == training_center_id)
+        result = await self.db.execute(query)
+        return [dict(row._mapping) for row in result]
+
+    async def get_leaderboard(self, group: str, column: str, descending: bool, k: int) -> List[tuple]:
+        """(rank, athlete) for the top ``k`` athletes by ``column`` in each ``group``, one query.
+
+        Athletes without a group or a value are not ranked. Ties go to the
+        lower pk_id, or the higher one on descending boards, so the window
+        order matches the (group, column, pk_id) index.
+        """
+        group_key, value = getattr(Athlete, group), getattr(Athlete, column)
+        order = (value.desc(), Athlete.pk_id.desc()) if descending else (value, Athlete.pk_id)
+        ranked = (
+            select(Athlete, func.row_number().over(partition_by=group_key, order_by=order).label("rank"))
+            .where(group_key.is_not(None), value.is_not(None))
+            .subquery()
+        )
+        athlete = aliased(Athlete, ranked)
+        result = await self.db.execute(
+            select(ranked.c.rank, athlete)
+            .where(ranked.c.rank <= k)
+            .order_by(ranked.c[group], ranked.c.rank)
+        )
+        return result.all()
+
+    async def stream_roster(self, chunk_size: int = 65536) -> AsyncIterator[list]:
+        """Every athlete with its category and training center names, in pk_id
+        order, ``chunk_size`` rows at a time from a server-side cursor."""
+        result = await self.db.stream(
+            select(
+                Athlete.pk_id,
+                cast(Athlete.id, String).label("id"),
+                Athlete.name,
+                Athlete.cpf,
+                Athlete.age,
+                Athlete.sex,
+                Athlete.weight,
+                Athlete.height,
+                Athlete.bmi,
+                Athlete.training_center_id,
+                TrainingCenter.name.label("training_center"),
+                Athlete.category_id,
+                Category.name.label("category"),
+                Athlete.created_at,
+                Athlete.updated_at
+            )
+            .outerjoin(TrainingCenter, Athlete.training_center_id == TrainingCenter.pk_id)
+            .outerjoin(Category, Athlete.category_id == Category.pk_id)
+            .order_by(Athlete.pk_id)
+            .execution_options(yield_per=chunk_size)
+        )
+        async for rows in result.partitions(chunk_size):
+            yield rows
+
+    async def get_ids(self, training_center_id: Optional[int] = None, category_id: Optional[int] = None) -> List[int]:
+        query = select(Athlete.pk_id).order_by(Athlete.pk_id)
+        if training_center_id is not None:
+            query = query.where(Athlete.training_center_id == training_center_id)
+        if category_id is not None:
+            query = query.where(Athlete.category_id == category_id)
+        result = await self.db.execute(query)
+        return result.scalars().all()
+
+    async def get_roster_stats(self) -> List[dict]:
+        result = await self.db.execute(
+            select(
+                Athlete.training_center_id,
+                Athlete.category_id,
+                func.count(Athlete.pk_id).label("athletes"),
+                func.avg(Athlete.age).label("avg_age"),
+                func.avg(Athlete.weight).label("avg_weight"),
+                func.avg(Athlete.height).label("avg_height")
+            )
+            .group_by(Athlete.training_center_id, Athlete.category_id)
+            .order_by(Athlete.training_center_id, Athlete.category_id)
+        )
+        return [
+            {key: float(value) if key.startswith("avg_") and value is not None else value
+             for key, value in row._mapping.items()}
+            for row in result
+        ]
@@ -1,20 +1,51 @@
-from typing import TypeVar, Type, Optional, List
+import uuid
+from typing import TypeVar, Type, Optional, List, Sequence, AsyncIterator, Dict, Mapping, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete
+from sqlalchemy import select, update, delete, any_, bindparam, column, values
+from sqlalchemy.dialects.postgresql import ARRAY
 from src.models.base import BaseModel
+from src.repositories.outbox import OutboxRepository, serialize_state
+from shared.counting import CountMode, total_count
+from shared.response_cache import table_versions
+from shared.unit_of_work import current_unit_of_work
 
 ModelType = TypeVar("ModelType", bound=BaseModel)
 
 
 class BaseRepository:
-    def __init__(self, model: Type[ModelType], db: AsyncSession):
+    def __init__(self, model: Type[ModelType], db: AsyncSession, aggregate_type: Optional[str] = None):
         self.model = model
         self.db = db
+        # When set, every write appends an outbox event in the same transaction.
+        self.aggregate_type = aggregate_type
+
+    def _any_of(self, ids: Sequence, column: str = "pk_id"):
+        key = getattr(self.model, column)
+        return key == any_(bindparam("ids", list(ids), type_=ARRAY(key.type)))
+
+    def _record_event(self, event_type: str, pk_id: int, payload: dict) -> None:
+        if self.aggregate_type:
+            OutboxRepository(self.db).add(self.aggregate_type, pk_id, event_type, payload)
+
+    async def _commit(self) -> None:
+        """Commit the write, or only flush it when a UnitOfWork owns the transaction."""
+        unit_of_work = current_unit_of_work(self.db)
+        if unit_of_work is not None:
+            await self.db.flush()
+            unit_of_work.tables.add(self.model.__tablename__)
+            return
+        await self.db.commit()
+        # After the commit: a reader that saw the old rows cached them under
+        # the old version, which no one asks for any more.
+        table_versions.bump(self.model.__tablename__)
 
     async def create(self, **kwargs) -> ModelType:
         db_obj = self.model(**kwargs)
         self.db.add(db_obj)
-        await self.db.commit()
+        if self.aggregate_type:
+            await self.db.flush()
+            self._record_event("created", db_obj.pk_id, serialize_state(db_obj))
+        await self._commit()
         await self.db.refresh(db_obj)
         return db_obj
 
@@ -24,32 +55,163 @@ class BaseRepository:
         )
         return result.scalar_one_or_none()
 
-    async def get_by_uuid(self, id: str) -> Optional[ModelType]:
+    async def get_by_uuid(self, id: uuid.UUID) -> Optional[ModelType]:
         result = await self.db.execute(
             select(self.model).where(self.model.id == id)
         )
         return result.scalar_one_or_none()
 
+    async def get_many(self, ids: Sequence, column: str = "pk_id") -> List[ModelType]:
+        """Fetch rows matching any of ``ids`` in one query, in the order requested."""
+        if not ids:
+            return []
+
+        result = await self.db.execute(
+            select(self.model).where(self._any_of(ids, column))
+        )
+        found = {getattr(obj, column): obj for obj in result.scalars().all()}
+        return [found[id] for id in ids if id in found]
+
     async def get_all(self, skip: int = 0, limit: int = 100) -> List[ModelType]:
         result = await self.db.execute(
             select(self.model).offset(skip).limit(limit)
         )
         return result.scalars().all()
 
+    async def count(self, *criteria, mode: CountMode = "exact") -> Optional[int]:
+        """Rows matching ``criteria``: exact (briefly cached), estimated or not at all."""
+        query = select(self.model.pk_id).where(*criteria)
+        return await total_count(self.db, query, self.model.__tablename__, mode)
+
+    async def stream(
+        self,
+        *criteria,
+        skip: int = 0,
+        limit: Optional[int] = None,
+        batch_size: int = 500
+    ) -> AsyncIterator[ModelType]:
+        """Yield rows from a server-side cursor instead of loading them all at once."""
+        result = await self.db.stream_scalars(
+            select(self.model)
+            .where(*criteria)
+            .offset(skip)
+            .limit(limit)
+            .execution_options(yield_per=batch_size)
+        )
+        async for db_obj in result:
+            yield db_obj
+
+    async def iter_batches(self, *criteria, batch_size: int = 500) -> AsyncIterator[List[ModelType]]:
+        """Yield every row matching ``criteria`` in pk_id order, ``batch_size`` rows at a time.
+
+        Each batch is an index range scan starting after the last pk_id seen,
+        so late batches cost the same as early ones, and a batch's rows are
+        expunged once the caller asks for the next, so memory stays flat.
+
+        The transaction reading a batch is committed once the caller is done
+        with it, so no transaction, snapshot or connection is held for the
+        whole walk; the batches do not share one snapshot. Anything the caller
+        left pending on this session is committed with it. Inside a UnitOfWork
+        the walk runs in that unit's transaction instead.
+        """
+        last_pk_id = None
+        while True:
+            query = select(self.model).where(*criteria).order_by(self.model.pk_id).limit(batch_size)
+            if last_pk_id is not None:
+                query = query.where(self.model.pk_id > last_pk_id)
+            batch = (await self.db.scalars(query)).all()
+            if not batch:
+                await self._end_read()
+                return
+            try:
+                yield batch
+            finally:
+                for db_obj in batch:
+                    if db_obj in self.db:
+                        self.db.expunge(db_obj)
+                await self._end_read()
+            if len(batch) < batch_size:
+                return
+            last_pk_id = batch[-1].pk_id
+
+    async def _end_read(self) -> None:
+        if current_unit_of_work(self.db) is None and self.db.in_transaction():
+            await self.db.commit()
+
     async def update(self, pk_id: int, **kwargs) -> Optional[ModelType]:
         await self.db.execute(
             update(self.model)
             .where(self.model.pk_id == pk_id)
             .values(**kwargs)
         )
-        await self.db.commit()
-        return await self.get_by_id(pk_id)
+        db_obj = await self.get_by_id(pk_id)
+        if db_obj is not None:
+            self._record_event("updated", pk_id, serialize_state(db_obj))
+        await self._commit()
+        return db_obj
+
+    async def update_many(self, pk_ids: Sequence[int], **kwargs) -> List[ModelType]:
+        """Apply the same change set to every row in ``pk_ids`` with one UPDATE."""
+        if not pk_ids:
+            return []
+        return await self.update_matching(self._any_of(pk_ids), **kwargs)
+
+    async def update_matching(self, *criteria, **kwargs) -> List[ModelType]:
+        """Apply the same change set to every row matching ``criteria`` with one UPDATE."""
+        db_objs = await self._update_returning(
+            update(self.model).where(*criteria).values(**kwargs)
+        )
+        await self._commit()
+        return db_objs
+
+    async def update_each(self, changes: Mapping[int, dict]) -> List[ModelType]:
+        """Apply a change set per pk_id in one transaction.
+
+        Rows changing the same columns share one UPDATE ... FROM (VALUES ...),
+        so the statement count depends on the shapes of the changes, not on
+        the number of rows.
+        """
+        groups: Dict[Tuple[str, ...], List[Tuple[int, dict]]] = {}
+        for pk_id, change in changes.items():
+            if change:
+                groups.setdefault(tuple(sorted(change)), []).append((pk_id, change))
+
+        db_objs = []
+        for columns, rows in groups.items():
+            data = values(
+                column("pk_id", self.model.pk_id.type),
+                *(column(name, getattr(self.model, name).type) for name in columns),
+                name="changes"
+            ).data([(pk_id, *(change[name] for name in columns)) for pk_id, change in rows])
+            db_objs.extend(await self._update_returning(
+                update(self.model)
+                .where(self.model.pk_id == data.c.pk_id)
+                .values({name: data.c[name] for name in columns})
+            ))
+        await self._commit()
+        return db_objs
+
+    async def _update_returning(self, statement) -> List[ModelType]:
+        result = await self.db.scalars(
+            statement.returning(self.model),
+            execution_options={"synchronize_session": False}
+        )
+        db_objs = result.all()
+        for db_obj in db_objs:
+            self._record_event("updated", db_obj.pk_id, serialize_state(db_obj))
+        return db_objs
 
     async def delete(self, pk_id: int) -> bool:
-        await self.db.execute(
-            delete(self.model).where(self.model.pk_id == pk_id)
+        # The whole row goes into the event, so consumers (and change feed
+        # filters such as training_center_id) still see what was removed.
+        result = await self.db.scalars(
+            delete(self.model).where(self.model.pk_id == pk_id).returning(self.model),
+            execution_options={"synchronize_session": False}
         )
-        await self.db.commit()
+        deleted = result.one_or_none()
+        if deleted is not None:
+            self._record_event("deleted", pk_id, serialize_state(deleted))
+        await self._commit()
         return True
 
     async def exists(self, pk_id: int) -> bool:
@@ -8,7 +8,7 @@ from src.repositories.base import BaseRepository
 
 class CategoryRepository(BaseRepository):
     def __init__(self, db: AsyncSession):
-        super().__init__(Category, db)
+        super().__init__(Category, db, aggregate_type="category")
 
     async def get_by_name(self, name: str) -> Optional[Category]:
         result = await self.db.execute(
@@ -0,0 +1,83 @@
+#repository for Job model
+import uuid
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, func, or_, and_
+from src.models.job import Job
+from src.repositories.base import BaseRepository
+
+
+def _claimable(stale_before: datetime):
+    # Pending jobs, and running jobs whose owner stopped sending heartbeats.
+    return or_(
+        Job.status == "pending",
+        and_(
+            Job.status == "running",
+            or_(Job.heartbeat_at.is_(None), Job.heartbeat_at < stale_before)
+        )
+    )
+
+
+class JobRepository(BaseRepository):
+    def __init__(self, db: AsyncSession):
+        super().__init__(Job, db)
+
+    async def get_claimable(self, stale_before: datetime, limit: int) -> List[uuid.UUID]:
+        result = await self.db.execute(
+            select(Job.id)
+            .where(_claimable(stale_before))
+            .order_by(Job.pk_id)
+            .limit(limit)
+        )
+        return result.scalars().all()
+
+    async def claim(self, id: uuid.UUID, owner: str, stale_before: datetime) -> Optional[Job]:
+        """Atomically take a claimable job; None if it is finished or owned by a live worker."""
+        result = await self.db.scalars(
+            update(Job)
+            .where(Job.id == id, _claimable(stale_before))
+            .values(
+                status="running",
+                attempts=Job.attempts + 1,
+                owner=owner,
+                heartbeat_at=func.now(),
+                started_at=func.now()
+            )
+            .returning(Job),
+            execution_options={"synchronize_session": False}
+        )
+        job = result.one_or_none()
+        await self.db.commit()
+        return job
+
+    async def heartbeat(self, pk_id: int, owner: str) -> bool:
+        return await self._update_if(
+            and_(Job.pk_id == pk_id, Job.owner == owner, Job.status == "running"),
+            heartbeat_at=func.now()
+        )
+
+    async def finish(self, pk_id: int, owner: str, **kwargs) -> bool:
+        """Record the outcome, unless another worker has taken the job over meanwhile."""
+        return await self._update_if(
+            and_(Job.pk_id == pk_id, Job.owner == owner, Job.status == "running"),
+            **kwargs
+        )
+
+    async def fail_pending(self, pk_id: int, error: str) -> bool:
+        return await self._update_if(
+            and_(Job.pk_id == pk_id, Job.status == "pending"),
+            status="failed",
+            error=error,
+            finished_at=func.now()
+        )
+
+    async def _update_if(self, condition, **kwargs) -> bool:
+        result = await self.db.execute(
+            update(Job)
+            .where(condition)
+            .values(**kwargs)
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.commit()
+        return result.rowcount > 0
@@ -0,0 +1,130 @@
+#repository for OutboxEvent model
+import uuid
+from datetime import datetime, date, timedelta, timezone
+from typing import List, Sequence
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, delete, inspect, func, or_, tuple_
+from src.models.outbox_event import OutboxEvent
+
+# Arbitrary key for pg_try_advisory_xact_lock: one publisher drains at a time,
+# which is what keeps events of the same aggregate in order across workers.
+OUTBOX_LOCK_KEY = 7_301_030
+
+
+def serialize_state(obj) -> dict:
+    """Loaded column values of an ORM object as JSON-friendly data.
+
+    Only already loaded attributes are read, so this never triggers a lazy load.
+    """
+    state = inspect(obj)
+    payload = {}
+    for attr in state.mapper.column_attrs:
+        if attr.key not in state.dict:
+            continue
+        value = state.dict[attr.key]
+        if isinstance(value, uuid.UUID):
+            value = str(value)
+        elif isinstance(value, (datetime, date)):
+            value = value.isoformat()
+        payload[attr.key] = value
+    return payload
+
+
+class OutboxRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    def add(self, aggregate_type: str, aggregate_id: int, event_type: str, payload: dict) -> OutboxEvent:
+        # No commit: the event rides on the caller's transaction.
+        event = OutboxEvent(
+            aggregate_type=aggregate_type,
+            aggregate_id=aggregate_id,
+            event_type=event_type,
+            payload=payload,
+            attempts=0
+        )
+        self.db.add(event)
+        return event
+
+    async def acquire_publisher_lock(self) -> bool:
+        result = await self.db.execute(
+            select(func.pg_try_advisory_xact_lock(OUTBOX_LOCK_KEY))
+        )
+        return bool(result.scalar())
+
+    async def get_pending(self, limit: int) -> List[OutboxEvent]:
+        # Only aggregates whose oldest unpublished event is due for (re)delivery;
+        # picking single due rows instead would let later events overtake a
+        # failed one, and taking the oldest rows regardless of backoff lets a
+        # handful of failing aggregates starve everything queued behind them.
+        heads = (
+            select(func.min(OutboxEvent.pk_id).label("pk_id"))
+            .where(OutboxEvent.published_at.is_(None))
+            .group_by(OutboxEvent.aggregate_type, OutboxEvent.aggregate_id)
+            .subquery()
+        )
+        due_aggregates = (
+            select(OutboxEvent.aggregate_type, OutboxEvent.aggregate_id)
+            .join(heads, OutboxEvent.pk_id == heads.c.pk_id)
+            .where(or_(
+                OutboxEvent.next_attempt_at.is_(None),
+                OutboxEvent.next_attempt_at <= func.now()
+            ))
+        )
+        result = await self.db.execute(
+            select(OutboxEvent)
+            .where(
+                OutboxEvent.published_at.is_(None),
+                tuple_(OutboxEvent.aggregate_type, OutboxEvent.aggregate_id).in_(due_aggregates)
+            )
+            .order_by(OutboxEvent.pk_id)
+            .limit(limit)
+        )
+        return result.scalars().all()
+
+    async def mark_published(self, pk_ids: Sequence[int]) -> None:
+        if not pk_ids:
+            return
+        await self.db.execute(
+            update(OutboxEvent)
+            .where(OutboxEvent.pk_id.in_(pk_ids))
+            .values(published_at=func.now(), last_error=None)
+        )
+
+    async def mark_failed(self, pk_id: int, attempts: int, error: str, retry_in: float) -> None:
+        await self.db.execute(
+            update(OutboxEvent)
+            .where(OutboxEvent.pk_id == pk_id)
+            .values(
+                attempts=attempts,
+                last_error=error[:1000],
+                next_attempt_at=datetime.now(timezone.utc) + timedelta(seconds=retry_in)
+            )
+        )
+
+    async def purge_published(self, published_before: datetime, limit: int) -> int:
+        """Delete up to ``limit`` events published before ``published_before``.
+
+        Only the run of such events at the start of the table goes, stopping
+        at the first one still pending or published since: what is left is
+        always every event after some pk_id, which is what lets the change
+        feed tell whether a client's Last-Event-ID can still be resumed.
+        """
+        head = (
+            select(OutboxEvent.pk_id, OutboxEvent.published_at)
+            .order_by(OutboxEvent.pk_id)
+            .limit(limit)
+            .cte("head")
+        )
+        first_kept = (
+            select(func.min(head.c.pk_id))
+            .where(or_(head.c.published_at.is_(None), head.c.published_at >= published_before))
+            .scalar_subquery()
+        )
+        result = await self.db.execute(
+            delete(OutboxEvent).where(
+                OutboxEvent.pk_id.in_(select(head.c.pk_id)),
+                or_(first_kept.is_(None), OutboxEvent.pk_id < first_kept)
+            )
+        )
+        return result.rowcount
@@ -7,7 +7,7 @@ from src.repositories.base import BaseRepository
 
 class TrainingCenterRepository(BaseRepository):
     def __init__(self, db: AsyncSession):
-        super().__init__(TrainingCenter, db)
+        super().__init__(TrainingCenter, db, aggregate_type="training_center")
 
     async def get_by_name(self, name: str) -> Optional[TrainingCenter]:
         result = await self.db.execute(
@@ -1,7 +1,8 @@
-from typing import Optional
-from pydantic import BaseModel, ConfigDict
+from typing import Dict, Literal, Optional, List
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 import uuid
 from datetime import datetime
+from src.schemas.base import BatchResponseSchema
 
 
 class AthleteBase(BaseModel):
@@ -37,5 +38,75 @@ class AthleteUpdate(BaseModel):
 class AthleteResponse(AthleteBase):
     pk_id: int
     id: uuid.UUID
+    bmi: Optional[float] = None
     created_at: Optional[datetime] = None
-    updated_at: Optional[datetime] = None
\ No newline at end of file
+    updated_at: Optional[datetime] = None
+
+
+class AthleteBatchResponse(BatchResponseSchema):
+    items: List[AthleteResponse]
+
+
+LeaderboardPartition = Literal["category", "training_center"]
+LeaderboardOrder = Literal["weight", "age", "bmi"]
+MAX_LEADERBOARD_SIZE = 100
+
+
+class AthleteLeaderboardEntry(BaseModel):
+    # 1-based position within the athlete's category or training center.
+    rank: int
+    athlete: AthleteResponse
+
+
+class AthleteBmiStats(BaseModel):
+    category_id: Optional[int] = None
+    athletes: int
+    min: float
+    max: float
+    # Keyed "p5", "p25", "p50", ...
+    percentiles: Dict[str, float]
+
+
+MAX_BULK_UPDATE_SIZE = 10000
+
+
+class AthleteBulkFilter(BaseModel):
+    training_center_id: Optional[int] = None
+    category_id: Optional[int] = None
+
+    @model_validator(mode="after")
+    def check_not_empty(self):
+        if self.training_center_id is None and self.category_id is None:
+            raise ValueError("filter needs training_center_id and/or category_id")
+        return self
+
+
+class AthleteBulkChange(AthleteUpdate):
+    pk_id: int
+
+
+class AthleteBulkUpdate(BaseModel):
+    """Either one change set for ``ids`` or a ``filter``, or per-athlete ``items``."""
+
+    changes: Optional[AthleteUpdate] = None
+    ids: Optional[List[int]] = Field(None, min_length=1, max_length=MAX_BULK_UPDATE_SIZE)
+    filter: Optional[AthleteBulkFilter] = None
+    items: Optional[List[AthleteBulkChange]] = Field(None, min_length=1, max_length=MAX_BULK_UPDATE_SIZE)
+
+    @model_validator(mode="after")
+    def check_shape(self):
+        if self.items is not None:
+            if self.changes is not None or self.ids is not None or self.filter is not None:
+                raise ValueError("items cannot be combined with changes, ids or filter")
+            return self
+        if self.changes is None:
+            raise ValueError("either changes or items is required")
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("changes need exactly one of ids or filter")
+        return self
+
+
+class AthleteBulkUpdateResponse(BaseModel):
+    matched: int
+    updated: int
+    missing: List[int] = []
@@ -1,8 +1,10 @@
-from pydantic import BaseModel as PydanticBaseModel, ConfigDict
+from pydantic import BaseModel as PydanticBaseModel, ConfigDict, Field
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List, Union
 import uuid
 
+MAX_BATCH_SIZE = 500
+
 class BaseSchema(PydanticBaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -10,4 +12,10 @@ class BaseResponseSchema(BaseSchema):
     pk_id: int
     id: uuid.UUID
     created_at: Optional[datetime] = None
-    updated_at: Optional[datetime] = None
\ No newline at end of file
+    updated_at: Optional[datetime] = None
+
+class UUIDBatchRequest(BaseSchema):
+    ids: List[uuid.UUID] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+class BatchResponseSchema(BaseSchema):
+    missing: List[Union[int, uuid.UUID]]
@@ -1,7 +1,7 @@
 #schemas for Category entity
-from typing import Optional
+from typing import Optional, List
 from pydantic import BaseModel
-from src.schemas.base import BaseResponseSchema
+from src.schemas.base import BaseResponseSchema, BatchResponseSchema
 
 class CategoryBase(BaseModel):
     name: str
@@ -14,3 +14,6 @@ class CategoryUpdate(BaseModel):
 
 class CategoryResponse(BaseResponseSchema):
     name: str
+
+class CategoryBatchResponse(BatchResponseSchema):
+    items: List[CategoryResponse]
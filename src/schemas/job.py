@@ -0,0 +1,22 @@
+#schemas for Job entity
+from typing import Optional, Dict, Any
+from datetime import datetime
+import uuid
+from src.schemas.base import BaseSchema
+
+class JobCreate(BaseSchema):
+    job_type: str
+    params: Dict[str, Any] = {}
+
+class JobResponse(BaseSchema):
+    id: uuid.UUID
+    job_type: str
+    status: str
+    progress: float
+    message: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    attempts: int
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
@@ -1,5 +1,5 @@
-from typing import Optional
-from src.schemas.base import BaseSchema, BaseResponseSchema
+from typing import Optional, List
+from src.schemas.base import BaseSchema, BaseResponseSchema, BatchResponseSchema
 
 class TrainingCenterBase(BaseSchema):
     name: str
@@ -15,4 +15,7 @@ class TrainingCenterUpdate(BaseSchema):
     owner: Optional[str] = None
 
 class TrainingCenterResponse(TrainingCenterBase, BaseResponseSchema):
-    pass
\ No newline at end of file
+    pass
+
+class TrainingCenterBatchResponse(BatchResponseSchema):
+    items: List[TrainingCenterResponse]
@@ -1,15 +1,89 @@
-from typing import List, Optional
+import uuid
+from typing import Dict, List, Optional, AsyncIterator
+from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.repositories.athlete import AthleteRepository
-from src.schemas.athlete import AthleteCreate, AthleteUpdate
-from src.exceptions.custom_exceptions import NotFoundException, AlreadyExistsException
+from src.schemas.athlete import (
+    AthleteBulkChange,
+    AthleteBulkUpdate,
+    AthleteCreate,
+    AthleteUpdate,
+    LeaderboardOrder,
+    LeaderboardPartition
+)
+from config.settings import settings
+from shared.counting import CountMode
+from shared.database import AsyncSessionLocal
+from shared.group_commit import GroupCommit
+from shared.metrics import metrics
+from shared.singleflight import coalesce
+from shared.tracing import trace_service
+from shared.unit_of_work import current_unit_of_work
+from src.exceptions.custom_exceptions import NotFoundException, AlreadyExistsException, ValidationException
 
+UNIQUE_VIOLATION = "23505"
+BMI_PERCENTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
 
+
+def integrity_error(exc: IntegrityError) -> HTTPException:
+    if getattr(exc.orig, "sqlstate", None) == UNIQUE_VIOLATION:
+        return AlreadyExistsException("CPF already exists")
+    return ValidationException("Change references a missing training center or category")
+
+
+async def insert_athletes(rows: List[dict]) -> list:
+    """Group-commit writer: one multi-row INSERT and one commit for a whole batch of creates.
+
+    CPF conflicts, with each other or with concurrent writers, are settled
+    per row by the claim in create_each and come back as None.
+    """
+    async with AsyncSessionLocal() as session:
+        repository = AthleteRepository(session)
+        try:
+            created = await repository.create_each(rows)
+        except IntegrityError:
+            # A row references a missing training center or category: redo
+            # the batch row by row so only that row fails.
+            await session.rollback()
+            metrics.increment("group_commit_athlete_fallbacks")
+            return [await _insert_athlete(repository, row) for row in rows]
+    return [
+        athlete if athlete is not None else AlreadyExistsException(f"Athlete with CPF '{row['cpf']}' already exists")
+        for row, athlete in zip(rows, created)
+    ]
+
+
+async def _insert_athlete(repository: AthleteRepository, row: dict):
+    try:
+        athlete = await repository.create_each([row])
+    except IntegrityError as exc:
+        await repository.db.rollback()
+        return integrity_error(exc)
+    return athlete[0] or AlreadyExistsException(f"Athlete with CPF '{row['cpf']}' already exists")
+
+
+athlete_group_commit = GroupCommit(
+    insert_athletes,
+    max_batch_size=settings.GROUP_COMMIT_MAX_BATCH_SIZE,
+    max_linger=settings.GROUP_COMMIT_MAX_LINGER_MS / 1000,
+    name="athlete"
+)
+
+
+@trace_service
 class AthleteService:
     def __init__(self, db: AsyncSession):
         self.repository = AthleteRepository(db)
 
     async def create_athlete(self, athlete: AthleteCreate) -> dict:
+        if settings.ATHLETE_GROUP_COMMIT_ENABLED and current_unit_of_work(self.repository.db) is None:
+            # Batched with concurrent creates on a session of its own; the
+            # batch settles CPF conflicts, so no pre-check (or connection) here.
+            # Inside a UnitOfWork the create must join the caller's
+            # transaction instead, so it takes the path below.
+            return await athlete_group_commit.submit(athlete.model_dump())
+
         # Check if athlete with same CPF exists
         existing = await self.repository.get_by_cpf(athlete.cpf)
         if existing:
@@ -18,21 +92,78 @@ class AthleteService:
         db_athlete = await self.repository.create(**athlete.model_dump())
         return db_athlete
 
+    @coalesce("athlete.get")
     async def get_athlete(self, pk_id: int) -> dict:
         athlete = await self.repository.get_by_id(pk_id)
         if not athlete:
             raise NotFoundException(f"Athlete with id {pk_id} not found")
         return athlete
 
-    async def get_athlete_by_uuid(self, id: str) -> dict:
+    @coalesce("athlete.get_by_uuid")
+    async def get_athlete_by_uuid(self, id: uuid.UUID) -> dict:
         athlete = await self.repository.get_by_uuid(id)
         if not athlete:
             raise NotFoundException(f"Athlete with uuid {id} not found")
         return athlete
 
+    async def get_athletes_by_ids(self, ids: List[int]) -> dict:
+        ids = list(dict.fromkeys(ids))
+        athletes = await self.repository.get_many(ids)
+        found = {athlete.pk_id for athlete in athletes}
+        return {"items": athletes, "missing": [pk_id for pk_id in ids if pk_id not in found]}
+
+    async def get_athletes_by_uuids(self, ids: List[uuid.UUID]) -> dict:
+        ids = list(dict.fromkeys(ids))
+        athletes = await self.repository.get_many(ids, column="id")
+        found = {athlete.id for athlete in athletes}
+        return {"items": athletes, "missing": [id for id in ids if id not in found]}
+
+    @coalesce("athlete.get_all")
     async def get_all_athletes(self, skip: int = 0, limit: int = 100) -> List[dict]:
         return await self.repository.get_all(skip, limit)
 
+    def stream_all_athletes(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        bmi_min: Optional[float] = None,
+        bmi_max: Optional[float] = None
+    ) -> AsyncIterator:
+        return self.repository.stream_by_bmi(bmi_min, bmi_max, skip=skip, limit=limit)
+
+    async def count_athletes(
+        self,
+        mode: CountMode,
+        bmi_min: Optional[float] = None,
+        bmi_max: Optional[float] = None
+    ) -> Optional[int]:
+        return await self.repository.count_by_bmi(bmi_min, bmi_max, mode=mode)
+
+    async def get_leaderboard(
+        self,
+        partition_by: LeaderboardPartition,
+        order_by: LeaderboardOrder,
+        descending: bool = True,
+        k: int = 10
+    ) -> List[dict]:
+        rows = await self.repository.get_leaderboard(f"{partition_by}_id", order_by, descending, k)
+        return [{"rank": rank, "athlete": athlete} for rank, athlete in rows]
+
+    async def get_bmi_stats(self, training_center_id: Optional[int] = None) -> List[dict]:
+        rows = await self.repository.get_bmi_percentiles(BMI_PERCENTILES, training_center_id)
+        return [
+            {
+                "category_id": row["category_id"],
+                "athletes": row["athletes"],
+                "min": row["min"],
+                "max": row["max"],
+                "percentiles": {
+                    f"p{fraction * 100:g}": value for fraction, value in zip(BMI_PERCENTILES, row["values"])
+                },
+            }
+            for row in rows
+        ]
+
     async def update_athlete(self, pk_id: int, athlete: AthleteUpdate) -> dict:
         # Check if athlete exists
         existing = await self.repository.get_by_id(pk_id)
@@ -49,6 +180,68 @@ class AthleteService:
         updated = await self.repository.update(pk_id, **update_data)
         return updated
 
+    async def bulk_update_athletes(self, bulk: AthleteBulkUpdate) -> dict:
+        if bulk.items is not None:
+            return await self._update_each(bulk.items)
+
+        changes = bulk.changes.model_dump(exclude_unset=True)
+        if not changes:
+            raise ValidationException("changes must set at least one field")
+        if bulk.filter is not None:
+            if "cpf" in changes:
+                raise ValidationException("cpf is unique and cannot be set on more than one athlete")
+            updated = await self._write(self.repository.update_filtered(
+                changes, **bulk.filter.model_dump(exclude_none=True)
+            ))
+            return {"matched": len(updated), "updated": len(updated), "missing": []}
+
+        ids = list(dict.fromkeys(bulk.ids))
+        if "cpf" in changes:
+            if len(ids) > 1:
+                raise ValidationException("cpf is unique and cannot be set on more than one athlete")
+            await self._check_cpfs({ids[0]: changes["cpf"]})
+        updated = await self._write(self.repository.update_many(ids, **changes))
+        found = {athlete.pk_id for athlete in updated}
+        return {"matched": len(ids), "updated": len(updated), "missing": [pk_id for pk_id in ids if pk_id not in found]}
+
+    async def _update_each(self, items: List[AthleteBulkChange]) -> dict:
+        changes: Dict[int, dict] = {}
+        for item in items:
+            if item.pk_id in changes:
+                raise ValidationException(f"Athlete {item.pk_id} appears more than once")
+            change = item.model_dump(exclude_unset=True, exclude={"pk_id"})
+            if not change:
+                raise ValidationException(f"Athlete {item.pk_id} has no changes")
+            changes[item.pk_id] = change
+
+        await self._check_cpfs({pk_id: change["cpf"] for pk_id, change in changes.items() if "cpf" in change})
+        updated = await self._write(self.repository.update_each(changes))
+        found = {athlete.pk_id for athlete in updated}
+        return {"matched": len(changes), "updated": len(updated), "missing": [pk_id for pk_id in changes if pk_id not in found]}
+
+    async def _check_cpfs(self, new_cpfs: Dict[int, str]) -> None:
+        """Reject CPFs repeated in the request or held by a different athlete."""
+        seen: Dict[str, int] = {}
+        for pk_id, cpf in new_cpfs.items():
+            if cpf in seen:
+                raise AlreadyExistsException(f"CPF '{cpf}' is assigned to more than one athlete")
+            seen[cpf] = pk_id
+        owners = await self.repository.get_cpf_owners(seen)
+        for cpf, owner in owners.items():
+            if owner != seen[cpf]:
+                raise AlreadyExistsException(f"Athlete with CPF '{cpf}' already exists")
+
+    async def _write(self, write):
+        # The checks above can race with concurrent writers; the database
+        # constraints have the final word.
+        try:
+            return await write
+        except IntegrityError as exc:
+            # An enclosing UnitOfWork rolls back its own savepoint or transaction.
+            if current_unit_of_work(self.repository.db) is None:
+                await self.repository.db.rollback()
+            raise integrity_error(exc) from exc
+
     async def delete_athlete(self, pk_id: int) -> bool:
         # Check if athlete exists
         existing = await self.repository.get_by_id(pk_id)
@@ -60,8 +253,23 @@ class AthleteService:
     async def get_athletes_by_training_center(self, training_center_id: int) -> List[dict]:
         return await self.repository.get_by_training_center(training_center_id)
 
+    def stream_athletes_by_training_center(self, training_center_id: int) -> AsyncIterator:
+        return self.repository.stream_by_training_center(training_center_id)
+
+    async def count_athletes_by_training_center(self, training_center_id: int, mode: CountMode) -> Optional[int]:
+        return await self.repository.count_by_training_center(training_center_id, mode)
+
     async def get_athletes_by_category(self, category_id: int) -> List[dict]:
         return await self.repository.get_by_category(category_id)
 
+    def stream_athletes_by_category(self, category_id: int) -> AsyncIterator:
+        return self.repository.stream_by_category(category_id)
+
+    async def count_athletes_by_category(self, category_id: int, mode: CountMode) -> Optional[int]:
+        return await self.repository.count_by_category(category_id, mode)
+
     async def get_athletes_by_age_range(self, min_age: int, max_age: int) -> List[dict]:
-        return await self.repository.get_by_age_range(min_age, max_age)
\ No newline at end of file
+        return await self.repository.get_by_age_range(min_age, max_age)
+
+    async def count_athletes_by_age_range(self, min_age: int, max_age: int, mode: CountMode) -> Optional[int]:
+        return await self.repository.count_by_age_range(min_age, max_age, mode)
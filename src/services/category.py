@@ -1,10 +1,15 @@
-from typing import List
+import uuid
+from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.repositories.category import CategoryRepository
 from src.schemas.category import CategoryCreate, CategoryUpdate
+from shared.counting import CountMode
+from shared.singleflight import coalesce
+from shared.tracing import trace_service
 from src.exceptions.custom_exceptions import NotFoundException, AlreadyExistsException
 
 
+@trace_service
 class CategoryService:
     def __init__(self, db: AsyncSession):
         self.repository = CategoryRepository(db)
@@ -17,27 +22,45 @@ class CategoryService:
         db_category = await self.repository.create(**category.model_dump())
         return db_category
 
+    @coalesce("category.get")
     async def get_category(self, pk_id: int) -> dict:
         category = await self.repository.get_by_id(pk_id)
         if not category:
             raise NotFoundException(f"Category with id {pk_id} not found")
         return category
 
-    async def get_category_by_uuid(self, id: str) -> dict:
+    @coalesce("category.get_by_uuid")
+    async def get_category_by_uuid(self, id: uuid.UUID) -> dict:
         category = await self.repository.get_by_uuid(id)
         if not category:
             raise NotFoundException(f"Category with uuid {id} not found")
         return category
 
+    async def get_categories_by_ids(self, ids: List[int]) -> dict:
+        ids = list(dict.fromkeys(ids))
+        categories = await self.repository.get_many(ids)
+        found = {category.pk_id for category in categories}
+        return {"items": categories, "missing": [pk_id for pk_id in ids if pk_id not in found]}
+
+    async def get_categories_by_uuids(self, ids: List[uuid.UUID]) -> dict:
+        ids = list(dict.fromkeys(ids))
+        categories = await self.repository.get_many(ids, column="id")
+        found = {category.id for category in categories}
+        return {"items": categories, "missing": [id for id in ids if id not in found]}
+
+    @coalesce("category.get_all")
     async def get_all_categories(self, skip: int = 0, limit: int = 100) -> List[dict]:
         return await self.repository.get_all(skip, limit)
 
+    async def count_categories(self, mode: CountMode) -> Optional[int]:
+        return await self.repository.count(mode=mode)
+
     async def update_category(self, pk_id: int, category: CategoryUpdate) -> dict:
         existing = await self.repository.get_by_id(pk_id)
         if not existing:
             raise NotFoundException(f"Category with id {pk_id} not found")
 
-        if category.name and category.name != existing["name"]:
+        if category.name and category.name != existing.name:
             name_exists = await self.repository.get_by_name(category.name)
             if name_exists:
                 raise AlreadyExistsException(f"Category with name '{category.name}' already exists")
@@ -0,0 +1,100 @@
+import uuid
+from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import ValidationError
+from shared.jobs import JobContext
+from shared.tracing import trace_service
+from src.repositories.athlete import AthleteRepository
+from src.repositories.job import JobRepository
+from src.schemas.athlete import AthleteCreate
+from src.schemas.job import JobCreate
+from src.exceptions.custom_exceptions import NotFoundException, ValidationException
+
+JOB_CHUNK_SIZE = 1000
+
+
+async def recompute_roster_stats(context: JobContext) -> dict:
+    async with context.session_factory() as session:
+        groups = await AthleteRepository(session).get_roster_stats()
+    await context.report(1.0, f"Computed stats for {len(groups)} roster group(s)")
+    return {"groups": groups}
+
+
+async def reassign_athletes(context: JobContext) -> dict:
+    params = context.params
+    changes = {
+        key: params[key] for key in ("training_center_id", "category_id") if key in params
+    }
+    if not changes:
+        raise ValueError("reassign_athletes needs training_center_id and/or category_id")
+    chunk_size = int(params.get("chunk_size", JOB_CHUNK_SIZE))
+
+    async with context.session_factory() as session:
+        repository = AthleteRepository(session)
+        pk_ids = params.get("athlete_ids") or await repository.get_ids(
+            training_center_id=params.get("from_training_center_id"),
+            category_id=params.get("from_category_id")
+        )
+        total = len(pk_ids)
+        reassigned = 0
+        for start in range(0, total, chunk_size):
+            updated = await repository.update_many(pk_ids[start:start + chunk_size], **changes)
+            reassigned += len(updated)
+            await context.report((start + chunk_size) / total, f"Reassigned {reassigned} of {total} athletes")
+
+    return {"reassigned": reassigned, "total": total}
+
+
+async def import_athletes(context: JobContext) -> dict:
+    try:
+        rows = [AthleteCreate(**athlete).model_dump() for athlete in context.params.get("athletes", [])]
+    except ValidationError as exc:
+        raise ValueError(f"Invalid athlete in import: {exc}") from exc
+    chunk_size = int(context.params.get("chunk_size", JOB_CHUNK_SIZE))
+
+    total = len(rows)
+    imported = 0
+    async with context.session_factory() as session:
+        repository = AthleteRepository(session)
+        for start in range(0, total, chunk_size):
+            created = await repository.create_many(rows[start:start + chunk_size])
+            imported += len(created)
+            await context.report((start + chunk_size) / total, f"Imported {imported} of {total} athletes")
+
+    return {"imported": imported, "skipped": total - imported}
+
+
+JOB_HANDLERS = {
+    "recompute_roster_stats": recompute_roster_stats,
+    "reassign_athletes": reassign_athletes,
+    "import_athletes": import_athletes,
+}
+
+
+@trace_service
+class JobService:
+    def __init__(self, db: AsyncSession):
+        self.repository = JobRepository(db)
+
+    async def create_job(self, job: JobCreate) -> dict:
+        if job.job_type not in JOB_HANDLERS:
+            raise ValidationException(
+                f"Unknown job type '{job.job_type}'. Available: {', '.join(sorted(JOB_HANDLERS))}"
+            )
+
+        return await self.repository.create(
+            job_type=job.job_type,
+            params=job.params,
+            status="pending",
+            progress=0.0,
+            attempts=0
+        )
+
+    async def reject_job(self, job, reason: str) -> bool:
+        """Fail a job that could not be queued, unless a runner already claimed it."""
+        return await self.repository.fail_pending(job.pk_id, reason)
+
+    async def get_job(self, id: uuid.UUID) -> dict:
+        job = await self.repository.get_by_uuid(id)
+        if not job:
+            raise NotFoundException(f"Job with uuid {id} not found")
+        return job
@@ -0,0 +1,63 @@
+import asyncio
+import os
+import tempfile
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.settings import settings
+from shared.columnar import EXTENSIONS, Column, ColumnarFormat, open_writer
+from shared.metrics import metrics
+from src.repositories.athlete import AthleteRepository
+
+# Same names and order as AthleteRepository.stream_roster selects.
+ROSTER_COLUMNS = (
+    Column("pk_id", "int", nullable=False),
+    Column("id", "str", nullable=False, width=36),
+    Column("name", "str", nullable=False, width=50),
+    Column("cpf", "str", nullable=False, width=11),
+    Column("age", "int"),
+    Column("sex", "str", width=1),
+    Column("weight", "float"),
+    Column("height", "float"),
+    Column("bmi", "float"),
+    Column("training_center_id", "int"),
+    Column("training_center", "str", width=20),
+    Column("category_id", "int"),
+    Column("category", "str", width=20),
+    Column("created_at", "datetime"),
+    Column("updated_at", "datetime"),
+)
+
+
+async def export_roster(db: AsyncSession, path: str, format: ColumnarFormat, chunk_size: Optional[int] = None) -> int:
+    """Write the whole roster to ``path`` as a columnar file; returns the row count.
+
+    Rows come off a server-side cursor one chunk (a Parquet row group or an
+    Arrow record batch) at a time and are encoded off the event loop, so
+    memory stays at one chunk whatever the table size.
+    """
+    chunk_size = chunk_size or settings.ROSTER_EXPORT_CHUNK_ROWS
+    writer = await asyncio.to_thread(open_writer, format, path, ROSTER_COLUMNS)
+    rows = 0
+    try:
+        async for chunk in AthleteRepository(db).stream_roster(chunk_size):
+            columns = {column.name: [row[index] for row in chunk] for index, column in enumerate(ROSTER_COLUMNS)}
+            await asyncio.to_thread(writer.write, columns)
+            rows += len(chunk)
+    finally:
+        await asyncio.to_thread(writer.close)
+    metrics.increment(f"roster_export_{format}_rows", rows)
+    return rows
+
+
+async def export_roster_file(db: AsyncSession, format: ColumnarFormat) -> str:
+    """Export into a new temporary file and return its path; the caller deletes it."""
+    descriptor, path = tempfile.mkstemp(prefix="roster-", suffix=EXTENSIONS[format])
+    os.close(descriptor)
+    try:
+        await export_roster(db, path, format)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return path
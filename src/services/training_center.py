@@ -1,10 +1,15 @@
-from typing import List
+import uuid
+from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.repositories.training_center import TrainingCenterRepository
 from src.schemas.training_center import TrainingCenterCreate, TrainingCenterUpdate
+from shared.counting import CountMode
+from shared.singleflight import coalesce
+from shared.tracing import trace_service
 from src.exceptions.custom_exceptions import NotFoundException, AlreadyExistsException
 
 
+@trace_service
 class TrainingCenterService:
     def __init__(self, db: AsyncSession):
         self.repository = TrainingCenterRepository(db)
@@ -18,21 +23,39 @@ class TrainingCenterService:
         db_training_center = await self.repository.create(**training_center.model_dump())
         return db_training_center
 
+    @coalesce("training_center.get")
     async def get_training_center(self, pk_id: int) -> dict:
         training_center = await self.repository.get_by_id(pk_id)
         if not training_center:
             raise NotFoundException(f"Training center with id {pk_id} not found")
         return training_center
 
-    async def get_training_center_by_uuid(self, id: str) -> dict:
+    @coalesce("training_center.get_by_uuid")
+    async def get_training_center_by_uuid(self, id: uuid.UUID) -> dict:
         training_center = await self.repository.get_by_uuid(id)
         if not training_center:
             raise NotFoundException(f"Training center with uuid {id} not found")
         return training_center
 
+    async def get_training_centers_by_ids(self, ids: List[int]) -> dict:
+        ids = list(dict.fromkeys(ids))
+        training_centers = await self.repository.get_many(ids)
+        found = {training_center.pk_id for training_center in training_centers}
+        return {"items": training_centers, "missing": [pk_id for pk_id in ids if pk_id not in found]}
+
+    async def get_training_centers_by_uuids(self, ids: List[uuid.UUID]) -> dict:
+        ids = list(dict.fromkeys(ids))
+        training_centers = await self.repository.get_many(ids, column="id")
+        found = {training_center.id for training_center in training_centers}
+        return {"items": training_centers, "missing": [id for id in ids if id not in found]}
+
+    @coalesce("training_center.get_all")
     async def get_all_training_centers(self, skip: int = 0, limit: int = 100) -> List[dict]:
         return await self.repository.get_all(skip, limit)
 
+    async def count_training_centers(self, mode: CountMode) -> Optional[int]:
+        return await self.repository.count(mode=mode)
+
     async def update_training_center(self, pk_id: int, training_center: TrainingCenterUpdate) -> dict:
         # Check if training center exists
         existing = await self.repository.get_by_id(pk_id)
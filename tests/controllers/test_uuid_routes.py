@@ -0,0 +1,34 @@
+import pytest
+from unittest.mock import MagicMock
+from httpx import AsyncClient, ASGITransport
+from main import app
+from shared.database import get_db
+
+
+class TestUuidRoutes:
+    """Test suite for UUID validation on /uuid/{id} routes"""
+
+    @pytest.fixture
+    def session(self):
+        """Session stand-in that must never be used"""
+        return MagicMock()
+
+    @pytest.fixture
+    def client(self, session):
+        """Client whose requests get the stand-in session"""
+        app.dependency_overrides[get_db] = lambda: session
+        yield AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+        app.dependency_overrides.clear()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("path", [
+        "/athletes/uuid/not-a-uuid",
+        "/categories/uuid/123",
+        "/training-centers/uuid/123e4567-e89b-12d3-a456-42661417400z",
+    ])
+    async def test_malformed_uuid_is_rejected_without_touching_the_session(self, client, session, path):
+        async with client:
+            response = await client.get(path)
+
+        assert response.status_code == 422
+        assert session.mock_calls == []
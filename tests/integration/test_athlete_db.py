@@ -0,0 +1,66 @@
+import pytest
+from src.repositories.athlete import AthleteRepository
+from src.services.athlete import AthleteService
+
+
+class TestAthleteBmiOnPostgres:
+    """Generated BMI column, filters and percentiles against a real database"""
+
+    @pytest.mark.asyncio
+    async def test_bmi_filter_and_stats(self, db_session):
+        repository = AthleteRepository(db_session)
+        for cpf, weight, height in (("1", 60.0, 2.0), ("2", 80.0, 2.0), ("3", 100.0, 2.0), ("4", 70.0, None)):
+            await repository.create(name=f"Athlete {cpf}", cpf=cpf.zfill(11), weight=weight, height=height)
+        service = AthleteService(db_session)
+
+        athletes = [athlete async for athlete in service.stream_all_athletes(bmi_min=16, bmi_max=22)]
+        stats = await service.get_bmi_stats()
+
+        assert [athlete.bmi for athlete in athletes] == [20.0]
+        assert await service.count_athletes("exact", bmi_min=16) == 2
+        assert stats == [{
+            "category_id": None, "athletes": 3, "min": 15.0, "max": 25.0,
+            "percentiles": {"p5": 15.5, "p25": 17.5, "p50": 20.0, "p75": 22.5, "p95": 24.5},
+        }]
+
+
+class TestAthleteLeaderboardOnPostgres:
+    """Top-K per group against a real database"""
+
+    @pytest.mark.asyncio
+    async def test_top_k_per_category(self, db_session):
+        from src.models.category import Category
+
+        junior, senior = Category(name="Junior"), Category(name="Senior")
+        db_session.add_all([junior, senior])
+        await db_session.flush()
+        repository = AthleteRepository(db_session)
+        for cpf, category, weight in (("1", junior, 50), ("2", junior, 70), ("3", junior, 60), ("4", senior, 90)):
+            await repository.create(name=f"Athlete {cpf}", cpf=cpf.zfill(11), weight=weight, category_id=category.pk_id)
+
+        board = await AthleteService(db_session).get_leaderboard("category", "weight", descending=True, k=2)
+
+        assert [(entry["rank"], entry["athlete"].weight) for entry in board] == [(1, 70), (2, 60), (1, 90)]
+
+
+class TestAthleteCreateEachOnPostgres:
+    """CPF claims in athlete_key against a real database"""
+
+    @pytest.mark.asyncio
+    async def test_taken_cpf_is_skipped_without_failing_the_batch(self, db_session):
+        from sqlalchemy import select
+        from src.models.athlete import AthleteKey
+
+        repository = AthleteRepository(db_session)
+        taken = await repository.create(name="Taken", cpf="00000000001")
+
+        outcomes = await repository.create_each([
+            {"name": "Again", "cpf": "00000000001"},
+            {"name": "New", "cpf": "00000000002"},
+            {"name": "New twice", "cpf": "00000000002"},
+        ])
+
+        assert outcomes[0] is None and outcomes[2] is None
+        assert outcomes[1].name == "New"
+        keys = (await db_session.execute(select(AthleteKey.cpf, AthleteKey.pk_id).order_by(AthleteKey.cpf))).all()
+        assert keys == [("00000000001", taken.pk_id), ("00000000002", outcomes[1].pk_id)]
@@ -0,0 +1,102 @@
+import pytest
+from sqlalchemy import func, select
+from src.models.category import Category
+from src.schemas.category import CategoryCreate, CategoryUpdate
+from src.services.category import CategoryService
+from src.exceptions.custom_exceptions import AlreadyExistsException
+from shared.unit_of_work import UnitOfWork
+
+
+class TestCategoryServiceOnPostgres:
+    """CategoryService against a real database, rolled back after each test"""
+
+    @pytest.mark.asyncio
+    async def test_update_category_renames(self, db_session):
+        service = CategoryService(db_session)
+        created = await service.create_category(CategoryCreate(name="Juvenil"))
+
+        updated = await service.update_category(created.pk_id, CategoryUpdate(name="Junior"))
+
+        assert updated.name == "Junior"
+        assert (await service.get_category(created.pk_id)).name == "Junior"
+
+    @pytest.mark.asyncio
+    async def test_update_category_rejects_taken_name(self, db_session):
+        service = CategoryService(db_session)
+        await service.create_category(CategoryCreate(name="Master"))
+        other = await service.create_category(CategoryCreate(name="Senior"))
+
+        with pytest.raises(AlreadyExistsException):
+            await service.update_category(other.pk_id, CategoryUpdate(name="Master"))
+
+    @pytest.mark.asyncio
+    async def test_rows_do_not_leak_between_tests(self, db_session):
+        count = await db_session.scalar(select(func.count()).select_from(Category))
+
+        assert count == 0
+
+
+class TestCategoryRoutesOnPostgres:
+    """Category routes through main.app with get_db bound to the test session"""
+
+    @pytest.mark.asyncio
+    async def test_create_then_rename(self, client):
+        created = await client.post("/categories/", json={"name": "Infantil"})
+        pk_id = created.json()["pk_id"]
+
+        renamed = await client.put(f"/categories/{pk_id}", json={"name": "Mirim"})
+        fetched = await client.get(f"/categories/uuid/{created.json()['id']}")
+
+        assert created.status_code == 201
+        assert renamed.status_code == 200
+        assert fetched.json()["name"] == "Mirim"
+
+    @pytest.mark.asyncio
+    async def test_duplicate_name_is_conflict(self, client):
+        await client.post("/categories/", json={"name": "Adulto"})
+
+        duplicate = await client.post("/categories/", json={"name": "Adulto"})
+
+        assert duplicate.status_code == 409
+
+    @pytest.mark.asyncio
+    async def test_exact_and_estimated_totals(self, client):
+        for name in ("Sub-15", "Sub-17", "Sub-20"):
+            await client.post("/categories/", json={"name": name})
+
+        exact = await client.get("/categories/?count=exact&limit=1")
+        estimated = await client.get("/categories/?count=estimated&limit=1")
+
+        assert len(exact.json()) == 1
+        assert exact.headers["x-total-count"] == "3"
+        assert int(estimated.headers["x-total-count"]) >= 0
+
+
+class TestUnitOfWorkOnPostgres:
+    """UnitOfWork against a real database, rolled back after each test"""
+
+    @pytest.mark.asyncio
+    async def test_failed_unit_of_work_leaves_nothing_behind(self, db_session):
+        service = CategoryService(db_session)
+
+        with pytest.raises(AlreadyExistsException):
+            async with UnitOfWork(db_session):
+                await service.create_category(CategoryCreate(name="Sub-20"))
+                await service.create_category(CategoryCreate(name="Sub-20"))
+
+        count = await db_session.scalar(select(func.count()).select_from(Category))
+        assert count == 0
+
+    @pytest.mark.asyncio
+    async def test_nested_failure_keeps_outer_writes(self, db_session):
+        service = CategoryService(db_session)
+
+        async with UnitOfWork(db_session):
+            await service.create_category(CategoryCreate(name="Sub-17"))
+            with pytest.raises(AlreadyExistsException):
+                async with UnitOfWork(db_session):
+                    await service.create_category(CategoryCreate(name="Sub-15"))
+                    await service.create_category(CategoryCreate(name="Sub-17"))
+
+        names = set(await db_session.scalars(select(Category.name)))
+        assert names == {"Sub-17"}
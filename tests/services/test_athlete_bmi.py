@@ -0,0 +1,84 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy.dialects import postgresql
+from src.models.category import Category  # noqa: F401 - resolve Athlete relationships
+from src.models.training_center import TrainingCenter  # noqa: F401
+from src.models.athlete import Athlete
+from src.repositories.athlete import AthleteRepository
+from src.services.athlete import AthleteService
+from main import app
+from shared.database import get_db
+
+
+def compile(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+class TestBmiQueries:
+    """Test suite for BMI range filters and percentiles"""
+
+    def test_bmi_is_a_stored_generated_column(self):
+        column = Athlete.__table__.c.bmi
+
+        assert column.computed.persisted
+        assert "weight / (height * height)" in str(column.computed.sqltext)
+        assert column.index
+
+    @pytest.mark.asyncio
+    async def test_range_bounds_are_optional(self):
+        repository = AthleteRepository(AsyncMock())
+
+        both = repository._bmi_between(18.5, 25)
+        lower = repository._bmi_between(18.5, None)
+
+        assert [compile(criterion) for criterion in both] == [
+            "athlete.bmi >= %(bmi_1)s", "athlete.bmi <= %(bmi_1)s"
+        ]
+        assert len(lower) == 1
+        assert repository._bmi_between(None, None) == []
+
+    @pytest.mark.asyncio
+    async def test_percentiles_are_computed_in_sql(self):
+        db = AsyncMock()
+        db.execute.return_value = []
+        repository = AthleteRepository(db)
+
+        await repository.get_bmi_percentiles([0.5, 0.9], training_center_id=3)
+
+        sql = compile(db.execute.call_args.args[0])
+        assert "percentile_cont(%(fractions)s::FLOAT[]) WITHIN GROUP (ORDER BY athlete.bmi)" in sql
+        assert "athlete.bmi IS NOT NULL" in sql and "athlete.training_center_id = " in sql
+        assert "GROUP BY athlete.category_id" in sql
+
+    @pytest.mark.asyncio
+    async def test_stats_are_keyed_by_percentile(self):
+        service = AthleteService(AsyncMock())
+        service.repository.get_bmi_percentiles = AsyncMock(return_value=[
+            {"category_id": 1, "athletes": 3, "min": 18.0, "max": 30.0, "values": [18.2, 20.0, 22.0, 26.0, 29.5]},
+        ])
+
+        stats = await service.get_bmi_stats(training_center_id=2)
+
+        service.repository.get_bmi_percentiles.assert_called_once_with((0.05, 0.25, 0.5, 0.75, 0.95), 2)
+        assert stats == [{
+            "category_id": 1, "athletes": 3, "min": 18.0, "max": 30.0,
+            "percentiles": {"p5": 18.2, "p25": 20.0, "p50": 22.0, "p75": 26.0, "p95": 29.5},
+        }]
+
+
+class TestBmiRoutes:
+    """Test suite for the BMI filter on GET /athletes/"""
+
+    @pytest.mark.asyncio
+    async def test_inverted_range_is_rejected_without_touching_the_session(self):
+        session = MagicMock()
+        app.dependency_overrides[get_db] = lambda: session
+        try:
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+                response = await client.get("/athletes/?bmi_min=30&bmi_max=20")
+        finally:
+            app.dependency_overrides.clear()
+
+        assert response.status_code == 400
+        assert session.mock_calls == []
@@ -0,0 +1,159 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from pydantic import ValidationError
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError
+from src.models.category import Category  # noqa: F401 - resolve Athlete relationships
+from src.models.training_center import TrainingCenter  # noqa: F401
+from src.models.athlete import Athlete
+from src.repositories.athlete import AthleteRepository
+from src.schemas.athlete import AthleteBulkUpdate
+from src.services.athlete import AthleteService
+from src.exceptions.custom_exceptions import AlreadyExistsException, ValidationException
+
+
+def make_athlete(pk_id: int, **kwargs) -> Athlete:
+    return Athlete(pk_id=pk_id, name=f"Athlete {pk_id}", cpf=f"{pk_id:011d}", **kwargs)
+
+
+class UniqueViolation(Exception):
+    sqlstate = "23505"
+
+
+class TestAthleteBulkUpdateSchema:
+    """Test suite for the PATCH /athletes/bulk request shapes"""
+
+    def test_accepts_ids_filter_or_items(self):
+        AthleteBulkUpdate(changes={"category_id": 2}, ids=[1, 2])
+        AthleteBulkUpdate(changes={"category_id": 2}, filter={"training_center_id": 1})
+        AthleteBulkUpdate(items=[{"pk_id": 1, "name": "A"}])
+
+    @pytest.mark.parametrize("body", [
+        {"changes": {"category_id": 2}},
+        {"changes": {"category_id": 2}, "ids": [1], "filter": {"category_id": 1}},
+        {"changes": {"category_id": 2}, "filter": {}},
+        {"ids": [1]},
+        {"items": [{"pk_id": 1}], "ids": [1]},
+        {"items": []},
+    ])
+    def test_rejects_ambiguous_shapes(self, body):
+        with pytest.raises(ValidationError):
+            AthleteBulkUpdate(**body)
+
+
+class TestAthleteBulkUpdateService:
+    """Test suite for AthleteService.bulk_update_athletes"""
+
+    @pytest.fixture
+    def service(self):
+        service = AthleteService(AsyncMock())
+        service.repository.get_cpf_owners = AsyncMock(return_value={})
+        return service
+
+    @pytest.mark.asyncio
+    async def test_ids_reports_missing(self, service):
+        service.repository.update_many = AsyncMock(return_value=[make_athlete(1), make_athlete(3)])
+
+        result = await service.bulk_update_athletes(
+            AthleteBulkUpdate(changes={"training_center_id": 5}, ids=[1, 2, 3, 1])
+        )
+
+        service.repository.update_many.assert_called_once_with([1, 2, 3], training_center_id=5)
+        assert result == {"matched": 3, "updated": 2, "missing": [2]}
+
+    @pytest.mark.asyncio
+    async def test_filter_updates_matching_rows(self, service):
+        service.repository.update_filtered = AsyncMock(return_value=[make_athlete(1), make_athlete(2)])
+
+        result = await service.bulk_update_athletes(
+            AthleteBulkUpdate(changes={"category_id": 4}, filter={"training_center_id": 1})
+        )
+
+        service.repository.update_filtered.assert_called_once_with({"category_id": 4}, training_center_id=1)
+        assert result == {"matched": 2, "updated": 2, "missing": []}
+
+    @pytest.mark.asyncio
+    async def test_empty_changes_rejected(self, service):
+        with pytest.raises(ValidationException):
+            await service.bulk_update_athletes(AthleteBulkUpdate(changes={}, ids=[1]))
+
+    @pytest.mark.asyncio
+    async def test_shared_cpf_rejected_for_many_athletes(self, service):
+        with pytest.raises(ValidationException):
+            await service.bulk_update_athletes(AthleteBulkUpdate(changes={"cpf": "1"}, ids=[1, 2]))
+        with pytest.raises(ValidationException):
+            await service.bulk_update_athletes(
+                AthleteBulkUpdate(changes={"cpf": "1"}, filter={"category_id": 1})
+            )
+
+    @pytest.mark.asyncio
+    async def test_items_apply_their_own_changes(self, service):
+        service.repository.update_each = AsyncMock(return_value=[make_athlete(1)])
+
+        result = await service.bulk_update_athletes(AthleteBulkUpdate(items=[
+            {"pk_id": 1, "category_id": 2},
+            {"pk_id": 2, "cpf": "99999999999"},
+        ]))
+
+        service.repository.get_cpf_owners.assert_called_once_with({"99999999999": 2})
+        service.repository.update_each.assert_called_once_with({1: {"category_id": 2}, 2: {"cpf": "99999999999"}})
+        assert result == {"matched": 2, "updated": 1, "missing": [2]}
+
+    @pytest.mark.asyncio
+    async def test_items_cpf_conflicts(self, service):
+        service.repository.update_each = AsyncMock()
+        duplicate = AthleteBulkUpdate(items=[{"pk_id": 1, "cpf": "1"}, {"pk_id": 2, "cpf": "1"}])
+        with pytest.raises(AlreadyExistsException):
+            await service.bulk_update_athletes(duplicate)
+
+        service.repository.get_cpf_owners = AsyncMock(return_value={"1": 7})
+        with pytest.raises(AlreadyExistsException):
+            await service.bulk_update_athletes(AthleteBulkUpdate(items=[{"pk_id": 1, "cpf": "1"}]))
+
+        # Keeping one's own CPF is not a conflict.
+        service.repository.get_cpf_owners = AsyncMock(return_value={"1": 1})
+        await service.bulk_update_athletes(AthleteBulkUpdate(items=[{"pk_id": 1, "cpf": "1"}]))
+        service.repository.update_each.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_items_reject_repeated_or_empty_entries(self, service):
+        with pytest.raises(ValidationException):
+            await service.bulk_update_athletes(AthleteBulkUpdate(items=[{"pk_id": 1, "age": 2}, {"pk_id": 1, "age": 3}]))
+        with pytest.raises(ValidationException):
+            await service.bulk_update_athletes(AthleteBulkUpdate(items=[{"pk_id": 1}]))
+
+    @pytest.mark.asyncio
+    async def test_integrity_errors_are_mapped(self, service):
+        service.repository.update_many = AsyncMock(side_effect=IntegrityError("UPDATE", {}, UniqueViolation()))
+        with pytest.raises(AlreadyExistsException):
+            await service.bulk_update_athletes(AthleteBulkUpdate(changes={"cpf": "1"}, ids=[1]))
+
+        service.repository.update_many = AsyncMock(side_effect=IntegrityError("UPDATE", {}, Exception()))
+        with pytest.raises(ValidationException):
+            await service.bulk_update_athletes(AthleteBulkUpdate(changes={"category_id": 99}, ids=[1]))
+        service.repository.db.rollback.assert_awaited()
+
+
+class TestAthleteRepositoryUpdateEach:
+    """Test suite for per-row change sets grouped into UPDATE ... FROM (VALUES ...)"""
+
+    @pytest.mark.asyncio
+    async def test_one_statement_per_change_shape(self):
+        db = AsyncMock()
+        db.add = MagicMock()
+        db.scalars.return_value = MagicMock(all=MagicMock(return_value=[]))
+        repository = AthleteRepository(db)
+
+        await repository.update_each({
+            1: {"category_id": 2},
+            2: {"category_id": 3},
+            3: {"name": "C", "age": 30},
+        })
+
+        statements = [call.args[0] for call in db.scalars.call_args_list]
+        sql = [str(statement.compile(dialect=postgresql.dialect())) for statement in statements]
+        assert len(sql) == 2
+        assert "FROM (VALUES" in sql[0] and "SETcategory_id=changes.category_id" in sql[0].replace(" ", "")
+        assert "age=changes.age" in sql[1].replace(" ", "")
+        assert "WHEREathlete.pk_id=changes.pk_id" in sql[0].replace(" ", "")
+        db.commit.assert_awaited_once()
@@ -0,0 +1,131 @@
+import uuid
+import pytest
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError
+from config.settings import settings
+from src.models.category import Category  # noqa: F401 - resolve Athlete relationships
+from src.models.training_center import TrainingCenter  # noqa: F401
+from src.models.athlete import Athlete
+from src.repositories.athlete import AthleteRepository
+from src.schemas.athlete import AthleteCreate
+from src.services import athlete as athlete_service
+from src.services.athlete import AthleteService, insert_athletes
+from shared.unit_of_work import UnitOfWork
+from src.exceptions.custom_exceptions import AlreadyExistsException, ValidationException
+
+
+class ForeignKeyViolation(Exception):
+    sqlstate = "23503"
+
+
+def row(cpf: str) -> dict:
+    return {"name": f"Athlete {cpf}", "cpf": cpf}
+
+
+class TestAthleteGroupCommit:
+    """Test suite for batched athlete creates"""
+
+    @pytest.fixture
+    def session(self):
+        session = AsyncMock()
+
+        @asynccontextmanager
+        async def session_factory():
+            yield session
+
+        with patch.object(athlete_service, "AsyncSessionLocal", session_factory):
+            yield session
+
+    @pytest.mark.asyncio
+    async def test_batch_resolves_each_caller(self, session):
+        created = Athlete(pk_id=1, cpf="1")
+        with patch.object(AthleteRepository, "create_each", AsyncMock(return_value=[created, None])) as create_each:
+            outcomes = await insert_athletes([row("1"), row("1")])
+
+        create_each.assert_awaited_once_with([row("1"), row("1")])
+        assert outcomes[0] is created
+        assert isinstance(outcomes[1], AlreadyExistsException)
+
+    @pytest.mark.asyncio
+    async def test_integrity_error_falls_back_to_one_row_at_a_time(self, session):
+        first = Athlete(pk_id=1, cpf="1")
+        create_each = AsyncMock(side_effect=[
+            IntegrityError("INSERT", {}, ForeignKeyViolation()),
+            [first],
+            IntegrityError("INSERT", {}, ForeignKeyViolation()),
+        ])
+        with patch.object(AthleteRepository, "create_each", create_each):
+            outcomes = await insert_athletes([row("1"), row("2")])
+
+        assert outcomes[0] is first
+        assert isinstance(outcomes[1], ValidationException)
+        assert session.rollback.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_service_submits_when_enabled(self):
+        service = AthleteService(AsyncMock())
+        service.repository.get_by_cpf = AsyncMock()
+        submit = AsyncMock(return_value="created")
+
+        with patch.multiple(settings, ATHLETE_GROUP_COMMIT_ENABLED=True), \
+                patch.object(athlete_service.athlete_group_commit, "submit", submit):
+            result = await service.create_athlete(AthleteCreate(name="Ana", cpf="12345678901"))
+
+        assert result == "created"
+        submit.assert_awaited_once()
+        assert submit.call_args.args[0]["cpf"] == "12345678901"
+        service.repository.get_by_cpf.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_unit_of_work_keeps_create_in_its_transaction(self):
+        db = AsyncMock()
+        db.add = MagicMock()
+        service = AthleteService(db)
+        service.repository.get_by_cpf = AsyncMock(return_value=None)
+        service.repository.create = AsyncMock(return_value="created in unit of work")
+        submit = AsyncMock()
+
+        with patch.multiple(settings, ATHLETE_GROUP_COMMIT_ENABLED=True), \
+                patch.object(athlete_service.athlete_group_commit, "submit", submit):
+            async with UnitOfWork(db):
+                result = await service.create_athlete(AthleteCreate(name="Ana", cpf="12345678901"))
+
+        assert result == "created in unit of work"
+        submit.assert_not_called()
+
+
+class TestCreateEach:
+    """Test suite for per-row outcomes of the multi-row insert"""
+
+    @pytest.mark.asyncio
+    async def test_taken_and_repeated_cpfs_get_none(self):
+        db = AsyncMock()
+        db.add = MagicMock()
+        key = uuid.uuid4()
+        fresh = Athlete(pk_id=5, cpf="2")
+        # CPF "1" is already claimed in athlete_key, so only "2" comes back.
+        db.execute.return_value = MagicMock(all=MagicMock(return_value=[("2", 5, key)]))
+        db.scalars.return_value = MagicMock(all=MagicMock(return_value=[fresh]))
+        repository = AthleteRepository(db)
+
+        outcomes = await repository.create_each([row("1"), row("2"), row("2")])
+
+        assert outcomes == [None, fresh, None]
+        claim, claimed_rows = db.execute.call_args.args
+        assert "ON CONFLICT DO NOTHING" in str(claim.compile(dialect=postgresql.dialect()))
+        assert [claimed["cpf"] for claimed in claimed_rows] == ["1", "2"]
+        assert db.scalars.call_args.args[1] == [{**row("2"), "pk_id": 5, "id": key}]
+        db.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_nothing_claimed_inserts_nothing(self):
+        db = AsyncMock()
+        db.execute.return_value = MagicMock(all=MagicMock(return_value=[]))
+
+        outcomes = await AthleteRepository(db).create_each([row("1")])
+
+        assert outcomes == [None]
+        db.scalars.assert_not_called()
+        db.commit.assert_not_called()
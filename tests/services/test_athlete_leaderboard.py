@@ -0,0 +1,89 @@
+import uuid
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy.dialects import postgresql
+from src.models.category import Category  # noqa: F401 - resolve Athlete relationships
+from src.models.training_center import TrainingCenter  # noqa: F401
+from src.models.athlete import Athlete
+from src.repositories.athlete import AthleteRepository
+from src.services.athlete import AthleteService
+from main import app
+from shared.database import get_db
+
+
+class TestLeaderboardQuery:
+    """Test suite for top-K per group with ROW_NUMBER()"""
+
+    async def compiled(self, **kwargs) -> str:
+        db = AsyncMock()
+        db.execute.return_value = MagicMock(all=MagicMock(return_value=[]))
+        await AthleteRepository(db).get_leaderboard(**kwargs)
+        return str(db.execute.call_args.args[0].compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        ))
+
+    @pytest.mark.asyncio
+    async def test_descending_board_per_category(self):
+        sql = await self.compiled(group="category_id", column="weight", descending=True, k=3)
+
+        assert (
+            "row_number() OVER (PARTITION BY athlete.category_id "
+            "ORDER BY athlete.weight DESC, athlete.pk_id DESC) AS rank"
+        ) in sql
+        assert "athlete.category_id IS NOT NULL AND athlete.weight IS NOT NULL" in sql
+        assert "anon_1.rank <= 3" in sql
+        assert sql.rstrip().endswith("ORDER BY anon_1.category_id, anon_1.rank")
+
+    @pytest.mark.asyncio
+    async def test_ascending_board_per_training_center(self):
+        sql = await self.compiled(group="training_center_id", column="age", descending=False, k=1)
+
+        assert "PARTITION BY athlete.training_center_id ORDER BY athlete.age, athlete.pk_id)" in sql
+
+    def test_every_board_has_a_matching_index(self):
+        indexes = {tuple(column.name for column in index.columns) for index in Athlete.__table__.indexes}
+
+        for group in ("category_id", "training_center_id"):
+            for column in ("weight", "age", "bmi"):
+                assert (group, column, "pk_id") in indexes
+
+
+class TestLeaderboardRoute:
+    """Test suite for GET /athletes/leaderboard"""
+
+    @pytest.fixture
+    def client(self):
+        app.dependency_overrides[get_db] = lambda: MagicMock()
+        yield AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+        app.dependency_overrides.clear()
+
+    @pytest.mark.asyncio
+    async def test_returns_ranked_athletes(self, client):
+        athlete = Athlete(
+            pk_id=7, id=uuid.UUID("123e4767-e89b-12d3-a456-426614174000"),
+            name="Ana", cpf="12345678901", weight=61.5, category_id=2
+        )
+        leaderboard = AsyncMock(return_value=[{"rank": 1, "athlete": athlete}])
+
+        with patch.object(AthleteService, "get_leaderboard", leaderboard):
+            async with client:
+                response = await client.get("/athletes/leaderboard?partition_by=category&order_by=weight&order=asc&k=5")
+
+        assert response.status_code == 200
+        assert response.json()[0]["rank"] == 1
+        assert response.json()[0]["athlete"]["pk_id"] == 7
+        leaderboard.assert_called_once_with("category", "weight", False, 5)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("query", [
+        "partition_by=sex&order_by=weight",
+        "partition_by=category&order_by=name",
+        "partition_by=category&order_by=age&k=0",
+        "partition_by=category&order_by=age&k=101",
+    ])
+    async def test_invalid_boards_are_rejected(self, client, query):
+        async with client:
+            response = await client.get(f"/athletes/leaderboard?{query}")
+
+        assert response.status_code == 422
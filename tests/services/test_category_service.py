@@ -1,5 +1,7 @@
+import uuid
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
+from src.models.category import Category
 from src.services.category import CategoryService
 from src.schemas.category import CategoryCreate, CategoryUpdate
 from src.exceptions.custom_exceptions import NotFoundException, AlreadyExistsException
@@ -20,12 +22,12 @@ class TestCategoryService:
 
     @pytest.fixture
     def sample_category_data(self):
-        """Sample category data for testing"""
-        return {
-            "id": 1,
-            "uuid": "123e4767-e89b-12d3-a456-426614174000",
-            "name": "Test Category"
-        }
+        """Sample category as the repository returns it: an ORM object, not a dict"""
+        return Category(
+            pk_id=1,
+            id=uuid.UUID("123e4767-e89b-12d3-a456-426614174000"),
+            name="Test Category"
+        )
 
     @pytest.fixture
     def sample_category_create(self):
@@ -98,36 +100,36 @@ class TestCategoryService:
     async def test_get_category_by_uuid_success(self, category_service, sample_category_data):
         """Test successful category retrieval by UUID"""
         # Mock repository method
-        uuid = "123e4567-e89b-12d3-a456-426614174000"
+        category_uuid = uuid.UUID("123e4567-e89b-12d3-a456-426614174000")
         category_service.repository.get_by_uuid = AsyncMock(return_value=sample_category_data)
 
         # Execute
-        result = await category_service.get_category_by_uuid(uuid)
+        result = await category_service.get_category_by_uuid(category_uuid)
 
         # Assertions
-        category_service.repository.get_by_uuid.assert_called_once_with(uuid)
+        category_service.repository.get_by_uuid.assert_called_once_with(category_uuid)
         assert result == sample_category_data
 
     @pytest.mark.asyncio
     async def test_get_category_by_uuid_not_found(self, category_service):
         """Test category retrieval by UUID when not found"""
         # Mock repository method
-        uuid = "non-existent-uuid"
+        category_uuid = uuid.UUID("123e4567-e89b-12d3-a456-426614174999")
         category_service.repository.get_by_uuid = AsyncMock(return_value=None)
 
         # Execute and assert exception
         with pytest.raises(NotFoundException) as exc_info:
-            await category_service.get_category_by_uuid(uuid)
+            await category_service.get_category_by_uuid(category_uuid)
 
-        assert f"Category with uuid {uuid} not found" in str(exc_info.value)
-        category_service.repository.get_by_uuid.assert_called_once_with(uuid)
+        assert f"Category with uuid {category_uuid} not found" in str(exc_info.value)
+        category_service.repository.get_by_uuid.assert_called_once_with(category_uuid)
 
     # Test get_all_categories method
     @pytest.mark.asyncio
     async def test_get_all_categories_success(self, category_service, sample_category_data):
         """Test successful retrieval of all categories"""
         # Mock repository method
-        categories_list = [sample_category_data, {**sample_category_data, "id": 2}]
+        categories_list = [sample_category_data, Category(pk_id=2, id=uuid.uuid4(), name="Other Category")]
         category_service.repository.get_all = AsyncMock(return_value=categories_list)
 
         # Execute with custom skip and limit
@@ -151,6 +153,38 @@ class TestCategoryService:
         category_service.repository.get_all.assert_called_once_with(0, 100)
         assert result == []
 
+    # Test batch lookups
+    @pytest.mark.asyncio
+    async def test_get_categories_by_ids_preserves_order_and_reports_missing(self, category_service):
+        """Test batch retrieval by primary keys"""
+        # Mock repository method returning rows in request order
+        first = MagicMock(pk_id=3)
+        second = MagicMock(pk_id=1)
+        category_service.repository.get_many = AsyncMock(return_value=[first, second])
+
+        # Execute with a duplicate and a missing id
+        result = await category_service.get_categories_by_ids([3, 2, 1, 3])
+
+        # Assertions
+        category_service.repository.get_many.assert_called_once_with([3, 2, 1])
+        assert result == {"items": [first, second], "missing": [2]}
+
+    @pytest.mark.asyncio
+    async def test_get_categories_by_uuids(self, category_service):
+        """Test batch retrieval by UUIDs"""
+        # Mock repository method
+        found_uuid = uuid.UUID("123e4567-e89b-12d3-a456-426614174000")
+        missing_uuid = uuid.UUID("123e4567-e89b-12d3-a456-426614174001")
+        found = MagicMock(id=found_uuid)
+        category_service.repository.get_many = AsyncMock(return_value=[found])
+
+        # Execute
+        result = await category_service.get_categories_by_uuids([found_uuid, missing_uuid])
+
+        # Assertions
+        category_service.repository.get_many.assert_called_once_with([found_uuid, missing_uuid], column="id")
+        assert result == {"items": [found], "missing": [missing_uuid]}
+
     # Test update_category method
     @pytest.mark.asyncio
     async def test_update_category_success(self, category_service, sample_category_data, sample_category_update):
@@ -158,7 +192,7 @@ class TestCategoryService:
         # Mock repository methods
         category_service.repository.get_by_id = AsyncMock(return_value=sample_category_data)
         category_service.repository.get_by_name = AsyncMock(return_value=None)
-        updated_data = {**sample_category_data, "name": sample_category_update.name}
+        updated_data = Category(pk_id=1, id=sample_category_data.id, name=sample_category_update.name)
         category_service.repository.update = AsyncMock(return_value=updated_data)
 
         # Execute
@@ -188,7 +222,7 @@ class TestCategoryService:
         """Test category update when new name already exists"""
         # Mock repository methods
         category_service.repository.get_by_id = AsyncMock(return_value=sample_category_data)
-        existing_with_new_name = {**sample_category_data, "id": 2, "name": sample_category_update.name}
+        existing_with_new_name = Category(pk_id=2, id=uuid.uuid4(), name=sample_category_update.name)
         category_service.repository.get_by_name = AsyncMock(return_value=existing_with_new_name)
 
         # Execute and assert exception
@@ -204,7 +238,7 @@ class TestCategoryService:
         """Test category update with same name (should not check for name existence)"""
         # Mock repository methods
         category_service.repository.get_by_id = AsyncMock(return_value=sample_category_data)
-        update_data = CategoryUpdate(name=sample_category_data["name"])
+        update_data = CategoryUpdate(name=sample_category_data.name)
         category_service.repository.update = AsyncMock(return_value=sample_category_data)
 
         # Execute
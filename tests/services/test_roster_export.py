@@ -0,0 +1,170 @@
+import os
+import tempfile
+import zipfile
+from datetime import datetime, timezone
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from httpx import AsyncClient, ASGITransport
+from src.models.category import Category  # noqa: F401 - resolve Athlete relationships
+from src.models.training_center import TrainingCenter  # noqa: F401
+from src.repositories.athlete import AthleteRepository
+from src.services import roster_export
+from src.services.roster_export import ROSTER_COLUMNS, export_roster, export_roster_file
+from main import app
+from shared.database import get_db
+
+CREATED = datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+ROWS = [
+    (1, "0190f5d2-0000-7000-8000-000000000001", "Ana", "12345678901", 25, "F", 60.0, 1.65, 22.04,
+     3, "Center", 7, "Elite", CREATED, CREATED),
+    (2, "0190f5d2-0000-7000-8000-000000000002", "Bruno", "12345678902", None, None, None, None, None,
+     None, None, None, None, CREATED, None),
+]
+
+
+def streaming_db(chunks) -> AsyncMock:
+    async def partitions(size):
+        for chunk in chunks:
+            yield chunk
+
+    db = AsyncMock()
+    db.stream.return_value = MagicMock(partitions=partitions)
+    return db
+
+
+class FakeWriter:
+    def __init__(self):
+        self.chunks = []
+        self.closed = False
+
+    def write(self, chunk):
+        self.chunks.append(chunk)
+
+    def close(self):
+        self.closed = True
+
+
+class TestRosterExport:
+    """Test suite for the columnar roster export"""
+
+    @pytest.mark.asyncio
+    async def test_columns_follow_the_select(self):
+        db = streaming_db([])
+
+        async for _ in AthleteRepository(db).stream_roster(10):
+            pass
+
+        statement = db.stream.call_args.args[0]
+        assert [column.name for column in statement.selected_columns] == [column.name for column in ROSTER_COLUMNS]
+        assert statement.get_execution_options()["yield_per"] == 10
+
+    @pytest.mark.asyncio
+    async def test_writes_one_columnar_chunk_per_partition(self):
+        writer = FakeWriter()
+        db = streaming_db([ROWS[:1], ROWS[1:]])
+
+        with patch.object(roster_export, "open_writer", return_value=writer) as open_writer:
+            rows = await export_roster(db, "/tmp/roster.npz", "npz", chunk_size=1)
+
+        assert rows == 2
+        assert open_writer.call_args.args == ("npz", "/tmp/roster.npz", ROSTER_COLUMNS)
+        assert [chunk["name"] for chunk in writer.chunks] == [["Ana"], ["Bruno"]]
+        assert writer.chunks[1]["category"] == [None]
+        assert writer.closed
+
+    @pytest.mark.asyncio
+    async def test_failed_export_removes_the_file(self):
+        db = streaming_db([])
+        db.stream.side_effect = RuntimeError("connection lost")
+        created = []
+        real_mkstemp = tempfile.mkstemp
+
+        def mkstemp(**kwargs):
+            descriptor, path = real_mkstemp(**kwargs)
+            created.append(path)
+            return descriptor, path
+
+        with patch.object(roster_export, "open_writer", return_value=FakeWriter()), \
+                patch.object(roster_export.tempfile, "mkstemp", side_effect=mkstemp):
+            with pytest.raises(RuntimeError):
+                await export_roster_file(db, "npz")
+
+        assert created[0].endswith(".npz")
+        assert not os.path.exists(created[0])
+
+
+class TestRosterWriters:
+    """Test suite for the Parquet, Arrow and npz writers"""
+
+    def write(self, format: str, path: str) -> None:
+        writer = roster_export.open_writer(format, path, ROSTER_COLUMNS)
+        for row in ROWS:
+            writer.write({column.name: [row[i]] for i, column in enumerate(ROSTER_COLUMNS)})
+        writer.close()
+
+    def test_npz_round_trip(self, tmp_path):
+        numpy = pytest.importorskip("numpy")
+        path = str(tmp_path / "roster.npz")
+
+        self.write("npz", path)
+
+        with numpy.load(path) as roster:
+            assert roster["pk_id"].tolist() == [1, 2]
+            assert roster["name"].tolist() == ["Ana", "Bruno"]
+            assert numpy.isnan(roster["age"][1])
+            assert numpy.isnat(roster["updated_at"][1])
+        with zipfile.ZipFile(path) as archive:
+            assert len(archive.namelist()) == len(ROSTER_COLUMNS)
+
+    @pytest.mark.parametrize("format", ["parquet", "arrow"])
+    def test_arrow_round_trip(self, format, tmp_path):
+        pyarrow = pytest.importorskip("pyarrow")
+        import pyarrow.ipc
+        import pyarrow.parquet
+        path = str(tmp_path / f"roster.{format}")
+
+        self.write(format, path)
+
+        if format == "parquet":
+            table = pyarrow.parquet.read_table(path)
+            assert pyarrow.parquet.ParquetFile(path).num_row_groups == 2
+        else:
+            table = pyarrow.ipc.open_file(path).read_all()
+        assert table.column("name").to_pylist() == ["Ana", "Bruno"]
+        assert table.column("category").to_pylist() == ["Elite", None]
+
+
+class TestRosterExportRoute:
+    """Test suite for GET /athletes/export"""
+
+    @pytest.fixture(autouse=True)
+    def override_db(self):
+        app.dependency_overrides[get_db] = lambda: AsyncMock()
+        yield
+        app.dependency_overrides.clear()
+
+    @pytest.mark.asyncio
+    async def test_downloads_the_file_and_removes_it(self, tmp_path):
+        path = tmp_path / "roster.npz"
+        path.write_bytes(b"columns")
+
+        with patch("src.controllers.athlete.available_formats", return_value=["npz"]), \
+                patch("src.controllers.athlete.export_roster_file", AsyncMock(return_value=str(path))):
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+                response = await client.get("/athletes/export", params={"format": "npz"})
+
+        assert response.status_code == 200
+        assert response.content == b"columns"
+        assert 'filename="roster.npz"' in response.headers["content-disposition"]
+        assert not path.exists()
+
+    @pytest.mark.asyncio
+    async def test_unavailable_format_is_rejected(self):
+        with patch("src.controllers.athlete.available_formats", return_value=["npz"]):
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+                response = await client.get("/athletes/export", params={"format": "parquet"})
+                unknown = await client.get("/athletes/export", params={"format": "csv"})
+
+        assert response.status_code == 422
+        assert "npz" in response.json()["detail"]
+        assert unknown.status_code == 422
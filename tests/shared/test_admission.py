@@ -0,0 +1,122 @@
+import asyncio
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient, ASGITransport
+from unittest.mock import patch
+from config.settings import settings
+from shared.admission import AdmissionControlMiddleware, ConcurrencyLimiter, pool_limits
+from shared.database import connection_budget
+
+
+class TestPoolLimits:
+    """Test suite for splitting the pool budget between reads and writes"""
+
+    def test_limits_never_exceed_pool_capacity(self):
+        limits = pool_limits(capacity=15, write_share=0.3, queue_factor=2)
+
+        assert limits["read"][0] + limits["write"][0] == 15
+        assert limits["write"] == (4, 8)
+        assert limits["read"] == (11, 22)
+
+    def test_tiny_pool_keeps_one_slot_per_class(self):
+        limits = pool_limits(capacity=1, write_share=0.3, queue_factor=0)
+
+        assert limits["read"][0] == 1
+        assert limits["write"][0] == 1
+
+
+class TestConnectionBudget:
+    """Test suite for the capacity admission control is sized from"""
+
+    def test_pooled_engine_uses_pool_size_and_overflow(self):
+        with patch.multiple(settings, DB_POOL_SIZE=5, DB_MAX_OVERFLOW=10):
+            assert connection_budget(transaction_pooling=False) == 15
+
+    def test_pgbouncer_mode_uses_pgbouncer_share(self):
+        with patch.multiple(settings, DB_POOL_SIZE=5, DB_MAX_OVERFLOW=10, PGBOUNCER_POOL_SIZE=30):
+            assert connection_budget(transaction_pooling=True) == 30
+
+
+class TestConcurrencyLimiter:
+    """Test suite for the bounded admission queue"""
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_queue_is_full(self):
+        limiter = ConcurrencyLimiter("test_full", limit=1, max_queue=0, queue_timeout=1)
+
+        assert await limiter.acquire() is True
+        assert await limiter.acquire() is False
+        limiter.release()
+        assert await limiter.acquire() is True
+
+    @pytest.mark.asyncio
+    async def test_waiter_times_out(self):
+        limiter = ConcurrencyLimiter("test_timeout", limit=1, max_queue=1, queue_timeout=0.01)
+        await limiter.acquire()
+
+        assert await limiter.acquire() is False
+        assert limiter.waiting == 0
+        assert limiter.rejection_rate() == 0.5
+
+    @pytest.mark.asyncio
+    async def test_waiter_is_admitted_on_release(self):
+        limiter = ConcurrencyLimiter("test_release", limit=1, max_queue=1, queue_timeout=1)
+        await limiter.acquire()
+
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        assert limiter.waiting == 1
+        limiter.release()
+
+        assert await waiter is True
+        assert limiter.active == 1
+
+
+class TestAdmissionControlMiddleware:
+    """Test suite for load shedding at the HTTP layer"""
+
+    @pytest.fixture
+    def app(self):
+        """App with a slow route behind a one-slot admission limit"""
+        app = FastAPI()
+        release = asyncio.Event()
+        app.state.release = release
+
+        @app.get("/slow")
+        async def slow():
+            await release.wait()
+            return {"ok": True}
+
+        @app.get("/health")
+        async def health():
+            return {"status": "healthy"}
+
+        app.add_middleware(
+            AdmissionControlMiddleware,
+            capacity=2, write_share=0.5, queue_factor=0, retry_after=3
+        )
+        return app
+
+    @pytest.mark.asyncio
+    async def test_overflow_gets_503_with_retry_after(self, app):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            first = asyncio.create_task(client.get("/slow"))
+            await asyncio.sleep(0.05)
+
+            rejected = await client.get("/slow")
+            health = await client.get("/health")
+            app.state.release.set()
+            admitted = await first
+
+        assert rejected.status_code == 503
+        assert rejected.headers["retry-after"] == "3"
+        assert health.status_code == 200
+        assert admitted.status_code == 200
+
+    def test_read_only_post_routes_use_read_budget(self, app):
+        middleware = AdmissionControlMiddleware(app, capacity=4)
+
+        assert middleware.route_class({"method": "POST", "path": "/athletes/batch/uuid"}) == "read"
+        assert middleware.route_class({"method": "GET", "path": "/athletes/"}) == "read"
+        assert middleware.route_class({"method": "POST", "path": "/athletes/"}) == "write"
+        assert middleware.route_class({"method": "PUT", "path": "/athletes/batch/uuid"}) == "write"
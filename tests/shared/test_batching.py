@@ -0,0 +1,139 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from sqlalchemy.dialects import postgresql
+from shared.batching import map_batches
+from shared.unit_of_work import UnitOfWork
+from src.models.category import Category
+from src.repositories.category import CategoryRepository
+
+
+async def batches_of(*batches):
+    for batch in batches:
+        yield batch
+
+
+class TestIterBatches:
+    """Test suite for keyset batches on BaseRepository"""
+
+    @pytest.fixture
+    def session(self):
+        session = AsyncMock()
+        session.expunge = MagicMock()
+        session.__contains__ = MagicMock(return_value=True)
+        session.in_transaction = MagicMock(return_value=True)
+        return session
+
+    def returns(self, session, *batches):
+        session.scalars.side_effect = [MagicMock(all=MagicMock(return_value=batch)) for batch in batches]
+
+    @pytest.mark.asyncio
+    async def test_walks_by_pk_id_and_expunges(self, session):
+        first = [Category(pk_id=1, name="a"), Category(pk_id=4, name="b")]
+        second = [Category(pk_id=9, name="c")]
+        self.returns(session, first, second)
+
+        seen, expunged = [], []
+        async for batch in CategoryRepository(session).iter_batches(Category.name != "x", batch_size=2):
+            seen.append([category.pk_id for category in batch])
+            expunged.append(session.expunge.call_count)
+
+        statements = [
+            str(call.args[0].compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+            for call in session.scalars.call_args_list
+        ]
+        assert seen == [[1, 4], [9]]
+        # A batch stays attached while the caller works on it.
+        assert expunged == [0, 2]
+        assert "OFFSET" not in statements[0] and "pk_id >" not in statements[0]
+        assert "category.pk_id > 4" in statements[1]
+        assert "ORDER BY category.pk_id" in statements[1] and "LIMIT 2" in statements[1]
+        assert session.expunge.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_full_last_batch_checks_for_more(self, session):
+        self.returns(session, [Category(pk_id=1, name="a")], [])
+
+        batches = [batch async for batch in CategoryRepository(session).iter_batches(batch_size=1)]
+
+        assert len(batches) == 1
+        assert session.scalars.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_stopping_early_still_expunges(self, session):
+        self.returns(session, [Category(pk_id=1, name="a")])
+
+        batches = CategoryRepository(session).iter_batches(batch_size=1)
+        await batches.__anext__()
+        await batches.aclose()
+
+        session.expunge.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_transaction_ends_between_batches(self, session):
+        self.returns(session, [Category(pk_id=1, name="a")], [Category(pk_id=2, name="b")], [])
+
+        commits = []
+        async for _ in CategoryRepository(session).iter_batches(batch_size=1):
+            commits.append(session.commit.await_count)
+
+        # Committed after the caller is done with each batch, never during.
+        assert commits == [0, 1]
+        assert session.commit.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_unit_of_work_keeps_its_transaction(self, session):
+        self.returns(session, [Category(pk_id=1, name="a")])
+
+        async with UnitOfWork(session):
+            batches = [batch async for batch in CategoryRepository(session).iter_batches(batch_size=2)]
+            assert session.commit.await_count == 0
+
+        assert len(batches) == 1
+
+
+class TestMapBatches:
+    """Test suite for bounded-concurrency batch processing"""
+
+    @pytest.mark.asyncio
+    async def test_results_in_order_with_bounded_concurrency(self):
+        running, peak = 0, 0
+
+        async def process(batch):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01 * (3 - batch[0] % 3))
+            running -= 1
+            return sum(batch)
+
+        results = [result async for result in map_batches(batches_of(*([n] for n in range(7))), process, concurrency=3)]
+
+        assert results == list(range(7))
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_failure_cancels_the_rest(self):
+        cancelled = []
+
+        async def process(batch):
+            if batch == [1]:
+                raise RuntimeError("boom")
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.append(batch)
+                raise
+
+        async def consume():
+            return [result async for result in map_batches(batches_of([1], [2], [3]), process, concurrency=3)]
+
+        with pytest.raises(RuntimeError):
+            await consume()
+
+        assert cancelled == [[2], [3]]
+
+    @pytest.mark.asyncio
+    async def test_rejects_zero_concurrency(self):
+        with pytest.raises(ValueError):
+            await map_batches(batches_of(), AsyncMock(), concurrency=0).__anext__()
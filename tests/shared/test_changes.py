@@ -0,0 +1,251 @@
+import asyncio
+import json
+import pytest
+from httpx import AsyncClient, ASGITransport
+from fastapi import FastAPI
+from shared.changes import RESET, ChangeEvent, ChangeFeed, ChangeFilter, Subscription, sse_stream
+from src.controllers.changes import router as changes_router
+
+
+def make_event(id: int, resource: str = "athlete", event: str = "updated", pk_id: int = 1, training_center_id=None):
+    return ChangeEvent(id=id, resource=resource, event=event, pk_id=pk_id, training_center_id=training_center_id)
+
+
+class FakeConnection:
+    """asyncpg connection stand-in that can deliver notifications and be dropped"""
+
+    def __init__(self, backlog=(), oldest=None):
+        self.listeners = {}
+        self.oldest = oldest
+        self.termination_listeners = []
+        self.backlog = list(backlog)
+        self.fetches = []
+        self.closed = False
+
+    async def add_listener(self, channel, callback):
+        self.listeners[channel] = callback
+
+    def add_termination_listener(self, callback):
+        self.termination_listeners.append(callback)
+
+    async def fetchval(self, query):
+        return self.oldest
+
+    async def close(self):
+        self.closed = True
+
+    async def fetch(self, query, last_event_id, limit):
+        self.fetches.append(last_event_id)
+        return [row for row in self.backlog if row["id"] > last_event_id][:limit]
+
+    def notify(self, channel, payload: dict):
+        self.listeners[channel](self, 1234, channel, json.dumps(payload))
+
+    def drop(self):
+        self.closed = True
+        for callback in self.termination_listeners:
+            callback(self)
+
+    def is_closed(self):
+        return self.closed
+
+    def terminate(self):
+        self.closed = True
+
+
+class TestChangeFilter:
+    """Test suite for change feed filters"""
+
+    def test_resource_and_training_center(self):
+        filter = ChangeFilter(frozenset({"athlete", "training_center"}), training_center_id=3)
+
+        assert filter.matches(make_event(1, training_center_id=3))
+        assert not filter.matches(make_event(2, training_center_id=4))
+        assert filter.matches(make_event(3, resource="training_center", pk_id=3))
+        assert not filter.matches(make_event(4, resource="category"))
+
+    def test_empty_filter_matches_everything(self):
+        assert ChangeFilter().matches(make_event(1, resource="category"))
+
+
+class TestChangeFeed:
+    """Test suite for fan-out, resumption and reconnection"""
+
+    @pytest.mark.asyncio
+    async def test_fan_out_to_matching_subscribers(self):
+        feed = ChangeFeed("postgresql://unused")
+        athletes, _ = feed.subscribe(ChangeFilter(frozenset({"athlete"})))
+        everything, _ = feed.subscribe(ChangeFilter())
+
+        feed.publish(make_event(1))
+        feed.publish(make_event(2, resource="category"))
+
+        assert [event.id for event in athletes.pending] == [1]
+        assert [event.id for event in everything.pending] == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_resume_replays_missed_events_in_arrival_order(self):
+        feed = ChangeFeed("postgresql://unused")
+        # Transactions commit out of id order.
+        for id in (10, 12, 11, 13):
+            feed.publish(make_event(id))
+
+        _, replay = feed.subscribe(ChangeFilter(), last_event_id=12)
+        _, unknown = feed.subscribe(ChangeFilter(), last_event_id=5)
+        _, fresh = feed.subscribe(ChangeFilter())
+
+        assert [event.id for event in replay] == [11, 13]
+        assert [event.id for event in unknown] == [10, 12, 11, 13]
+        assert fresh == []
+
+    @pytest.mark.asyncio
+    async def test_history_is_bounded_and_deduplicated(self):
+        feed = ChangeFeed("postgresql://unused", history_size=2)
+        for id in (1, 2, 2, 3):
+            feed.publish(make_event(id))
+
+        _, replay = feed.subscribe(ChangeFilter(), last_event_id=0)
+
+        assert [event.id for event in replay] == [2, 3]
+
+    @pytest.mark.asyncio
+    async def test_slow_subscriber_is_dropped(self):
+        feed = ChangeFeed("postgresql://unused", max_pending=2)
+        slow, _ = feed.subscribe(ChangeFilter())
+
+        for id in range(1, 4):
+            feed.publish(make_event(id))
+
+        assert slow.closed
+        assert feed.subscribers == 0
+        assert [event.id for event in slow.pending] == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_listens_and_backfills_after_reconnect(self):
+        first, second = FakeConnection(), FakeConnection(backlog=[
+            {"id": 2, "resource": "athlete", "event": "created", "pk_id": 7, "uuid": None, "training_center_id": 1},
+        ])
+        connections = iter([first, second])
+
+        async def connect(dsn):
+            return next(connections)
+
+        feed = ChangeFeed("postgresql://unused", reconnect_delay=0.01, connect=connect)
+        subscription, _ = feed.subscribe(ChangeFilter())
+        await feed.start()
+        try:
+            await asyncio.wait_for(feed.connected.wait(), 1)
+            first.notify("resource_changes", {"id": 1, "resource": "athlete", "event": "created", "pk_id": 6})
+            first.drop()
+            await asyncio.sleep(0.05)
+            await asyncio.wait_for(feed.connected.wait(), 1)
+        finally:
+            await feed.stop()
+
+        assert first.fetches == []
+        assert second.fetches == [1]
+        assert [event.id for event in subscription.pending] == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_resume_behind_history_reads_back_from_the_outbox(self):
+        backlog = [
+            {"id": id, "resource": "athlete", "event": "updated", "pk_id": 1, "uuid": None, "training_center_id": None}
+            for id in (4, 5, 6)
+        ]
+        connection = FakeConnection(backlog=backlog, oldest=2)
+
+        async def connect(dsn):
+            return connection
+
+        feed = ChangeFeed("postgresql://unused", connect=connect)
+        feed.publish(make_event(6))
+
+        _, replay, resumed = await feed.resume(ChangeFilter(), last_event_id=3)
+        _, in_history, _ = await feed.resume(ChangeFilter(), last_event_id=6)
+
+        assert resumed
+        assert [event.id for event in replay] == [4, 5, 6]
+        assert in_history == []
+        assert connection.fetches == [3]
+        assert connection.closed
+
+    @pytest.mark.asyncio
+    async def test_resume_past_the_retention_window_is_a_reset(self):
+        async def connect(dsn):
+            return FakeConnection(oldest=50)
+
+        feed = ChangeFeed("postgresql://unused", connect=connect)
+        feed.publish(make_event(60))
+
+        subscription, replay, resumed = await feed.resume(ChangeFilter(), last_event_id=10)
+        stream = sse_stream(feed, subscription, replay, heartbeat=0.01, reset=not resumed)
+
+        assert not resumed
+        assert await stream.__anext__() == RESET
+        assert (await stream.__anext__()).startswith(b"id: 60\n")
+        await stream.aclose()
+
+
+class TestSseStream:
+    """Test suite for the /changes/stream endpoint"""
+
+    @pytest.mark.asyncio
+    async def test_stream_replays_then_heartbeats_and_ends_when_closed(self):
+        feed = ChangeFeed("postgresql://unused")
+        feed.publish(make_event(1))
+        subscription, replay = feed.subscribe(ChangeFilter(), last_event_id=0)
+        stream = sse_stream(feed, subscription, replay, heartbeat=0.01)
+
+        first = await stream.__anext__()
+        heartbeat = await stream.__anext__()
+        feed.publish(make_event(2, event="deleted"))
+        second = await stream.__anext__()
+        subscription.close()
+        rest = [chunk async for chunk in stream]
+
+        assert first.startswith(b"id: 1\nevent: athlete.updated\ndata: {")
+        assert heartbeat == b": keep-alive\n\n"
+        assert second.startswith(b"id: 2\nevent: athlete.deleted\n")
+        assert rest == []
+        assert feed.subscribers == 0
+
+    @pytest.mark.asyncio
+    async def test_endpoint_resumes_from_last_event_id(self):
+        feed = ChangeFeed("postgresql://unused")
+        for id, center in ((1, 3), (2, 4), (3, 3)):
+            feed.publish(make_event(id, training_center_id=center))
+        app = FastAPI()
+        app.include_router(changes_router)
+        app.state.change_feed = feed
+        # Close each subscription as soon as it is registered, so the
+        # response ends after the replay.
+        subscribe = feed.subscribe
+
+        def subscribe_and_close(*args):
+            subscription, replay = subscribe(*args)
+            subscription.close()
+            return subscription, replay
+
+        feed.subscribe = subscribe_and_close
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.get(
+                "/changes/stream?resource=athlete&training_center_id=3",
+                headers={"Last-Event-ID": "1"}
+            )
+            invalid = await client.get("/changes/stream?resource=user")
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert [line for line in response.text.splitlines() if line.startswith("id:")] == ["id: 3"]
+        assert invalid.status_code == 422
+
+
+class TestSubscription:
+    """Test suite for per-client buffering"""
+
+    @pytest.mark.asyncio
+    async def test_next_times_out_when_idle(self):
+        subscription = Subscription(ChangeFilter(), max_pending=10)
+
+        assert await subscription.next(0.01) is None
+        assert not subscription.closed
@@ -0,0 +1,159 @@
+import asyncio
+import gzip
+import json
+import zlib
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from httpx import AsyncClient, ASGITransport
+from shared.compression import CompressionMiddleware, negotiate_encoding
+from shared.streaming import stream_json_array
+from src.schemas.category import CategoryCreate
+
+
+class TestNegotiateEncoding:
+    """Test suite for Accept-Encoding negotiation"""
+
+    def test_picks_first_supported_by_server_preference(self):
+        assert negotiate_encoding("gzip, br, zstd", ["zstd", "br", "gzip"]) == "zstd"
+
+    def test_respects_quality_values(self):
+        assert negotiate_encoding("zstd;q=0.1, gzip;q=0.8", ["zstd", "gzip"]) == "gzip"
+
+    def test_quality_among_other_parameters(self):
+        assert negotiate_encoding("gzip;level=1;q=0.5", ["gzip"]) == "gzip"
+        assert negotiate_encoding("gzip; q=0.5 ;level=1, zstd;q=0.2", ["zstd", "gzip"]) == "gzip"
+
+    def test_refused_or_missing_encodings(self):
+        assert negotiate_encoding("gzip;q=0", ["gzip"]) is None
+        assert negotiate_encoding("", ["gzip"]) is None
+        assert negotiate_encoding("*", ["gzip"]) == "gzip"
+
+
+class TestCompressionMiddleware:
+    """Test suite for response compression"""
+
+    @pytest.fixture
+    def app(self):
+        """App with small, large and streamed JSON routes"""
+        app = FastAPI()
+
+        @app.get("/small")
+        async def small():
+            return {"ok": True}
+
+        @app.get("/large")
+        async def large():
+            return [{"name": f"athlete {i}"} for i in range(500)]
+
+        @app.get("/stream")
+        async def stream():
+            async def rows():
+                for i in range(2000):
+                    yield {"name": f"category {i}"}
+
+            async def body():
+                async for chunk in stream_json_array(rows(), CategoryCreate, chunk_size=4096):
+                    yield chunk
+
+            return StreamingResponse(body(), media_type="application/json")
+
+        @app.get("/events")
+        async def events():
+            async def body():
+                for i in range(100):
+                    yield f"id: {i}\ndata: {'x' * 50}\n\n".encode()
+
+            return StreamingResponse(body(), media_type="text/event-stream")
+
+        app.add_middleware(CompressionMiddleware, minimum_size=1024)
+        return app
+
+    @pytest.mark.asyncio
+    async def test_small_body_is_not_compressed(self, app):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.get("/small", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in response.headers
+        assert response.json() == {"ok": True}
+
+    @pytest.mark.asyncio
+    async def test_large_body_is_gzipped(self, app):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert "accept-encoding" in response.headers["vary"].lower()
+        assert len(response.json()) == 500
+
+    @pytest.mark.asyncio
+    async def test_no_accept_encoding_means_identity(self, app):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.get("/large", headers={"Accept-Encoding": "identity"})
+
+        assert "content-encoding" not in response.headers
+
+    @pytest.mark.asyncio
+    async def test_event_stream_is_never_buffered(self, app):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.get("/events", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in response.headers
+        assert response.text.count("id: ") == 100
+
+    @pytest.mark.asyncio
+    async def test_streamed_body_is_compressed_incrementally(self, app):
+        sent = []
+        requested = asyncio.Event()
+        disconnected = asyncio.Event()
+
+        async def receive():
+            # Deliver the request once, then block like a client that stays connected.
+            if not requested.is_set():
+                requested.set()
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": "/stream",
+            "raw_path": b"/stream",
+            "root_path": "",
+            "query_string": b"",
+            "headers": [(b"accept-encoding", b"gzip")],
+            "server": ("test", 80),
+            "client": ("test", 1234),
+        }
+        await app(scope, receive, send)
+
+        start = sent[0]
+        chunks = [message["body"] for message in sent[1:] if message["body"]]
+        assert (b"content-encoding", b"gzip") in start["headers"]
+        assert len(chunks) > 1
+        # Every flushed chunk is decodable as soon as it arrives.
+        decoder = zlib.decompressobj(zlib.MAX_WBITS | 16)
+        assert decoder.decompress(chunks[0]).startswith(b'[{"name":"category 0"}')
+        rows = json.loads(gzip.decompress(b"".join(chunks)))
+        assert len(rows) == 2000
+
+
+class TestStreamJsonArray:
+    """Test suite for incremental JSON array encoding"""
+
+    @pytest.mark.asyncio
+    async def test_empty_stream_is_empty_array(self):
+        async def rows():
+            return
+            yield
+
+        chunks = [chunk async for chunk in stream_json_array(rows(), CategoryCreate)]
+
+        assert b"".join(chunks) == b"[]"
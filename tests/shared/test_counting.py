@@ -0,0 +1,129 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import select
+from main import app
+from shared import counting
+from shared.counting import CountCache, total_count
+from shared.database import get_db
+from src.models.athlete import Athlete
+
+
+class TestTotalCount:
+    """Test suite for exact, estimated and skipped totals"""
+
+    @pytest.fixture(autouse=True)
+    def cache(self):
+        """Fresh exact-count cache"""
+        cache = CountCache(ttl=30.0)
+        with patch.object(counting, "count_cache", cache):
+            yield cache
+
+    @pytest.fixture
+    def db(self):
+        """Session whose statements are recorded"""
+        db = AsyncMock()
+        db.scalar = AsyncMock(return_value=42)
+        return db
+
+    @pytest.mark.asyncio
+    async def test_none_runs_no_query(self, db):
+        assert await total_count(db, select(Athlete.pk_id), "athlete", "none") is None
+        assert db.mock_calls == []
+
+    @pytest.mark.asyncio
+    async def test_exact_is_cached_per_filter(self, db, cache):
+        by_center = select(Athlete.pk_id).where(Athlete.training_center_id == 1)
+
+        first = await counting.exact_count(db, by_center, cache)
+        second = await counting.exact_count(db, by_center, cache)
+        await counting.exact_count(db, select(Athlete.pk_id).where(Athlete.training_center_id == 2), cache)
+
+        assert first == second == 42
+        assert db.scalar.await_count == 2
+        assert "count(*)" in str(db.scalar.await_args_list[0].args[0])
+
+    @pytest.mark.asyncio
+    async def test_exact_cache_expires(self, db, cache):
+        query = select(Athlete.pk_id)
+        with patch("shared.counting.time.monotonic", return_value=100.0):
+            await counting.exact_count(db, query, cache)
+        with patch("shared.counting.time.monotonic", return_value=131.0):
+            await counting.exact_count(db, query, cache)
+
+        assert db.scalar.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_unfiltered_estimate_reads_reltuples(self, db):
+        db.scalar = AsyncMock(return_value=1_000_000)
+
+        total = await total_count(db, select(Athlete.pk_id), "athlete", "estimated")
+
+        assert total == 1_000_000
+        statement, params = db.scalar.await_args.args
+        assert "pg_class" in str(statement)
+        assert params == {"table": "athlete"}
+        db.execute.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_filtered_estimate_uses_planner_rows(self, db):
+        result = MagicMock()
+        result.scalar_one.return_value = [{"Plan": {"Node Type": "Index Scan", "Plan Rows": 1234}}]
+        db.execute = AsyncMock(return_value=result)
+
+        total = await total_count(
+            db, select(Athlete.pk_id).where(Athlete.category_id == 7), "athlete", "estimated"
+        )
+
+        assert total == 1234
+        explain = str(db.execute.await_args.args[0])
+        assert explain.startswith("EXPLAIN (FORMAT JSON)")
+        assert "athlete.category_id = 7" in explain
+        db.scalar.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_never_analyzed_table_falls_back_to_planner(self, db):
+        db.scalar = AsyncMock(return_value=None)
+        result = MagicMock()
+        result.scalar_one.return_value = '[{"Plan": {"Plan Rows": 50}}]'
+        db.execute = AsyncMock(return_value=result)
+
+        assert await total_count(db, select(Athlete.pk_id), "athlete", "estimated") == 50
+
+    def test_cache_evicts_oldest(self):
+        cache = CountCache(ttl=30.0, max_entries=2)
+        for key in ("a", "b", "c"):
+            cache.set(key, 1)
+
+        assert cache.get("a") is None
+        assert cache.get("c") == 1
+
+
+class TestTotalCountHeader:
+    """Test suite for X-Total-Count on list routes"""
+
+    @pytest.fixture
+    def client(self):
+        """Client whose requests get a stand-in session"""
+        app.dependency_overrides[get_db] = lambda: AsyncMock()
+        yield AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+        app.dependency_overrides.clear()
+
+    @pytest.mark.asyncio
+    async def test_header_only_when_requested(self, client):
+        with patch("src.services.category.CategoryService.count_categories", AsyncMock(side_effect=[None, 12])) as count, \
+                patch("src.services.category.CategoryService.get_all_categories", AsyncMock(return_value=[])):
+            async with client:
+                plain = await client.get("/categories/")
+                counted = await client.get("/categories/?count=estimated")
+
+        assert "x-total-count" not in plain.headers
+        assert counted.headers["x-total-count"] == "12"
+        assert [call.args[-1] for call in count.await_args_list] == ["none", "estimated"]
+
+    @pytest.mark.asyncio
+    async def test_unknown_mode_is_rejected(self, client):
+        async with client:
+            response = await client.get("/athletes/?count=approximate")
+
+        assert response.status_code == 422
@@ -0,0 +1,55 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from fastapi import Depends, FastAPI
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy.ext.asyncio import AsyncSession
+from shared.database import get_db
+
+
+class TestGetDb:
+    """Test suite for the request session dependency"""
+
+    @pytest.fixture
+    def mock_session(self):
+        """Mock AsyncSession handed out by the session factory"""
+        session = AsyncMock(spec=AsyncSession)
+        session.__aenter__.return_value = session
+        return session
+
+    @pytest.mark.asyncio
+    async def test_function_scope_releases_session_before_response(self, mock_session):
+        """With scope="function" the session is closed as soon as the handler returns"""
+        app = FastAPI()
+        closed_at_response_start = []
+
+        @app.get("/probe")
+        async def probe(db: AsyncSession = Depends(get_db, scope="function")):
+            return {"closed": mock_session.close.await_count}
+
+        async def recording_app(scope, receive, send):
+            async def recording_send(message):
+                if message["type"] == "http.response.start":
+                    closed_at_response_start.append(mock_session.close.await_count)
+                await send(message)
+
+            await app(scope, receive, recording_send)
+
+        with patch("shared.database.AsyncSessionLocal", MagicMock(return_value=mock_session)):
+            async with AsyncClient(transport=ASGITransport(app=recording_app), base_url="http://test") as client:
+                response = await client.get("/probe")
+
+        assert response.json() == {"closed": 0}
+        assert closed_at_response_start and closed_at_response_start[0] >= 1
+
+    @pytest.mark.asyncio
+    async def test_rolls_back_when_handler_raises(self, mock_session):
+        """An exception inside the request rolls the session back"""
+        with patch("shared.database.AsyncSessionLocal", MagicMock(return_value=mock_session)):
+            dependency = get_db()
+            session = await dependency.__anext__()
+            with pytest.raises(RuntimeError):
+                await dependency.athrow(RuntimeError("boom"))
+
+        assert session is mock_session
+        mock_session.rollback.assert_awaited_once()
+        mock_session.close.assert_awaited()
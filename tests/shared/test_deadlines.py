@@ -0,0 +1,146 @@
+import asyncio
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.responses import StreamingResponse
+from httpx import AsyncClient, ASGITransport
+from unittest.mock import MagicMock, patch
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+from config.settings import settings
+from shared import deadlines
+from shared.deadlines import DeadlineRoute, enforce_statement_timeouts, remaining
+from shared.metrics import metrics
+
+
+class QueryCanceled(Exception):
+    sqlstate = "57014"
+
+
+def make_app() -> tuple[FastAPI, dict]:
+    seen = {}
+    router = APIRouter(route_class=DeadlineRoute)
+
+    @router.get("/slow")
+    async def slow():
+        await asyncio.sleep(1)
+
+    @router.get("/fast")
+    async def fast():
+        seen["remaining"] = remaining()
+        return {"ok": True}
+
+    @router.get("/canceled")
+    async def canceled():
+        raise DBAPIError("SELECT", {}, QueryCanceled())
+
+    @router.get("/upstream-timeout")
+    async def upstream_timeout():
+        raise TimeoutError("upstream")
+
+    @router.get("/broken")
+    async def broken():
+        raise DBAPIError("SELECT", {}, Exception())
+
+    @router.get("/stream")
+    async def stream():
+        async def body():
+            seen["streamed_remaining"] = remaining()
+            yield b"[]"
+
+        return StreamingResponse(body())
+
+    app = FastAPI()
+    app.include_router(router)
+    return app, seen
+
+
+class TestDeadlineRoute:
+    """Test suite for per-route time budgets"""
+
+    @pytest.mark.asyncio
+    async def test_slow_request_is_cut_off_with_504(self):
+        app, _ = make_app()
+        before = metrics.counter("deadline_slow_exceeded")
+
+        with patch.multiple(settings, ROUTE_DEADLINES={"GET /slow": 0.01}):
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+                response = await client.get("/slow")
+
+        assert response.status_code == 504
+        assert metrics.counter("deadline_slow_exceeded") == before + 1
+
+    @pytest.mark.asyncio
+    async def test_budget_is_visible_and_cleared(self):
+        app, seen = make_app()
+
+        with patch.multiple(settings, REQUEST_DEADLINE_SECONDS=5.0, ROUTE_DEADLINES={}):
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+                response = await client.get("/fast")
+                streamed = await client.get("/stream")
+
+        assert response.status_code == 200
+        assert 4 < seen["remaining"] <= 5
+        assert streamed.status_code == 200
+        assert 4 < seen["streamed_remaining"] <= 5
+        assert remaining() is None
+
+    @pytest.mark.asyncio
+    async def test_postgres_statement_timeout_is_504(self):
+        app, _ = make_app()
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            canceled = await client.get("/canceled")
+            with pytest.raises(DBAPIError):
+                await client.get("/broken")
+
+        assert canceled.status_code == 504
+
+    @pytest.mark.asyncio
+    async def test_other_timeouts_are_not_deadline_504s(self):
+        app, _ = make_app()
+        before = metrics.counter("deadline_exceeded")
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            with pytest.raises(TimeoutError):
+                await client.get("/upstream-timeout")
+
+        assert metrics.counter("deadline_exceeded") == before
+
+    @pytest.mark.asyncio
+    async def test_disabled(self):
+        app, _ = make_app()
+
+        with patch.multiple(settings, REQUEST_DEADLINES_ENABLED=False, ROUTE_DEADLINES={"GET /slow": 0.01}):
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+                response = await client.get("/slow")
+
+        assert response.status_code == 200
+
+
+class TestStatementTimeouts:
+    """Test suite for the per-transaction statement_timeout"""
+
+    class TimedSession(Session):
+        pass
+
+    enforce_statement_timeouts(TimedSession)
+
+    @pytest.mark.asyncio
+    async def test_transaction_gets_remaining_budget(self):
+        session, connection = self.TimedSession(), MagicMock()
+        token = deadlines._deadline.set(asyncio.get_running_loop().time() + 2)
+        try:
+            session.dispatch.after_begin(session, MagicMock(), connection)
+        finally:
+            deadlines._deadline.reset(token)
+
+        statement = connection.exec_driver_sql.call_args.args[0]
+        assert statement.startswith("SET LOCAL statement_timeout = ")
+        assert 1900 < int(statement.rsplit(" ", 1)[1]) <= 2000
+
+    def test_no_deadline_leaves_server_default(self):
+        session, connection = self.TimedSession(), MagicMock()
+
+        session.dispatch.after_begin(session, MagicMock(), connection)
+
+        connection.exec_driver_sql.assert_not_called()
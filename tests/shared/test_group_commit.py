@@ -0,0 +1,100 @@
+import asyncio
+import pytest
+from shared.group_commit import GroupCommit
+from shared.tracing import _current_span
+
+
+class Recorder:
+    """write() stand-in that records batches and echoes items back"""
+
+    def __init__(self, fail_on=None):
+        self.batches = []
+        self.fail_on = fail_on
+        self.spans = []
+
+    async def __call__(self, items):
+        self.batches.append(list(items))
+        self.spans.append(_current_span.get())
+        await asyncio.sleep(0)
+        return [ValueError(item) if item == self.fail_on else item * 10 for item in items]
+
+
+class TestGroupCommit:
+    """Test suite for batching concurrent writes"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_submissions_share_a_batch(self):
+        write = Recorder()
+        group = GroupCommit(write, max_batch_size=100, max_linger=0.01)
+
+        results = await asyncio.gather(*(group.submit(n) for n in range(5)))
+
+        assert results == [0, 10, 20, 30, 40]
+        assert write.batches == [[0, 1, 2, 3, 4]]
+
+    @pytest.mark.asyncio
+    async def test_full_batch_goes_out_without_lingering(self):
+        write = Recorder()
+        group = GroupCommit(write, max_batch_size=2, max_linger=60)
+
+        results = await asyncio.wait_for(asyncio.gather(*(group.submit(n) for n in range(4))), 1)
+
+        assert results == [0, 10, 20, 30]
+        assert write.batches == [[0, 1], [2, 3]]
+
+    @pytest.mark.asyncio
+    async def test_item_errors_reach_only_their_caller(self):
+        group = GroupCommit(Recorder(fail_on=1), max_linger=0.001)
+
+        results = await asyncio.gather(group.submit(0), group.submit(1), group.submit(2), return_exceptions=True)
+
+        assert results[0] == 0 and results[2] == 20
+        assert isinstance(results[1], ValueError)
+
+    @pytest.mark.asyncio
+    async def test_write_failure_reaches_every_caller(self):
+        async def write(items):
+            raise RuntimeError("database down")
+
+        group = GroupCommit(write, max_linger=0.001)
+
+        results = await asyncio.gather(group.submit(0), group.submit(1), return_exceptions=True)
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_break_the_batch(self):
+        write = Recorder()
+        group = GroupCommit(write, max_linger=0.01)
+
+        gone = asyncio.create_task(group.submit(1))
+        stays = asyncio.create_task(group.submit(2))
+        await asyncio.sleep(0)
+        gone.cancel()
+
+        assert await stays == 20
+        assert write.batches == [[1, 2]]
+
+    @pytest.mark.asyncio
+    async def test_batch_runs_outside_the_callers_context(self):
+        write = Recorder()
+        group = GroupCommit(write, max_linger=0.001)
+        token = _current_span.set(object())
+        try:
+            await group.submit(1)
+        finally:
+            _current_span.reset(token)
+
+        assert write.spans == [None]
+
+    @pytest.mark.asyncio
+    async def test_close_writes_what_is_waiting(self):
+        write = Recorder()
+        group = GroupCommit(write, max_linger=60)
+
+        waiting = asyncio.create_task(group.submit(3))
+        await asyncio.sleep(0)
+        await group.close()
+
+        assert await waiting == 30
+        assert group.pending == 0
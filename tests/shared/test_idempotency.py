@@ -0,0 +1,223 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+from shared.idempotency import (
+    IdempotencyManager,
+    InMemoryIdempotencyStore,
+    StoredResponse,
+    REPLAYED_HEADER
+)
+from src.schemas.category import CategoryCreate, CategoryResponse
+from src.exceptions.custom_exceptions import ValidationException, AlreadyExistsException
+
+
+class TestInMemoryIdempotencyStore:
+    """Test suite for the in-memory LRU result store"""
+
+    @pytest.fixture
+    def stored_response(self):
+        """Stored response used across store tests"""
+        return StoredResponse("hash", 201, b"{}")
+
+    @pytest.mark.asyncio
+    async def test_get_returns_stored_response(self, stored_response):
+        store = InMemoryIdempotencyStore()
+
+        await store.set("key", stored_response, ttl=60)
+
+        assert await store.get("key") == stored_response
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_dropped(self, stored_response):
+        store = InMemoryIdempotencyStore()
+
+        with patch("shared.idempotency.time.monotonic", return_value=100.0):
+            await store.set("key", stored_response, ttl=10)
+        with patch("shared.idempotency.time.monotonic", return_value=111.0):
+            assert await store.get("key") is None
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_entry_is_evicted(self, stored_response):
+        store = InMemoryIdempotencyStore(max_entries=2)
+
+        await store.set("first", stored_response, ttl=60)
+        await store.set("second", stored_response, ttl=60)
+        await store.get("first")
+        await store.set("third", stored_response, ttl=60)
+
+        assert await store.get("first") == stored_response
+        assert await store.get("second") is None
+        assert await store.get("third") == stored_response
+
+
+class TestIdempotencyManager:
+    """Test suite for Idempotency-Key handling on create routes"""
+
+    @pytest.fixture
+    def manager(self):
+        """Manager backed by an in-memory store"""
+        return IdempotencyManager(InMemoryIdempotencyStore(), ttl=60)
+
+    @pytest.fixture
+    def payload(self):
+        """Create payload sent by the client"""
+        return CategoryCreate(name="Sub-20")
+
+    @pytest.fixture
+    def created(self):
+        """Object returned by the service on creation"""
+        return {
+            "pk_id": 1,
+            "id": "123e4567-e89b-12d3-a456-426614174000",
+            "name": "Sub-20"
+        }
+
+    @pytest.mark.asyncio
+    async def test_without_key_calls_handler_directly(self, manager, payload, created):
+        handler = AsyncMock(return_value=created)
+
+        result = await manager.run(None, "POST /categories/", payload, CategoryResponse, handler)
+
+        assert result == created
+        handler.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_retry_replays_first_response(self, manager, payload, created):
+        handler = AsyncMock(return_value=created)
+
+        first = await manager.run("abc", "POST /categories/", payload, CategoryResponse, handler, 201)
+        retry = await manager.run("abc", "POST /categories/", payload, CategoryResponse, handler, 201)
+
+        handler.assert_awaited_once()
+        assert retry.status_code == 201
+        assert retry.body == first.body
+        assert retry.headers[REPLAYED_HEADER] == "true"
+        assert REPLAYED_HEADER not in first.headers
+
+    @pytest.mark.asyncio
+    async def test_key_reused_with_different_payload(self, manager, payload, created):
+        handler = AsyncMock(return_value=created)
+        await manager.run("abc", "POST /categories/", payload, CategoryResponse, handler)
+
+        with pytest.raises(ValidationException):
+            await manager.run("abc", "POST /categories/", CategoryCreate(name="Other"), CategoryResponse, handler)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_duplicates_share_in_flight_call(self, manager, payload, created):
+        release = asyncio.Event()
+        calls = 0
+
+        async def handler():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return created
+
+        tasks = [
+            asyncio.create_task(manager.run("abc", "POST /categories/", payload, CategoryResponse, handler, 201))
+            for _ in range(5)
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        responses = await asyncio.gather(*tasks)
+
+        assert calls == 1
+        assert len({response.body for response in responses}) == 1
+
+    @pytest.mark.asyncio
+    async def test_failure_is_not_stored(self, manager, payload, created):
+        handler = AsyncMock(side_effect=[AlreadyExistsException("exists"), created])
+
+        with pytest.raises(AlreadyExistsException):
+            await manager.run("abc", "POST /categories/", payload, CategoryResponse, handler)
+        response = await manager.run("abc", "POST /categories/", payload, CategoryResponse, handler)
+
+        assert handler.await_count == 2
+        assert REPLAYED_HEADER not in response.headers
+
+    @pytest.mark.asyncio
+    async def test_duplicate_in_another_worker_waits_for_claimed_result(self, payload, created):
+        store = InMemoryIdempotencyStore()
+        first_worker = IdempotencyManager(store, ttl=60, poll_interval=0.01)
+        second_worker = IdempotencyManager(store, ttl=60, poll_interval=0.01)
+        release = asyncio.Event()
+        calls = 0
+
+        async def handler():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return created
+
+        leader = asyncio.create_task(
+            first_worker.run("abc", "POST /categories/", payload, CategoryResponse, handler, 201)
+        )
+        await asyncio.sleep(0)
+        duplicate = asyncio.create_task(
+            second_worker.run("abc", "POST /categories/", payload, CategoryResponse, handler, 201)
+        )
+        await asyncio.sleep(0.03)
+        release.set()
+        first, second = await asyncio.gather(leader, duplicate)
+
+        assert calls == 1
+        assert second.body == first.body
+        assert second.headers[REPLAYED_HEADER] == "true"
+
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_is_taken_over_by_waiter(self, manager, payload, created):
+        leader_started = asyncio.Event()
+        calls = 0
+
+        async def handler():
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                leader_started.set()
+                await asyncio.Event().wait()
+            return created
+
+        leader = asyncio.create_task(manager.run("abc", "POST /categories/", payload, CategoryResponse, handler, 201))
+        await leader_started.wait()
+        waiter = asyncio.create_task(manager.run("abc", "POST /categories/", payload, CategoryResponse, handler, 201))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        response = await waiter
+
+        assert leader.cancelled()
+        assert calls == 2
+        assert response.status_code == 201
+        assert await manager.store.get("POST /categories/:abc") is not None
+
+
+class TestInMemoryIdempotencyClaims:
+    """Test suite for claiming keys before the handler runs"""
+
+    @pytest.mark.asyncio
+    async def test_only_one_claim_wins(self):
+        store = InMemoryIdempotencyStore()
+
+        assert await store.claim("key", "hash", lease=30) is True
+        assert await store.claim("key", "hash", lease=30) is False
+        assert (await store.get("key")).pending
+
+    @pytest.mark.asyncio
+    async def test_released_or_expired_claim_can_be_taken(self):
+        store = InMemoryIdempotencyStore()
+
+        await store.claim("key", "hash", lease=30)
+        await store.release("key")
+        assert await store.claim("key", "hash", lease=30) is True
+
+        with patch("shared.idempotency.time.monotonic", return_value=10**9):
+            assert await store.claim("key", "hash", lease=30) is True
+
+    @pytest.mark.asyncio
+    async def test_release_keeps_completed_response(self):
+        store = InMemoryIdempotencyStore()
+        await store.set("key", StoredResponse("hash", 201, b"{}"), ttl=60)
+
+        await store.release("key")
+
+        assert await store.get("key") == StoredResponse("hash", 201, b"{}")
@@ -0,0 +1,31 @@
+import time
+import uuid
+from shared.identifiers import uuid7, uuid7_timestamp_ms
+
+
+class TestUuid7:
+    """Test suite for time-ordered UUID generation"""
+
+    def test_version_and_variant(self):
+        value = uuid7()
+
+        assert value.version == 7
+        assert value.variant == uuid.RFC_4122
+
+    def test_embeds_current_time(self):
+        before = time.time_ns() // 1_000_000
+        value = uuid7()
+        after = time.time_ns() // 1_000_000
+
+        assert before <= uuid7_timestamp_ms(value) <= after + 1
+
+    def test_values_are_strictly_increasing(self):
+        values = [uuid7() for _ in range(20000)]
+
+        assert values == sorted(values)
+        assert len(set(values)) == len(values)
+
+    def test_parses_like_any_uuid(self):
+        value = uuid7()
+
+        assert uuid.UUID(str(value)) == value
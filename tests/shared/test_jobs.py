@@ -0,0 +1,130 @@
+import uuid
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from shared.jobs import JobRunner
+
+
+class TestJobRunner:
+    """Test suite for the background job runner"""
+
+    @pytest.fixture
+    def job(self):
+        """Pending job row"""
+        return SimpleNamespace(pk_id=1, id=uuid.uuid4(), job_type="echo", status="pending", params={"value": 3}, attempts=0)
+
+    @pytest.fixture
+    def repository(self, job):
+        """Mocked JobRepository"""
+        repository = MagicMock()
+        repository.claim = AsyncMock(side_effect=lambda *args: self.claimed(job))
+        repository.update = AsyncMock()
+        repository.finish = AsyncMock(return_value=True)
+        repository.get_claimable = AsyncMock(return_value=[])
+        return repository
+
+    @staticmethod
+    def claimed(job):
+        if job.status not in ("pending", "running"):
+            return None
+        job.status = "running"
+        job.attempts += 1
+        return job
+
+    @pytest.fixture
+    def session_factory(self):
+        """Session factory yielding a mocked session"""
+        session = AsyncMock()
+        session.__aenter__.return_value = session
+        return MagicMock(return_value=session)
+
+    def make_runner(self, session_factory, handlers, **kwargs):
+        return JobRunner(handlers, session_factory=session_factory, **kwargs)
+
+    @pytest.mark.asyncio
+    async def test_run_job_success(self, session_factory, repository, job):
+        async def echo(context):
+            await context.report(0.5, "halfway")
+            return {"value": context.params["value"]}
+
+        runner = self.make_runner(session_factory, {"echo": echo})
+        with patch("shared.jobs.JobRepository", return_value=repository):
+            await runner.run_job(job.id)
+
+        repository.claim.assert_awaited_once()
+        assert repository.claim.call_args.args[:2] == (job.id, runner.owner)
+        repository.update.assert_awaited_once_with(1, progress=0.5, message="halfway")
+        final = repository.finish.call_args
+        assert final.args == (1, runner.owner)
+        assert final.kwargs["status"] == "succeeded"
+        assert final.kwargs["result"] == {"value": 3}
+
+    @pytest.mark.asyncio
+    async def test_run_job_failure_is_recorded(self, session_factory, repository, job):
+        async def broken(context):
+            raise RuntimeError("boom")
+
+        runner = self.make_runner(session_factory, {"echo": broken})
+        with patch("shared.jobs.JobRepository", return_value=repository):
+            await runner.run_job(job.id)
+
+        final = repository.finish.call_args.kwargs
+        assert final["status"] == "failed"
+        assert final["error"] == "boom"
+
+    @pytest.mark.asyncio
+    async def test_run_job_gives_up_after_max_attempts(self, session_factory, repository, job):
+        job.status = "running"
+        job.attempts = 3
+        handler = AsyncMock()
+
+        runner = self.make_runner(session_factory, {"echo": handler}, max_attempts=3)
+        with patch("shared.jobs.JobRepository", return_value=repository):
+            await runner.run_job(job.id)
+
+        handler.assert_not_called()
+        assert repository.finish.call_args.kwargs["status"] == "failed"
+
+    @pytest.mark.asyncio
+    async def test_finished_job_is_not_rerun(self, session_factory, repository, job):
+        job.status = "succeeded"
+        handler = AsyncMock()
+
+        runner = self.make_runner(session_factory, {"echo": handler})
+        with patch("shared.jobs.JobRepository", return_value=repository):
+            await runner.run_job(job.id)
+
+        handler.assert_not_called()
+        repository.finish.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_job_claimed_elsewhere_is_not_run(self, session_factory, repository, job):
+        repository.claim = AsyncMock(return_value=None)
+        handler = AsyncMock()
+
+        runner = self.make_runner(session_factory, {"echo": handler})
+        with patch("shared.jobs.JobRepository", return_value=repository):
+            await runner.run_job(job.id)
+
+        handler.assert_not_called()
+        repository.finish.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_enqueue_claimable_skips_jobs_already_queued(self, session_factory, repository):
+        queued, fresh = uuid.uuid4(), uuid.uuid4()
+        repository.get_claimable = AsyncMock(return_value=[queued, fresh])
+
+        runner = self.make_runner(session_factory, {}, queue_size=5)
+        runner.submit(queued)
+        with patch("shared.jobs.JobRepository", return_value=repository):
+            submitted = await runner.enqueue_claimable()
+
+        assert submitted == 1
+        assert runner._queue.qsize() == 2
+
+    def test_submit_rejects_when_queue_is_full(self, session_factory):
+        runner = self.make_runner(session_factory, {}, queue_size=1)
+
+        assert runner.submit(uuid.uuid4()) is True
+        assert runner.is_full is True
+        assert runner.submit(uuid.uuid4()) is False
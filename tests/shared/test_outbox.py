@@ -0,0 +1,178 @@
+import uuid
+import pytest
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from sqlalchemy.dialects import postgresql
+from shared.outbox import InMemoryBroker, OutboxPublisher
+from src.repositories.outbox import OutboxRepository
+
+
+def make_event(pk_id, aggregate_id, event_type="updated", aggregate_type="athlete", **kwargs):
+    return SimpleNamespace(
+        pk_id=pk_id,
+        id=uuid.uuid4(),
+        aggregate_type=aggregate_type,
+        aggregate_id=aggregate_id,
+        event_type=event_type,
+        payload={"pk_id": aggregate_id},
+        attempts=kwargs.get("attempts", 0),
+        next_attempt_at=kwargs.get("next_attempt_at")
+    )
+
+
+class TestOutboxPublisher:
+    """Test suite for the outbox publisher against an in-memory broker"""
+
+    @pytest.fixture
+    def broker(self):
+        """In-memory broker stand-in"""
+        return InMemoryBroker()
+
+    @pytest.fixture
+    def publisher(self, broker):
+        """Publisher with a mocked session factory"""
+        return OutboxPublisher(broker, session_factory=MagicMock(), batch_size=10)
+
+    @pytest.mark.asyncio
+    async def test_publish_batch_keeps_order_per_aggregate(self, publisher, broker):
+        events = [
+            make_event(1, 10, "created"),
+            make_event(2, 20, "created"),
+            make_event(3, 10, "updated"),
+            make_event(4, 20, "deleted"),
+        ]
+
+        published, failures = await publisher.publish_batch(events)
+
+        assert sorted(published) == [1, 2, 3, 4]
+        assert failures == []
+        for aggregate_id in (10, 20):
+            sequence = [m["headers"]["sequence"] for m in broker.messages if m["headers"]["aggregate_id"] == aggregate_id]
+            assert sequence == sorted(sequence)
+        assert broker.messages[0]["routing_key"] == "athlete.created"
+        assert broker.messages[0]["message_id"] == str(events[0].id)
+
+    @pytest.mark.asyncio
+    async def test_failure_holds_back_rest_of_aggregate_only(self, publisher, broker):
+        broker.fail_routing_keys.add("category.created")
+        events = [
+            make_event(1, 10, "created", aggregate_type="category"),
+            make_event(2, 10, "updated", aggregate_type="category"),
+            make_event(3, 10, "created"),
+        ]
+
+        published, failures = await publisher.publish_batch(events)
+
+        assert published == [3]
+        assert [event.pk_id for event, _ in failures] == [1]
+
+    @pytest.mark.asyncio
+    async def test_aggregate_in_backoff_is_skipped(self, publisher, broker):
+        later = datetime.now(timezone.utc) + timedelta(minutes=1)
+        events = [
+            make_event(1, 10, attempts=1, next_attempt_at=later),
+            make_event(2, 10),
+            make_event(3, 20),
+        ]
+
+        published, failures = await publisher.publish_batch(events)
+
+        assert published == [3]
+        assert failures == []
+
+    @pytest.mark.asyncio
+    async def test_run_once_marks_published_and_failed(self, publisher, broker):
+        broker.fail_routing_keys.add("athlete.deleted")
+        events = [make_event(1, 10, "created"), make_event(2, 20, "deleted", attempts=2)]
+        repository = MagicMock()
+        repository.acquire_publisher_lock = AsyncMock(return_value=True)
+        repository.get_pending = AsyncMock(return_value=events)
+        repository.mark_published = AsyncMock()
+        repository.mark_failed = AsyncMock()
+        session = AsyncMock()
+        publisher.session_factory = MagicMock(return_value=session)
+        session.__aenter__.return_value = session
+
+        with patch("shared.outbox.OutboxRepository", return_value=repository):
+            count = await publisher.run_once()
+
+        assert count == 1
+        repository.get_pending.assert_called_once_with(10)
+        repository.mark_published.assert_called_once_with([1])
+        repository.mark_failed.assert_called_once()
+        assert repository.mark_failed.call_args.args[:2] == (2, 3)
+        session.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_run_once_skips_when_another_worker_publishes(self, publisher):
+        repository = MagicMock()
+        repository.acquire_publisher_lock = AsyncMock(return_value=False)
+        repository.get_pending = AsyncMock()
+        session = AsyncMock()
+        session.__aenter__.return_value = session
+        publisher.session_factory = MagicMock(return_value=session)
+
+        with patch("shared.outbox.OutboxRepository", return_value=repository):
+            count = await publisher.run_once()
+
+        assert count == 0
+        repository.get_pending.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_purge_deletes_in_batches_until_caught_up(self, publisher):
+        publisher.purge_batch_size = 2
+        publisher.retention = 3600
+        repository = MagicMock()
+        repository.acquire_publisher_lock = AsyncMock(return_value=True)
+        repository.purge_published = AsyncMock(side_effect=[2, 1])
+        session = AsyncMock()
+        session.__aenter__.return_value = session
+        publisher.session_factory = MagicMock(return_value=session)
+
+        with patch("shared.outbox.OutboxRepository", return_value=repository):
+            purged = await publisher.purge()
+
+        assert purged == 3
+        assert session.commit.await_count == 2
+        published_before, limit = repository.purge_published.call_args.args
+        assert limit == 2
+        assert timedelta(minutes=59) < datetime.now(timezone.utc) - published_before < timedelta(minutes=61)
+
+    def test_backoff_is_capped(self, publisher):
+        assert publisher.backoff(1) == 2
+        assert publisher.backoff(20) == publisher.max_backoff
+
+
+class TestOutboxRepository:
+    """Test suite for selecting pending outbox events"""
+
+    @pytest.mark.asyncio
+    async def test_get_pending_only_takes_aggregates_with_a_due_head(self):
+        db = AsyncMock()
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = []
+        db.execute.return_value = result
+
+        await OutboxRepository(db).get_pending(50)
+
+        statement = db.execute.call_args.args[0]
+        sql = str(statement.compile(dialect=postgresql.dialect()))
+        assert "min(outbox_event.pk_id)" in sql
+        assert "GROUP BY outbox_event.aggregate_type, outbox_event.aggregate_id" in sql
+        assert "next_attempt_at IS NULL OR" in sql
+        assert "(outbox_event.aggregate_type, outbox_event.aggregate_id) IN" in sql
+
+    @pytest.mark.asyncio
+    async def test_purge_only_removes_the_published_head_of_the_table(self):
+        db = AsyncMock()
+        db.execute.return_value = MagicMock(rowcount=7)
+
+        purged = await OutboxRepository(db).purge_published(datetime(2026, 1, 1, tzinfo=timezone.utc), 500)
+
+        sql = str(db.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert purged == 7
+        assert sql.startswith("WITH head AS")
+        assert "ORDER BY outbox_event.pk_id" in sql
+        assert "head.published_at IS NULL OR head.published_at >=" in sql
+        assert "outbox_event.pk_id < (SELECT min(head.pk_id)" in sql
@@ -0,0 +1,114 @@
+import time
+import pytest
+from unittest.mock import patch
+from fastapi import FastAPI
+from httpx import AsyncClient, ASGITransport
+from config.settings import settings
+from shared.profiling import (
+    PROFILE_ID_HEADER,
+    ProfileStore,
+    ProfilingMiddleware,
+    SamplingProfiler,
+    is_authorised
+)
+from src.controllers.profiling import router as profiling_router
+
+
+def busy_handler_work(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+class TestProfilingMiddleware:
+    """Test suite for on-demand request profiling"""
+
+    @pytest.fixture(autouse=True)
+    def token(self):
+        """Configured profiling token"""
+        with patch.object(settings, "PROFILING_TOKEN", "s3cret"):
+            yield "s3cret"
+
+    @pytest.fixture
+    def store(self):
+        """Fresh profile store, also served by the /debug/profiles routes"""
+        store = ProfileStore(max_profiles=2)
+        with patch("src.controllers.profiling.profile_store", store):
+            yield store
+
+    @pytest.fixture
+    def app(self, store):
+        """App with a CPU-bound route behind the profiling middleware"""
+        app = FastAPI()
+
+        @app.get("/busy")
+        async def busy():
+            busy_handler_work(0.05)
+            return {"ok": True}
+
+        app.include_router(profiling_router)
+        app.add_middleware(
+            ProfilingMiddleware,
+            profiler=SamplingProfiler(interval=0.001),
+            store=store,
+            sample_rate=0.0
+        )
+        return app
+
+    @pytest.mark.asyncio
+    async def test_authorised_header_profiles_request(self, app, store, token):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.get("/busy", headers={"X-Profile": token, "X-Request-ID": "req-1"})
+
+        profile = store.get(response.headers[PROFILE_ID_HEADER])
+        assert profile.request_id == "req-1"
+        assert profile.status_code == 200
+        assert profile.samples > 0
+        assert "busy_handler_work" in profile.collapsed()
+
+    @pytest.mark.asyncio
+    async def test_requests_without_valid_token_are_not_profiled(self, app, store):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            plain = await client.get("/busy")
+            forged = await client.get("/busy", headers={"X-Profile": "guess"})
+
+        assert PROFILE_ID_HEADER not in plain.headers
+        assert PROFILE_ID_HEADER not in forged.headers
+        assert store.list() == []
+
+    @pytest.mark.asyncio
+    async def test_list_and_download_profiles(self, app, token):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            profiled = await client.get("/busy", headers={"X-Profile": token, "X-Request-ID": "req-2"})
+            profile_id = profiled.headers[PROFILE_ID_HEADER]
+            listing = await client.get("/debug/profiles/", headers={"X-Profile": token})
+            download = await client.get(f"/debug/profiles/{profile_id}", headers={"X-Profile": token})
+            missing = await client.get("/debug/profiles/nope", headers={"X-Profile": token})
+            forbidden = await client.get("/debug/profiles/", headers={"X-Profile": "guess"})
+
+        assert [profile["id"] for profile in listing.json()] == [profile_id]
+        assert listing.json()[0]["request_id"] == "req-2"
+        assert listing.json()[0]["path"] == "/busy"
+        assert download.headers["content-type"].startswith("text/plain")
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in download.text.splitlines())
+        assert missing.status_code == 404
+        assert forbidden.status_code == 403
+
+    @pytest.mark.asyncio
+    async def test_reused_request_id_does_not_overwrite_a_profile(self, app, store, token):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            first = await client.get("/busy", headers={"X-Profile": token, "X-Request-ID": "same"})
+            second = await client.get("/busy", headers={"X-Profile": token, "X-Request-ID": "same"})
+
+        assert first.headers[PROFILE_ID_HEADER] != second.headers[PROFILE_ID_HEADER]
+        assert [profile.request_id for profile in store.list()] == ["same", "same"]
+
+    def test_store_keeps_most_recent(self, store):
+        for id in ("a", "b", "c"):
+            store.add(type("P", (), {"id": id})())
+
+        assert [profile.id for profile in store.list()] == ["c", "b"]
+
+    def test_no_token_configured_means_header_is_ignored(self):
+        with patch.object(settings, "PROFILING_TOKEN", None):
+            assert is_authorised("anything") is False
@@ -0,0 +1,172 @@
+import pytest
+from typing import List
+from unittest.mock import AsyncMock, MagicMock, patch
+from fastapi import APIRouter, FastAPI, Query
+from fastapi.responses import StreamingResponse
+from httpx import AsyncClient, ASGITransport
+from shared import response_cache as response_cache_module
+from shared.response_cache import (
+    CachedResponse,
+    CachedRoute,
+    ResponseCache,
+    TableVersions,
+    cache_response
+)
+from src.repositories.category import CategoryRepository
+from src.schemas.category import CategoryCreate
+
+
+class TestResponseCache:
+    """Test suite for the LRU store"""
+
+    def test_evicts_least_recently_used_beyond_byte_cap(self):
+        cache = ResponseCache(max_bytes=250, max_entry_bytes=200)
+        for key in ("a", "b"):
+            cache.set(key, CachedResponse((0,), b"x" * 100, []))
+        cache.get("a", (0,))
+        cache.set("c", CachedResponse((0,), b"x" * 100, []))
+
+        assert cache.get("b", (0,)) is None
+        assert cache.get("a", (0,)) is not None
+        assert cache.size == 200
+
+    def test_oversized_entries_are_not_stored(self):
+        cache = ResponseCache(max_bytes=1000, max_entry_bytes=10)
+        cache.set("a", CachedResponse((0,), b"x" * 11, []))
+
+        assert len(cache) == 0
+
+    def test_stale_version_or_age_is_a_miss(self):
+        cache = ResponseCache(ttl=60.0)
+        cache.set("a", CachedResponse((1,), b"[]", [], stored_at=0.0))
+
+        with patch("shared.response_cache.time.monotonic", return_value=30.0):
+            assert cache.get("a", (2,)) is None
+        cache.set("a", CachedResponse((1,), b"[]", [], stored_at=0.0))
+        with patch("shared.response_cache.time.monotonic", return_value=61.0):
+            assert cache.get("a", (1,)) is None
+        assert cache.size == 0
+
+
+class TestCachedRoute:
+    """Test suite for cached collection routes"""
+
+    @pytest.fixture
+    def versions(self):
+        """Fresh table versions"""
+        versions = TableVersions()
+        with patch.object(response_cache_module, "table_versions", versions):
+            yield versions
+
+    @pytest.fixture
+    def calls(self):
+        """Endpoint invocations"""
+        return []
+
+    @pytest.fixture
+    def app(self, versions, calls):
+        """App with a cached list, a cached stream and an uncached route"""
+        router = APIRouter(route_class=CachedRoute)
+
+        @router.get("/categories", response_model=List[CategoryCreate])
+        @cache_response("category")
+        async def list_categories(skip: int = 0, limit: int = Query(100)):
+            calls.append("list")
+            return [{"name": f"category {i}"} for i in range(skip, skip + 3)]
+
+        @router.get("/stream")
+        @cache_response("athlete")
+        async def stream():
+            calls.append("stream")
+
+            async def body():
+                yield b"["
+                yield b"1,2"
+                yield b"]"
+
+            return StreamingResponse(body(), media_type="application/json", headers={"X-Total-Count": "2"})
+
+        @router.get("/missing")
+        @cache_response("category")
+        async def missing():
+            calls.append("missing")
+            raise_not_found()
+
+        @router.get("/plain")
+        async def plain():
+            calls.append("plain")
+            return []
+
+        app = FastAPI()
+        app.include_router(router)
+        return app
+
+    @pytest.mark.asyncio
+    async def test_second_request_is_served_from_cache(self, app, calls):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            first = await client.get("/categories")
+            second = await client.get("/categories?limit=100&skip=0&utm=x")
+            other_page = await client.get("/categories?skip=3")
+
+        assert calls == ["list", "list"]
+        assert first.headers["x-cache"] == "MISS"
+        assert second.headers["x-cache"] == "HIT"
+        assert second.json() == first.json()
+        assert second.headers["content-type"] == "application/json"
+        assert other_page.json()[0] == {"name": "category 3"}
+
+    @pytest.mark.asyncio
+    async def test_write_to_table_invalidates_its_pages(self, app, calls, versions):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            await client.get("/categories")
+            versions.bump("athlete")
+            unaffected = await client.get("/categories")
+            versions.bump("category")
+            invalidated = await client.get("/categories")
+
+        assert unaffected.headers["x-cache"] == "HIT"
+        assert invalidated.headers["x-cache"] == "MISS"
+        assert calls == ["list", "list"]
+
+    @pytest.mark.asyncio
+    async def test_streamed_body_is_cached_with_headers(self, app, calls):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            await client.get("/stream")
+            cached = await client.get("/stream")
+
+        assert calls == ["stream"]
+        assert cached.json() == [1, 2]
+        assert cached.headers["x-total-count"] == "2"
+        assert cached.headers["content-length"] == "5"
+
+    @pytest.mark.asyncio
+    async def test_errors_and_unmarked_routes_are_not_cached(self, app, calls):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            for _ in range(2):
+                await client.get("/missing")
+                await client.get("/plain")
+
+        assert calls == ["missing", "plain", "missing", "plain"]
+
+
+def raise_not_found():
+    from src.exceptions.custom_exceptions import NotFoundException
+    raise NotFoundException()
+
+
+class TestRepositoryVersionBump:
+    """Test suite for invalidation from the repository write paths"""
+
+    @pytest.mark.asyncio
+    async def test_writes_bump_their_table(self):
+        versions = TableVersions()
+        db = AsyncMock()
+        db.add = MagicMock()
+        db.scalars = AsyncMock(return_value=MagicMock(one_or_none=MagicMock(return_value=None)))
+        repository = CategoryRepository(db)
+
+        with patch("src.repositories.base.table_versions", versions):
+            await repository.create(name="Juvenil")
+            await repository.delete(1)
+
+        assert versions.get(["category", "athlete"]) == (2, 0)
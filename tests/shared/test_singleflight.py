@@ -0,0 +1,125 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+from shared.metrics import metrics
+from shared.singleflight import SingleFlight, coalesce
+from src.services.category import CategoryService
+
+
+class TestSingleFlight:
+    """Test suite for request coalescing"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_execution(self):
+        flight = SingleFlight()
+        release = asyncio.Event()
+        calls = 0
+
+        async def query():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return ["row"]
+
+        before = metrics.counter("singleflight_test_shared_coalesced")
+        tasks = [asyncio.create_task(flight.do("key", query, "test_shared")) for _ in range(10)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*tasks)
+
+        assert calls == 1
+        assert results == [["row"]] * 10
+        assert metrics.counter("singleflight_test_shared_coalesced") - before == 9
+        assert flight.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_different_keys_run_separately(self):
+        flight = SingleFlight()
+        query = AsyncMock(return_value=1)
+
+        await asyncio.gather(flight.do("a", query), flight.do("b", query))
+
+        assert query.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_exception_reaches_every_caller(self):
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def query():
+            await release.wait()
+            raise LookupError("missing")
+
+        tasks = [asyncio.create_task(flight.do("key", query)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        assert all(isinstance(result, LookupError) for result in results)
+
+    @pytest.mark.asyncio
+    async def test_follower_takes_over_when_leader_is_cancelled(self):
+        flight = SingleFlight()
+        started = asyncio.Event()
+        calls = 0
+
+        async def query():
+            nonlocal calls
+            calls += 1
+            started.set()
+            if calls == 1:
+                await asyncio.sleep(10)
+            return "done"
+
+        leader = asyncio.create_task(flight.do("key", query))
+        await started.wait()
+        follower = asyncio.create_task(flight.do("key", query))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await follower == "done"
+        assert calls == 2
+
+
+class TestCoalescedService:
+    """Coalescing applied to service read methods"""
+
+    @pytest.mark.asyncio
+    async def test_identical_reads_hit_repository_once(self):
+        release = asyncio.Event()
+
+        async def get_all(skip, limit):
+            await release.wait()
+            return []
+
+        services = [CategoryService(AsyncMock()) for _ in range(5)]
+        repository_calls = []
+        for service in services:
+            service.repository.get_all = AsyncMock(side_effect=get_all)
+            repository_calls.append(service.repository.get_all)
+
+        tasks = [asyncio.create_task(service.get_all_categories(0, 100)) for service in services]
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(*tasks)
+
+        assert sum(call.await_count for call in repository_calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_custom_key_scopes_calls(self):
+        class Service:
+            def __init__(self, tenant):
+                self.tenant = tenant
+                self.calls = 0
+
+            @coalesce("test.scoped", key=lambda self, value: (self.tenant, value))
+            async def read(self, value):
+                self.calls += 1
+                await asyncio.sleep(0)
+                return value
+
+        first, second = Service("a"), Service("b")
+        await asyncio.gather(first.read(1), second.read(1))
+
+        assert first.calls == 1
+        assert second.calls == 1
@@ -0,0 +1,169 @@
+import json
+import pytest
+from fastapi import APIRouter, FastAPI
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import create_engine, text
+from shared import tracing
+from shared.tracing import (
+    FileSpanExporter,
+    InMemorySpanExporter,
+    TracedRoute,
+    Tracer,
+    TracingMiddleware,
+    instrument_engine,
+    parse_traceparent,
+    trace_service
+)
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+
+
+@pytest.fixture
+def exporter(monkeypatch):
+    """In-memory exporter installed on the module tracer, sampling nothing by default"""
+    exporter = InMemorySpanExporter()
+    monkeypatch.setattr(tracing.tracer, "exporter", exporter)
+    monkeypatch.setattr(tracing.tracer, "sample_rate", 0.0)
+    return exporter
+
+
+class TestTraceparent:
+    """Test suite for W3C traceparent parsing"""
+
+    def test_parses_sampled_header(self):
+        assert parse_traceparent(f"00-{TRACE_ID}-{PARENT_ID}-01") == (TRACE_ID, PARENT_ID, True)
+
+    def test_unsampled_flag(self):
+        assert parse_traceparent(f"00-{TRACE_ID}-{PARENT_ID}-00")[2] is False
+
+    @pytest.mark.parametrize("value", [
+        None,
+        "garbage",
+        f"00-{'0' * 32}-{PARENT_ID}-01",
+        f"00-{TRACE_ID}-{'0' * 16}-01",
+        f"ff-{TRACE_ID}-{PARENT_ID}-01",
+    ])
+    def test_invalid_headers_are_ignored(self, value):
+        assert parse_traceparent(value) is None
+
+
+class TestTracer:
+    """Test suite for span creation and sampling"""
+
+    def test_unsampled_trace_records_nothing(self):
+        exporter = InMemorySpanExporter()
+        tracer = Tracer(exporter, sample_rate=0.0)
+
+        with tracer.start_root_span("GET /") as root:
+            with tracer.start_span("child") as child:
+                pass
+
+        assert root is None and child is None
+        assert exporter.spans == []
+
+    def test_sampled_parent_is_followed(self):
+        exporter = InMemorySpanExporter()
+        tracer = Tracer(exporter, sample_rate=0.0)
+
+        with tracer.start_root_span("GET /", f"00-{TRACE_ID}-{PARENT_ID}-01") as root:
+            with tracer.start_span("child"):
+                pass
+
+        child, exported_root = exporter.spans
+        assert exported_root is root
+        assert root.trace_id == TRACE_ID and root.parent_span_id == PARENT_ID
+        assert child.trace_id == TRACE_ID and child.parent_span_id == root.span_id
+        assert child.start_ns <= child.end_ns
+
+    def test_errors_are_recorded_and_trace_still_exported(self):
+        exporter = InMemorySpanExporter()
+        tracer = Tracer(exporter, sample_rate=1.0)
+
+        with pytest.raises(ValueError):
+            with tracer.start_root_span("GET /"):
+                with tracer.start_span("child"):
+                    raise ValueError("boom")
+
+        assert [span.error for span in exporter.spans] == ["ValueError: boom", "ValueError: boom"]
+
+    def test_disabled_tracer_never_samples(self):
+        assert Tracer(None, sample_rate=1.0).should_sample((TRACE_ID, PARENT_ID, True)) is False
+
+
+class TestInstrumentation:
+    """Test suite for controller, service and statement spans"""
+
+    def test_statement_spans(self, exporter):
+        engine = create_engine("sqlite://")
+        instrument_engine(engine)
+
+        with tracing.tracer.start_root_span("job", f"00-{TRACE_ID}-{PARENT_ID}-01"):
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+            with pytest.raises(Exception):
+                with engine.connect() as conn:
+                    conn.execute(text("SELECT * FROM missing_table"))
+
+        statements = [span for span in exporter.spans if span.name == "db.query"]
+        assert [span.attributes["db.statement"] for span in statements] == ["SELECT 1", "SELECT * FROM missing_table"]
+        assert statements[0].error is None
+        assert "missing_table" in statements[1].error
+
+    @pytest.mark.asyncio
+    async def test_request_spans_nest_controller_and_service(self, exporter):
+        @trace_service
+        class GreetingService:
+            async def greet(self, name: str) -> str:
+                return f"hello {name}"
+
+        router = APIRouter(prefix="/greetings", route_class=TracedRoute)
+
+        @router.get("/{name}")
+        async def get_greeting(name: str):
+            return {"message": await GreetingService().greet(name)}
+
+        app = FastAPI()
+        app.include_router(router)
+        app.add_middleware(TracingMiddleware)
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            sampled = await client.get("/greetings/ana", headers={"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-01"})
+            unsampled = await client.get("/greetings/bia")
+
+        assert sampled.json() == {"message": "hello ana"}
+        assert unsampled.json() == {"message": "hello bia"}
+        spans = {span.name: span for span in exporter.spans}
+        assert set(spans) == {
+            "service GreetingService.greet",
+            f"controller {get_greeting.__module__.rsplit('.', 1)[-1]}.get_greeting",
+            "GET /greetings/{name}",
+        }
+        server = spans["GET /greetings/{name}"]
+        controller = spans[f"controller {get_greeting.__module__.rsplit('.', 1)[-1]}.get_greeting"]
+        assert server.parent_span_id == PARENT_ID
+        assert controller.parent_span_id == server.span_id
+        assert spans["service GreetingService.greet"].parent_span_id == controller.span_id
+        assert server.attributes["http.response.status_code"] == 200
+        assert sampled.headers["traceresponse"] == server.traceparent
+        assert "traceresponse" not in unsampled.headers
+
+
+class TestFileSpanExporter:
+    """Test suite for the local OTLP/JSON file exporter"""
+
+    def test_writes_one_otlp_request_per_trace(self, tmp_path):
+        path = tmp_path / "traces.jsonl"
+        tracer = Tracer(FileSpanExporter(str(path), "workout-test"), sample_rate=1.0)
+
+        with tracer.start_root_span("GET /") as root:
+            with tracer.start_span("child", attributes={"rows": 3}):
+                pass
+
+        request = json.loads(path.read_text().splitlines()[0])
+        resource_spans = request["resourceSpans"][0]
+        spans = resource_spans["scopeSpans"][0]["spans"]
+        assert resource_spans["resource"]["attributes"][0]["value"] == {"stringValue": "workout-test"}
+        assert [span["name"] for span in spans] == ["child", "GET /"]
+        assert spans[0]["parentSpanId"] == root.span_id
+        assert spans[0]["attributes"] == [{"key": "rows", "value": {"intValue": "3"}}]
@@ -0,0 +1,96 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from shared.response_cache import table_versions
+from shared.unit_of_work import UnitOfWork, current_unit_of_work
+from src.models.category import Category
+from src.repositories.category import CategoryRepository
+
+
+def make_session():
+    session = AsyncMock()
+    session.add = MagicMock()
+    savepoint = AsyncMock()
+    savepoint.is_active = True
+    session.begin_nested.return_value = savepoint
+    return session
+
+
+class TestUnitOfWork:
+    """Test suite for grouping repository writes into one commit"""
+
+    @pytest.mark.asyncio
+    async def test_writes_flush_and_commit_once(self):
+        session = make_session()
+        repository = CategoryRepository(session)
+        before = table_versions.get(["category"])
+
+        async with UnitOfWork(session):
+            await repository.create(name="Junior")
+            await repository.create(name="Senior")
+            session.commit.assert_not_awaited()
+            # Cached pages stay valid until the work is committed.
+            assert table_versions.get(["category"]) == before
+
+        session.commit.assert_awaited_once()
+        assert table_versions.get(["category"]) > before
+
+    @pytest.mark.asyncio
+    async def test_single_writes_still_commit(self):
+        session = make_session()
+
+        await CategoryRepository(session).create(name="Junior")
+
+        session.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_error_rolls_back_everything(self):
+        session = make_session()
+        before = table_versions.get(["category"])
+
+        with pytest.raises(RuntimeError):
+            async with UnitOfWork(session):
+                await CategoryRepository(session).create(name="Junior")
+                raise RuntimeError("boom")
+
+        session.commit.assert_not_awaited()
+        session.rollback.assert_awaited_once()
+        assert table_versions.get(["category"]) == before
+
+    @pytest.mark.asyncio
+    async def test_nested_failure_only_rolls_back_savepoint(self):
+        session = make_session()
+        savepoint = session.begin_nested.return_value
+
+        async with UnitOfWork(session) as outer:
+            with pytest.raises(RuntimeError):
+                async with UnitOfWork(session) as inner:
+                    assert inner.nested
+                    assert current_unit_of_work(session) is inner
+                    raise RuntimeError("boom")
+            assert current_unit_of_work(session) is outer
+
+        savepoint.rollback.assert_awaited_once()
+        session.rollback.assert_not_awaited()
+        session.commit.assert_awaited_once()
+        assert current_unit_of_work(session) is None
+
+    @pytest.mark.asyncio
+    async def test_nested_success_hands_tables_to_outer(self):
+        session = make_session()
+
+        async with UnitOfWork(session) as outer:
+            async with UnitOfWork(session):
+                await CategoryRepository(session).create(name="Junior")
+
+        session.begin_nested.return_value.commit.assert_awaited_once()
+        assert outer.tables == {Category.__tablename__}
+
+    @pytest.mark.asyncio
+    async def test_other_sessions_are_unaffected(self):
+        session, other = make_session(), make_session()
+
+        async with UnitOfWork(session):
+            await CategoryRepository(other).create(name="Junior")
+
+        other.commit.assert_awaited_once()
+        session.commit.assert_awaited_once()